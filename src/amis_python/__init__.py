@@ -1,10 +1,41 @@
-# 导出核心功能
-from .builder.api import Api, to_api
-from .builder.layout import Page
-from .builder.app import AppBuilder, AppPageGroupBuilder, AppPageBuilder
-from .crud import build_crud_page, build_filter_form, build_form, render_field_schema
-from .registry import get_default_app, get_page, register_default_app, register_group, register_page
+# 导出核心功能，按需导入：import amis_python 不会加载组件、Django 和 DRF（见 __getattr__）
+from importlib import import_module
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from .builder.api import Api, to_api, to_apis
+    from .builder.layout import Page
+    from .builder.app import AppBuilder, AppPageGroupBuilder, AppPageBuilder
+    from .crud import build_crud_page, build_filter_form, build_form, render_field_schema
+    from .registry import freeze_pages, get_default_app, get_page, register_default_app, register_group, register_page
+    from .response_cache import amis_cache, amis_invalidate, invalidate_cache
+
+# 导出名称 -> 所在模块
+_EXPORTS = {
+    'Api': '.builder.api', 'to_api': '.builder.api', 'to_apis': '.builder.api',
+    'Page': '.builder.layout',
+    'AppBuilder': '.builder.app', 'AppPageGroupBuilder': '.builder.app', 'AppPageBuilder': '.builder.app',
+    'build_crud_page': '.crud', 'build_filter_form': '.crud', 'build_form': '.crud', 'render_field_schema': '.crud',
+    'get_default_app': '.registry', 'get_page': '.registry', 'register_default_app': '.registry',
+    'register_group': '.registry', 'register_page': '.registry', 'freeze_pages': '.registry',
+    'amis_cache': '.response_cache', 'amis_invalidate': '.response_cache', 'invalidate_cache': '.response_cache',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # 缓存到模块命名空间，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
 
 default_app_config = 'amis_python.apps.AmisPythonConfig'
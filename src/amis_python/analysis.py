@@ -0,0 +1,255 @@
+# analysis.py
+"""
+schema 体积与复杂度分析。
+
+``analyze_schema`` 接受组件对象或序列化后的 schema，``analyze_page`` 接受已注册的
+页面路径，输出 ``SchemaReport``：
+
+- ``bytes``：紧凑 JSON 的字节数；
+- ``nodes``：组件节点数（带 ``type`` 的对象）；
+- ``max_depth``：组件嵌套的最大深度（根节点为 1）；
+- ``largest``：最大的若干个组件子树（JSON Pointer、类型、字节数）；
+- ``large_options``：超过阈值的内联 ``options`` 列表。
+
+``SchemaBudget`` 为页面设置上限，``assert_within_budget`` / ``assert_page_budgets``
+在超出时抛出 ``SchemaBudgetExceeded``（``AssertionError`` 的子类），可以直接写进测试::
+
+    class SchemaBudgetTestCase(TestCase):
+        def test_budgets(self):
+            assert_page_budgets()  # 使用 settings.AMIS_SCHEMA_BUDGETS
+
+``AMIS_SCHEMA_BUDGETS`` 的键为页面路径，``"*"`` 为默认预算::
+
+    AMIS_SCHEMA_BUDGETS = {
+        "*": {"max_bytes": 200_000},
+        "/users/list": {"max_bytes": 500_000, "max_nodes": 2000},
+    }
+"""
+import heapq
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel as PydanticBaseModel
+
+from .builder.dump import compiled_dump
+from .builder.encoding import encode_json
+
+
+@dataclass
+class SchemaReport:
+    """
+    schema 分析结果
+    """
+    path: Optional[str] = None
+    bytes: int = 0
+    nodes: int = 0
+    max_depth: int = 0
+    # (JSON Pointer, 组件类型, 字节数)，按字节数从大到小
+    largest: List[Tuple[str, str, int]] = field(default_factory=list)
+    # (JSON Pointer, 选项数)
+    large_options: List[Tuple[str, int]] = field(default_factory=list)
+
+    def format(self) -> str:
+        """
+        生成可读的报告文本
+        """
+        lines = [
+            f"页面: {self.path or '-'}",
+            f"字节数: {self.bytes}  组件数: {self.nodes}  最大深度: {self.max_depth}",
+        ]
+        if self.largest:
+            lines.append("最大的子树:")
+            lines.extend(f"  {size:>10}  {type_name:<16} {pointer}" for pointer, type_name, size in self.largest)
+        if self.large_options:
+            lines.append("内联 options 过多:")
+            lines.extend(f"  {count:>10}  {pointer}" for pointer, count in self.large_options)
+        return "\n".join(lines)
+
+
+@dataclass
+class SchemaBudget:
+    """
+    页面 schema 预算，为 None 的项不检查
+    """
+    max_bytes: Optional[int] = None
+    max_nodes: Optional[int] = None
+    max_depth: Optional[int] = None
+    max_options: Optional[int] = None
+
+    def check(self, report: SchemaReport) -> List[str]:
+        """
+        返回超出预算的项，全部满足时返回空列表
+        """
+        errors = []
+        prefix = f"{report.path}: " if report.path else ""
+        if self.max_bytes is not None and report.bytes > self.max_bytes:
+            errors.append(f"{prefix}字节数 {report.bytes} 超出预算 {self.max_bytes}")
+        if self.max_nodes is not None and report.nodes > self.max_nodes:
+            errors.append(f"{prefix}组件数 {report.nodes} 超出预算 {self.max_nodes}")
+        if self.max_depth is not None and report.max_depth > self.max_depth:
+            errors.append(f"{prefix}嵌套深度 {report.max_depth} 超出预算 {self.max_depth}")
+        if self.max_options is not None:
+            for pointer, count in report.large_options:
+                if count > self.max_options:
+                    errors.append(f"{prefix}{pointer} 内联选项 {count} 个，超出预算 {self.max_options}")
+        return errors
+
+
+class SchemaBudgetExceeded(AssertionError):
+    """
+    页面 schema 超出预算
+    """
+
+    def __init__(self, errors: Sequence[str]):
+        self.errors = list(errors)
+        super().__init__("\n".join(self.errors))
+
+
+def _escape(token: Any) -> str:
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+class _Analyzer:
+    def __init__(self, top: int, options_threshold: int):
+        self.top = top
+        self.options_threshold = options_threshold
+        self.nodes = 0
+        self.max_depth = 0
+        self.largest: List[Tuple[int, str, str]] = []
+        self.large_options: List[Tuple[str, int]] = []
+
+    def visit(self, value: Any, pointer: str, depth: int) -> int:
+        """
+        遍历 schema 并返回 value 的紧凑 JSON 字节数
+        """
+        if isinstance(value, dict):
+            is_node = isinstance(value.get('type'), str)
+            if is_node:
+                depth += 1
+                self.nodes += 1
+                self.max_depth = max(self.max_depth, depth)
+            options = value.get('options')
+            if isinstance(options, list) and len(options) > self.options_threshold:
+                self.large_options.append((f'{pointer}/options', len(options)))
+            size = 2 + max(len(value) - 1, 0)
+            for key, item in value.items():
+                key = key if isinstance(key, str) else str(key)
+                size += len(encode_json(key)) + 1 + self.visit(item, f'{pointer}/{_escape(key)}', depth)
+            if is_node and pointer:
+                entry = (size, pointer, value['type'])
+                if len(self.largest) < self.top:
+                    heapq.heappush(self.largest, entry)
+                elif self.top:
+                    heapq.heappushpop(self.largest, entry)
+            return size
+        if isinstance(value, (list, tuple)):
+            return 2 + max(len(value) - 1, 0) + sum(
+                self.visit(item, f'{pointer}/{index}', depth) for index, item in enumerate(value)
+            )
+        return len(encode_json(value))
+
+
+def analyze_schema(
+        schema: Any,
+        path: Optional[str] = None,
+        top: int = 10,
+        options_threshold: int = 50,
+) -> SchemaReport:
+    """
+    分析组件对象或序列化后的 schema
+
+    Args:
+        schema: 组件对象或 dict
+        path: 页面路径，仅用于报告
+        top: 列出最大的子树个数
+        options_threshold: 内联 options 超过该数量时列出
+    """
+    if isinstance(schema, PydanticBaseModel):
+        schema = compiled_dump(schema)
+    elif getattr(schema.__class__, '__amis_lite__', False):
+        schema = schema.model_dump()
+    analyzer = _Analyzer(top, options_threshold)
+    size = analyzer.visit(schema, '', 0)
+    return SchemaReport(
+        path=path,
+        bytes=size,
+        nodes=analyzer.nodes,
+        max_depth=analyzer.max_depth,
+        largest=[(pointer, type_name, size) for size, pointer, type_name in sorted(analyzer.largest, reverse=True)],
+        large_options=analyzer.large_options,
+    )
+
+
+def analyze_page(path: str, app_name: Optional[str] = None, **kwargs) -> SchemaReport:
+    """
+    分析已注册的静态页面，使用与 ``/amis/page/`` 接口相同的后处理（默认值裁剪、definitions 去重）
+    """
+    from .payload import schema_payload
+    from .registry import get_app, get_default_app
+    from .passes import page_passes
+
+    app = get_app(app_name) if app_name else get_default_app()
+    if app is None:
+        raise ValueError(f"应用不存在 {app_name}")
+    page = app.get_page(path)
+    if page is None:
+        raise ValueError(f"页面没有 schema {path}")
+    if callable(page):
+        raise ValueError(f"动态页面无法静态分析 {path}")
+    schema = json.loads(schema_payload(page, page_passes(path)).content)
+    return analyze_schema(schema, path=path, **kwargs)
+
+
+def get_budget(path: Optional[str], budgets: Optional[Dict[str, Any]] = None) -> Optional[SchemaBudget]:
+    """
+    获取页面的预算，未配置时使用 ``"*"``，都没有时返回 None
+    """
+    if budgets is None:
+        from django.conf import settings
+        budgets = getattr(settings, 'AMIS_SCHEMA_BUDGETS', {})
+    budget = budgets.get(path, budgets.get('*'))
+    if budget is None or isinstance(budget, SchemaBudget):
+        return budget
+    return SchemaBudget(**budget)
+
+
+def assert_within_budget(schema: Any, budget: Optional[SchemaBudget] = None, path: Optional[str] = None, **limits) -> SchemaReport:
+    """
+    检查 schema 是否满足预算，超出时抛出 SchemaBudgetExceeded
+
+    预算可以传 SchemaBudget，也可以直接传 max_bytes 等参数。
+    """
+    budget = budget or SchemaBudget(**limits)
+    threshold = budget.max_options if budget.max_options is not None else 50
+    report = analyze_schema(schema, path=path, options_threshold=threshold)
+    errors = budget.check(report)
+    if errors:
+        raise SchemaBudgetExceeded(errors)
+    return report
+
+
+def assert_page_budgets(budgets: Optional[Dict[str, Any]] = None, app_name: Optional[str] = None) -> List[SchemaReport]:
+    """
+    按 AMIS_SCHEMA_BUDGETS（或传入的 budgets）检查应用中所有静态页面，任一页面超出预算时抛出 SchemaBudgetExceeded
+    """
+    from .export import iter_app_pages
+    from .registry import get_app, get_default_app
+
+    app = get_app(app_name) if app_name else get_default_app()
+    reports = []
+    errors = []
+    for app_page in iter_app_pages(app):
+        page = app_page._lazy_schema
+        if page is None or callable(page):
+            continue
+        budget = get_budget(app_page.path, budgets)
+        if budget is None:
+            continue
+        threshold = budget.max_options if budget.max_options is not None else 50
+        report = analyze_page(app_page.path, app_name=app_name, options_threshold=threshold)
+        reports.append(report)
+        errors.extend(budget.check(report))
+    if errors:
+        raise SchemaBudgetExceeded(errors)
+    return reports
@@ -22,8 +22,16 @@ class AmisPythonConfig(AppConfig):
         应用就绪时执行的初始化代码
         """
         from amis_python.builder.app import AppBuilder
+        from amis_python.builder.dump import set_compiled_dump
+        from amis_python.builder.lite import set_lite_validation
+        from amis_python.builder.warmup import warmup_models
         from amis_python.registry import register_default_app
         print("amis-python 应用就绪...")
+        set_compiled_dump(getattr(settings, 'AMIS_COMPILED_DUMP', False))
+        set_lite_validation(getattr(settings, 'AMIS_LITE_VALIDATE', False))
+        warmup = getattr(settings, 'AMIS_WARMUP', False)
+        if warmup:
+            warmup_models(background=warmup == 'background')
         app_config = getattr(settings, 'AMIS_APP_CONFIG', {})
         register_default_app(AppBuilder(
             header=[{
@@ -0,0 +1,215 @@
+# batch.py
+"""
+批量接口：一次请求执行多个子请求。
+
+``POST /amis/batch`` 的请求体为 ``{"requests": [{"url": ..., "method": ..., "data": ..., "headers": ...}]}``
+（``headers`` 只能包含 ``Accept``、``Accept-Language``、``X-Requested-With``）
+（或直接是子请求列表）。子请求只支持 GET：外层请求不做 CSRF 校验，批量接口不能用来
+绕过写接口的 CSRF 保护。每个子请求继承外层请求的 Cookie、认证请求头、用户和会话，
+通过 URL 解析器直接调用视图，不再经过中间件。用户和会话在分发前加载，各工作线程共享
+同一个会话对象，子请求只应读取会话，不应修改。多个子请求在有界线程池中并发执行
+（线程数 ``AMIS_BATCH_WORKERS``，默认 4；单次最多 ``AMIS_BATCH_MAX_REQUESTS`` 个子请求，默认 20）。
+
+响应 ``data`` 按顺序给出每个子请求的 ``{"status": HTTP 状态码, "headers": {...}, "data": 响应体}``；
+JSON 响应体原样拼接，不重新解析和编码。前端的合并逻辑见 ``builder.batch``。
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, unquote_to_bytes, urlencode, urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.exceptions import PermissionDenied
+from django.db import close_old_connections
+from django.http import Http404, HttpRequest
+from django.urls import Resolver404, get_urlconf, resolve, set_urlconf
+from django.utils import translation
+
+from .builder.encoding import encode_json
+
+logger = logging.getLogger(__name__)
+
+# 不传给子请求的外层请求头：请求体相关、条件请求、压缩（子响应要原样拼接）
+_DROPPED_META = frozenset({
+    'CONTENT_TYPE', 'CONTENT_LENGTH', 'QUERY_STRING', 'HTTP_ACCEPT_ENCODING',
+    'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_X_AMIS_SCHEMA_VERSION',
+})
+# 子请求只允许只读的 GET，外层批量请求不做 CSRF 校验
+_METHODS = frozenset({'GET'})
+# 子请求可以自带的请求头（小写），其余请求头一律拒绝
+_ALLOWED_HEADERS = frozenset({'accept', 'accept-language', 'x-requested-with'})
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class BatchError(ValueError):
+    """
+    子请求不合法
+    """
+
+    def __init__(self, status: int, msg: str):
+        super().__init__(msg)
+        self.status = status
+        self.msg = msg
+
+
+def get_batch_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'AMIS_BATCH_WORKERS', 4), thread_name_prefix='amis-batch',
+            )
+        return _executor
+
+
+def _query_items(data: Dict[str, Any]) -> List:
+    items = []
+    for key, value in data.items():
+        if value is None:
+            continue
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, bool):
+                item = 'true' if item else 'false'
+            elif isinstance(item, (dict, list)):
+                item = encode_json(item).decode()
+            items.append((key, item))
+    return items
+
+
+def build_subrequest(request: HttpRequest, item: Dict[str, Any]) -> HttpRequest:
+    """
+    根据子请求描述构造继承外层请求身份的 HttpRequest
+    """
+    if not isinstance(item, dict) or not isinstance(item.get('url'), str):
+        raise BatchError(400, '子请求缺少 url')
+    method = str(item.get('method') or 'get').upper()
+    if method not in _METHODS:
+        raise BatchError(405, f'不支持的请求方式 {method}')
+    url = urlsplit(item['url'])
+    if url.scheme or url.netloc or not url.path.startswith('/'):
+        raise BatchError(400, '只支持站内相对地址')
+    path = url.path
+    script_name = request.META.get('SCRIPT_NAME', '')
+    if script_name and path.startswith(script_name.rstrip('/') + '/'):
+        path = path[len(script_name.rstrip('/')):]
+
+    data = item.get('data')
+    query = url.query
+    if isinstance(data, dict) and data:
+        query = urlencode(parse_qsl(query, keep_blank_values=True) + _query_items(data))
+
+    headers = item.get('headers') or {}
+    if not isinstance(headers, dict):
+        raise BatchError(400, '子请求 headers 必须是对象')
+    environ = {key: value for key, value in request.META.items() if key not in _DROPPED_META}
+    for name, value in headers.items():
+        if str(name).lower() not in _ALLOWED_HEADERS:
+            # 子请求沿用外层请求的用户和会话，不能改写 Host、Cookie、认证、代理等请求头
+            raise BatchError(400, f'子请求不支持请求头 {name}')
+        environ['HTTP_' + str(name).upper().replace('-', '_')] = str(value)
+    environ.update({
+        'REQUEST_METHOD': method,
+        'PATH_INFO': unquote_to_bytes(path).decode('iso-8859-1'),
+        'QUERY_STRING': query,
+        'CONTENT_LENGTH': '0',
+        'wsgi.input': BytesIO(),
+    })
+    environ.setdefault('wsgi.url_scheme', request.scheme)
+    subrequest = WSGIRequest(environ)
+    # 继承外层请求已经完成的认证和会话，不再经过中间件
+    for name in ('user', 'session', 'urlconf', '_dont_enforce_csrf_checks'):
+        if hasattr(request, name):
+            setattr(subrequest, name, getattr(request, name))
+    return subrequest
+
+
+def _encode_part(status: int, content_type: Optional[str], content: bytes) -> bytes:
+    if content_type and content_type.startswith('application/json'):
+        data = content or b'null'
+    else:
+        data = encode_json(content.decode('utf-8', 'replace'))
+    headers = encode_json({'content-type': content_type} if content_type else {})
+    return b'{"status":%d,"headers":%s,"data":%s}' % (status, headers, data)
+
+
+def _error_part(status: int, msg: str) -> bytes:
+    return _encode_part(status, 'application/json', encode_json({'status': status, 'msg': msg, 'data': None}))
+
+
+def dispatch_subrequest(request: HttpRequest, item: Dict[str, Any]) -> bytes:
+    """
+    执行单个子请求，返回编码好的结果
+    """
+    from .views import BatchView
+
+    try:
+        subrequest = build_subrequest(request, item)
+    except BatchError as exc:
+        return _error_part(exc.status, exc.msg)
+    try:
+        match = resolve(subrequest.path_info, urlconf=getattr(request, 'urlconf', None))
+    except Resolver404:
+        return _error_part(404, f'接口不存在 {subrequest.path}')
+    if getattr(match.func, 'view_class', None) is BatchView:
+        return _error_part(400, '批量请求不能嵌套')
+    subrequest.resolver_match = match
+    try:
+        response = match.func(subrequest, *match.args, **match.kwargs)
+        if callable(getattr(response, 'render', None)) and not getattr(response, 'is_rendered', True):
+            response.render()
+        if response.streaming:
+            content = b''.join(response.streaming_content)
+        else:
+            content = response.content
+        response.close()
+    except Http404:
+        return _error_part(404, f'接口不存在 {subrequest.path}')
+    except PermissionDenied:
+        return _error_part(403, '没有权限')
+    except Exception:
+        logger.exception('amis 批量子请求失败：%s %s', subrequest.method, subrequest.get_full_path())
+        return _error_part(500, '服务器内部错误')
+    return _encode_part(response.status_code, response.get('Content-Type'), content)
+
+
+def _dispatch_in_worker(request: HttpRequest, item: Dict[str, Any], urlconf, language) -> bytes:
+    # URLconf 和语言是线程局部状态，在工作线程中还原外层请求的设置
+    set_urlconf(urlconf)
+    try:
+        with translation.override(language):
+            return dispatch_subrequest(request, item)
+    finally:
+        set_urlconf(None)
+        close_old_connections()
+
+
+def _load_identity(request: HttpRequest) -> None:
+    """
+    在提交到线程池之前加载惰性的用户和会话，避免多个工作线程同时触发加载
+    """
+    user = getattr(request, 'user', None)
+    if user is not None:
+        user.is_authenticated
+    session = getattr(request, 'session', None)
+    if session is not None:
+        session.keys()
+
+
+def dispatch_batch(request: HttpRequest, items: List[Dict[str, Any]]) -> bytes:
+    """
+    执行全部子请求，返回编码好的结果数组（顺序与 items 一致）
+    """
+    _load_identity(request)
+    if len(items) <= 1 or getattr(settings, 'AMIS_BATCH_WORKERS', 4) <= 1:
+        parts = [dispatch_subrequest(request, item) for item in items]
+    else:
+        executor = get_batch_executor()
+        urlconf, language = get_urlconf(), translation.get_language()
+        futures = [executor.submit(_dispatch_in_worker, request, item, urlconf, language) for item in items]
+        parts = [future.result() for future in futures]
+    return b'[' + b','.join(parts) + b']'
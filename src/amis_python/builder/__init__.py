@@ -1,23 +1,56 @@
-from .base import *
-from .api import *
-from .app import *
-from .layout import *
-from .action import Action
-from .button import Button
-from .button_group import ButtonGroup
-from .event_action import EventAction
-from .tabs import Tabs, TabsItem, TabsMode, IconPosition, SidePosition
-from .wrapper import Wrapper
-from .tpl import Tpl
-from .image import Image, ImageAction
-from .dialog import Dialog
-from .service import Service
-from .divider import Divider
+# 组件按需导入：访问 amis_python.builder.Xxx 时才导入对应模块（见 __getattr__）
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base import BaseModel, EventConfig, Field, camelize, trusted_build, validate_tree
+    from .api import Api, LazyAmisApiObject, convert_ninja_path_to_amis_template, to_api, to_apis
+    from .app import AppBuilder, AppPageGroupBuilder, AppPageBuilder
+    from .layout import Page, Container, Panel, Flex, Pagination, Card, Cards
+    from .action import Action
+    from .button import Button
+    from .button_group import ButtonGroup
+    from .event_action import EventAction
+    from .tabs import Tabs, TabsItem, TabsMode, IconPosition, SidePosition
+    from .wrapper import Wrapper
+    from .tpl import Tpl
+    from .image import Image, ImageAction
+    from .dialog import Dialog
+    from .service import Service
+    from .divider import Divider
+    from .profiling import profile_serialization
+    from .warmup import warmup_models
+
+# 导出名称 -> 所在模块
+_EXPORTS = {
+    'BaseModel': '.base', 'EventConfig': '.base', 'Field': '.base', 'camelize': '.base',
+    'trusted_build': '.base', 'validate_tree': '.base',
+    'Api': '.api', 'LazyAmisApiObject': '.api', 'convert_ninja_path_to_amis_template': '.api', 'to_api': '.api',
+    'to_apis': '.api',
+    'AppBuilder': '.app', 'AppPageGroupBuilder': '.app', 'AppPageBuilder': '.app',
+    'Page': '.layout', 'Container': '.layout', 'Panel': '.layout', 'Flex': '.layout',
+    'Pagination': '.layout', 'Card': '.layout', 'Cards': '.layout',
+    'Action': '.action',
+    'Button': '.button',
+    'ButtonGroup': '.button_group',
+    'EventAction': '.event_action',
+    'Tabs': '.tabs', 'TabsItem': '.tabs', 'TabsMode': '.tabs', 'IconPosition': '.tabs', 'SidePosition': '.tabs',
+    'Wrapper': '.wrapper',
+    'Tpl': '.tpl',
+    'Image': '.image', 'ImageAction': '.image',
+    'Dialog': '.dialog',
+    'Service': '.service',
+    'Divider': '.divider',
+    'profile_serialization': '.profiling',
+    'warmup_models': '.warmup',
+}
 
 
 __all__ = [
     # 基础组件
-    'Api','BaseModel','Service','Divider',
+    'Api','BaseModel','EventConfig','Service','Divider',
+    # 构建工具
+    'trusted_build', 'validate_tree', 'profile_serialization', 'warmup_models',
     # 布局组件
     'Page', 'Container', 'Panel', 'Flex', 'Pagination',
     # 应用组件
@@ -35,3 +68,17 @@ __all__ = [
     # 图片组件
     'Image', 'ImageAction'
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # 缓存到模块命名空间，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -1,8 +1,6 @@
 import re
 from typing import Literal, Optional, Dict, Any, Callable
 
-from django.urls import reverse, reverse_lazy
-
 from .base import BaseModel, Field
 
 
@@ -55,6 +53,9 @@ class Api(BaseModel):
 class LazyAmisApiObject(BaseModel):
     """
     AMIS 中结构化的 API 配置对象，用于懒加载。
+
+    url/method 在序列化时从进程级路由表（见 ``amis_python.routes``）中查出，
+    URLconf 重新加载后自动使用新的路由。
     """
     model_config = {
         "arbitrary_types_allowed": True
@@ -65,6 +66,7 @@ class LazyAmisApiObject(BaseModel):
         # 使用普通实例变量，而不是 Pydantic 字段，因为 Pydantic 不允许字段名以下划线开头
         self._api_view = api_view
         self._api_obj = None
+        self._route = None
         self._kwargs = {
             "data": data,
             "headers": headers,
@@ -72,30 +74,49 @@ class LazyAmisApiObject(BaseModel):
             "adaptor": adaptor,
         }
 
-    def model_dump(self, by_alias=True, exclude_none=True, **kwargs) -> Dict[str, Any]:
-        if self._api_obj is None:
-            operation = self._api_view._ninja_operation
-            methods = operation.methods
-            base_url = '/'.join(reverse("api-1.0.0:base_url").split('/')[:-1])
-            method = ''
-            if 'GET' in methods:
-                method = 'get'
-            elif 'POST' in methods:
-                method = 'post'
-            elif 'PUT' in methods:
-                method = 'put'
-            elif 'DELETE' in methods:
-                method = 'delete'
-            elif 'PATCH' in methods:
-                method = 'patch'
-            url = convert_ninja_path_to_amis_template(f"{base_url}{operation.path}")
+    def resolve(self) -> Api:
+        """
+        解析为 Api 对象，路由未变化时复用上次的结果
+        """
+        # 延迟导入，避免导入组件时加载 Django URL 模块
+        from amis_python.routes import get_api_route
+
+        route = get_api_route(self._api_view)
+        if self._route is not route:
+            # 接口用 amis_cache 声明了服务端缓存时，浏览器端使用相同的缓存时间
+            operation = getattr(self._api_view, '_ninja_operation', self._api_view)
+            view_func = getattr(operation, 'view_func', self._api_view)
             self._api_obj = Api(
-                url=url,
-                method=method,
+                url=route.url,
+                method=route.method or None,
+                cache=getattr(view_func, 'amis_cache', None),
                 **self._kwargs
             )
-        return self._api_obj.model_dump(by_alias, exclude_none, **kwargs)
+            self._route = route
+        return self._api_obj
+
+    def model_dump(self, by_alias=True, exclude_none=True, **kwargs) -> Dict[str, Any]:
+        return self.resolve().model_dump(by_alias, exclude_none, **kwargs)
 
 
-def to_api(api_view) -> LazyAmisApiObject:
-    return LazyAmisApiObject(api_view=api_view)
+def to_api(api_view, **kwargs) -> LazyAmisApiObject:
+    return LazyAmisApiObject(api_view=api_view, **kwargs)
+
+
+def to_apis(router, **kwargs) -> Dict[str, LazyAmisApiObject]:
+    """
+    批量生成 ninja Router（或 NinjaAPI）下所有接口的 LazyAmisApiObject
+
+    Returns:
+        接口函数名 -> LazyAmisApiObject，包含子路由中的接口（重名时取先注册的）
+    """
+    apis: Dict[str, LazyAmisApiObject] = {}
+    routers = [router]
+    while routers:
+        current = routers.pop(0)
+        # NinjaAPI 本身没有 path_operations，接口都在其默认路由和子路由中
+        for path_view in getattr(current, 'path_operations', {}).values():
+            for operation in path_view.operations:
+                apis.setdefault(operation.view_func.__name__, LazyAmisApiObject(api_view=operation, **kwargs))
+        routers.extend(child for _, child in getattr(current, '_routers', ()))
+    return apis
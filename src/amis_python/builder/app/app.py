@@ -2,7 +2,7 @@
 from typing import Any, Dict, List, Union, Optional, Literal
 
 from ..api import Api
-from ..base import BaseModel, Field
+from ..base import BaseModel, Field, validate_tree
 from ..layout.page import Page
 from .group import AppPageGroupBuilder
 from .page import AppPageBuilder
@@ -62,7 +62,8 @@ class AppBuilder(BaseModel):
             path: str,
             page: Optional[Page] = None,
             group_label: Optional[str] = '',
-            visible=True
+            visible=True,
+            validate: bool = False
     ) -> AppPageBuilder:
         """
         注册页面，需要指定分组
@@ -72,9 +73,12 @@ class AppBuilder(BaseModel):
             page: 页面实例
             label: 页面在导航菜单中显示的名称
             group_label: 分组标题，如果未指定，则使用空组
+            validate: 是否在注册时校验页面组件树（用于受信任模式下构建的页面）
         Returns:
             注册的 AppPageBuilder 实例
         """
+        if validate and isinstance(page, BaseModel):
+            validate_tree(page)
 
         # 将页面添加到指定分组
         group = self.get_group(group_label)
@@ -105,6 +109,7 @@ class AppBuilder(BaseModel):
         # 创建分组实例
         new_group = AppPageGroupBuilder(label=label, icon=icon, class_name=class_name, children=[])
         self.pages.append(new_group)
+        self.mark_dirty()
         return new_group
 
     def get_group(self, label: str="") -> Optional[AppPageGroupBuilder]:
@@ -39,11 +39,13 @@ class AppPageGroupBuilder(BaseModel):
         if path =='/':
             page = AppPageBuilder(label=label, path=path, url=path)
             self.children.append(page)
+            self.mark_dirty()
             return page
         paths = [p for p in path.split('/') if p]
         if len(paths) == 1:
             page = AppPageBuilder(label=label, path=path, url=path)
             self.children.append(page)
+            self.mark_dirty()
             return page
         new_clildren = sorted(self.children, key=lambda x: len(x.path), reverse=True)
         for child in new_clildren:
@@ -62,6 +62,7 @@ class AppPageBuilder(BaseModel):
         if len(paths) - len(self_paths) == 1:
             app_page = AppPageBuilder(label=label, path=path, url=path, visible=visible)
             self.children.append(app_page)
+            self.mark_dirty()
             return app_page
         elif len(paths) - len(self_paths) > 1:
             for child in self.children:
@@ -10,12 +10,20 @@ Pydantic 基础构造器模块，为所有 amis 节点提供统一的序列化
 注意：type 字段不再通过抽象属性强制，而是作为 Pydantic 模型字段，
       由子类使用 Literal 显式定义，确保序列化能正确进行。
 """
-import webbrowser
-import tempfile
-import os
-import shutil
-from typing import Any, Dict, Optional
-from pydantic import BaseModel as PydanticBaseModel, ConfigDict, Field
+import copy
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel as PydanticBaseModel, ConfigDict, Field, GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+from .dump import compiled_dump, invalidate_node, is_compiled_dump_enabled, iter_child_nodes
+from .encoding import encode_json
+from .profiling import get_active_profile
+
+# 受信任构建模式：开启后组件按 model_construct 的方式构建，跳过校验
+_trusted_build: ContextVar[bool] = ContextVar('amis_trusted_build', default=False)
 
 
 def camelize(snake_str: str) -> str:
@@ -23,23 +31,283 @@ def camelize(snake_str: str) -> str:
     components = snake_str.split('_')
     return components[0] + ''.join(word.capitalize() for word in components[1:])
 
+@contextmanager
+def trusted_build(enabled: bool = True):
+    """
+    受信任构建模式（上下文管理器）
+
+    在该上下文中创建的组件不经过 pydantic 校验，字段直接按 model_construct 的方式赋值，
+    适用于由可信代码生成的组件树；需要时可以在注册时调用 ``validate_tree`` 补做一次校验。
+
+    示例：
+        with trusted_build():
+            page = build_page()
+        validate_tree(page)
+    """
+    token = _trusted_build.set(enabled)
+    try:
+        yield
+    finally:
+        _trusted_build.reset(token)
+
+
+# 不需要复制的默认值类型
+_IMMUTABLE_DEFAULT_TYPES = (type(None), str, int, float, bool, Enum, tuple, frozenset)
+
+
+class _ConstructPlan:
+    """
+    受信任模式下按类预先计算的构建计划（等价于 model_construct，但不逐字段深拷贝默认值）
+    """
+    __slots__ = ('defaults', 'mutable_defaults', 'factories', 'by_alias', 'alias_of')
+
+    def __init__(self, cls):
+        self.defaults: Dict[str, Any] = {}
+        self.mutable_defaults = []
+        self.factories = []
+        self.by_alias: Dict[str, list] = {}
+        self.alias_of: Dict[str, str] = {}
+        for name, field in cls.model_fields.items():
+            alias = field.validation_alias if isinstance(field.validation_alias, str) else (field.alias or name)
+            self.alias_of[name] = alias
+            self.by_alias.setdefault(alias, []).append(name)
+            if field.default_factory is not None:
+                self.factories.append((name, field.default_factory))
+            elif not field.is_required():
+                self.defaults[name] = field.default
+                if not isinstance(field.default, _IMMUTABLE_DEFAULT_TYPES):
+                    self.mutable_defaults.append(name)
+
+    def build(self, data: Dict[str, Any]):
+        values = dict(self.defaults)
+        for name in self.mutable_defaults:
+            values[name] = copy.deepcopy(values[name])
+        for name, factory in self.factories:
+            values[name] = factory()
+        fields_set = set()
+        extra = {}
+        for key, value in data.items():
+            matched = False
+            for name in self.by_alias.get(key, ()):
+                values[name] = value
+                fields_set.add(name)
+                matched = True
+            # populate_by_name：按字段名赋值，但字段别名同时出现时以别名为准
+            alias = self.alias_of.get(key)
+            if alias is not None and alias != key and alias not in data:
+                values[key] = value
+                fields_set.add(key)
+                matched = True
+            if not matched:
+                extra[key] = value
+                fields_set.add(key)
+        return values, fields_set, extra
+
+
+_construct_plans: Dict[type, _ConstructPlan] = {}
+
+# derive 路径分隔符：body__0__title
+_PATH_SEP = '__'
+
+
+def _override_tree(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    把 ``{"body__0__title": v}`` 形式的覆盖项整理为按路径嵌套的 dict，叶子为 (值,)
+    """
+    tree: Dict[str, Any] = {}
+    for path, value in overrides.items():
+        keys = path.split(_PATH_SEP)
+        node = tree
+        for key in keys[:-1]:
+            child = node.setdefault(key, {})
+            if isinstance(child, tuple):
+                raise ValueError(f"derive 覆盖路径冲突: {path}")
+            node = child
+        if keys[-1] in node:
+            raise ValueError(f"derive 覆盖路径冲突: {path}")
+        node[keys[-1]] = (value,)
+    return tree
+
+
+def _node_key(node: PydanticBaseModel, key: str) -> str:
+    # 别名（驼峰）转换为字段名，未声明的键作为 extra 字段
+    fields = node.__class__.model_fields
+    if key in fields:
+        return key
+    for name, field in fields.items():
+        if field.alias == key:
+            return name
+    return key
+
+
+def _derive_value(value: Any, tree: Dict[str, Any], path: str) -> Any:
+    """
+    按覆盖树复制 value：只复制被修改的路径上的节点/列表/dict，其余部分共享
+    """
+    if isinstance(value, PydanticBaseModel):
+        result = value.model_copy()
+        for key, item in tree.items():
+            name = _node_key(result, key)
+            if isinstance(item, tuple):
+                if _trusted_build.get():
+                    setattr(result, name, item[0])
+                else:
+                    # 只校验覆盖值本身
+                    result.__class__.__pydantic_validator__.validate_assignment(result, name, item[0])
+            else:
+                setattr(result, name, _derive_value(getattr(result, name, None), item, f'{path}{_PATH_SEP}{key}'))
+        return result
+    if isinstance(value, (list, tuple)):
+        result = list(value)
+        for key, item in tree.items():
+            try:
+                index = int(key)
+                current = result[index]
+            except (ValueError, IndexError):
+                raise KeyError(f"derive 路径不存在: {path}{_PATH_SEP}{key}") from None
+            result[index] = item[0] if isinstance(item, tuple) else _derive_value(current, item, f'{path}{_PATH_SEP}{key}')
+        return result if isinstance(value, list) else tuple(result)
+    if isinstance(value, dict):
+        result = dict(value)
+        for key, item in tree.items():
+            if isinstance(item, tuple):
+                result[key] = item[0]
+            elif key in result:
+                result[key] = _derive_value(result[key], item, f'{path}{_PATH_SEP}{key}')
+            else:
+                raise KeyError(f"derive 路径不存在: {path}{_PATH_SEP}{key}")
+        return result
+    raise KeyError(f"derive 路径不存在: {path}")
+
+
+def validate_tree(node: PydanticBaseModel) -> None:
+    """
+    校验组件树（通常是在受信任模式下构建的），校验失败时抛出 pydantic 的 ValidationError
+    """
+    for child in iter_child_nodes(node):
+        validate_tree(child)
+    values = node.__dict__
+    data = {name: values[name] for name in node.__pydantic_fields_set__ if name in node.__class__.model_fields}
+    if node.__pydantic_extra__:
+        data.update(node.__pydantic_extra__)
+    node.__class__.__pydantic_validator__.validate_python(data)
+
+
+class EventConfig(dict):
+    """
+    onEvent 中单个事件的配置：``{"actions": [...], "weight": ..., "debounce": ...}``
+
+    本身就是 dict，保持书写时的键顺序，原来按 dict 读写 onEvent 的代码不受影响；
+    常用的 ``actions``、``weight``、``debounce`` 也可以按属性访问。动作可以是组件对象
+    （EventAction、Action、轻量组件等）或普通 dict，不做转换，序列化时按实际类型输出；
+    受信任模式下未经校验的普通 dict 同样可以正常序列化。
+    """
+    __slots__ = ()
+
+    @property
+    def actions(self) -> List[Any]:
+        """动作列表（不存在时创建）"""
+        return self.setdefault('actions', [])
+
+    @actions.setter
+    def actions(self, value: List[Any]) -> None:
+        self['actions'] = value
+
+    @property
+    def weight(self) -> Optional[int]:
+        """事件权重"""
+        return self.get('weight')
+
+    @weight.setter
+    def weight(self, value: Optional[int]) -> None:
+        self['weight'] = value
+
+    @property
+    def debounce(self) -> Optional[Dict[str, Any]]:
+        """防抖配置"""
+        return self.get('debounce')
+
+    @debounce.setter
+    def debounce(self, value: Optional[Dict[str, Any]]) -> None:
+        self['debounce'] = value
+
+    @classmethod
+    def _validate(cls, value: Dict[str, Any]) -> 'EventConfig':
+        if not isinstance(value.get('actions', []), list):
+            raise ValueError('onEvent 的 actions 必须是列表')
+        return cls(value)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        # 校验为 dict 后包装为 EventConfig；序列化按 dict 处理，值按实际类型输出
+        return core_schema.no_info_after_validator_function(
+            cls._validate, core_schema.dict_schema(core_schema.str_schema(), core_schema.any_schema()),
+        )
+
+
 class BaseModel(PydanticBaseModel):
     """amis 组件通用基类，统一处理序列化行为"""
     model_config = ConfigDict(
         alias_generator=camelize,
         populate_by_name=True,
-        extra='allow'
+        extra='allow',
+        # 校验器/序列化器在首次使用时才构建（见 warmup.warmup_models）
+        defer_build=True,
     )
     id: Optional[str] = Field(None, description="组件 ID")
     label: Optional[str] = Field(None, description="名称")
     debug: Optional[bool] = Field(None, description="调试模式")
     # ==================== 事件配置 ====================
-    on_event: Optional[Dict[str, Any]] = Field(None, description="事件动作配置")
+    on_event: Optional[Dict[str, EventConfig]] = Field(None, description="事件动作配置")
+
+    # 序列化缓存（见 dump.NodeCache），放在 slots 中以免被 pydantic 当作字段处理
+    __slots__ = ('_amis_cache', '__weakref__')
+    # 允许 dump.cached_dump 在节点上缓存序列化结果
+    __amis_cacheable__ = True
+
+    def __init__(self, **data):
+        if not _trusted_build.get():
+            super().__init__(**data)
+            return
+        plan = _construct_plans.get(self.__class__)
+        if plan is None:
+            plan = _construct_plans[self.__class__] = _ConstructPlan(self.__class__)
+        values, fields_set, extra = plan.build(data)
+        object.__setattr__(self, '__dict__', values)
+        object.__setattr__(self, '__pydantic_fields_set__', fields_set)
+        object.__setattr__(self, '__pydantic_extra__', extra)
+        object.__setattr__(self, '__pydantic_private__', None)
+        if self.__class__.__pydantic_post_init__:
+            self.model_post_init(None)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith('_'):
+            invalidate_node(self)
+
+    def mark_dirty(self) -> 'BaseModel':
+        """
+        标记节点已修改，使节点及其祖先节点的序列化缓存失效。
+
+        字段赋值会自动调用；原地修改列表/字典（如 ``body.append(...)``）后需要手动调用。
+        """
+        invalidate_node(self)
+        return self
     
     def model_dump(self,exclude_none=True,by_alias=True,**kwargs):
+        if exclude_none and by_alias and not kwargs:
+            profile = get_active_profile()
+            if profile is not None:
+                return profile.dump(self)
+            if is_compiled_dump_enabled():
+                return compiled_dump(self)
         return super().model_dump(exclude_none=exclude_none,by_alias=by_alias,**kwargs)
     
     def model_dump_json(self,*,exclude_none=True,by_alias=True,**kwargs) -> str:
+        if exclude_none and by_alias and not kwargs:
+            profile = get_active_profile()
+            if profile is not None:
+                return encode_json(profile.dump(self)).decode()
         return super().model_dump_json(exclude_none=exclude_none,by_alias=by_alias,**kwargs)
     
     def add_action(self, event_name: str, action: 'BaseModel') -> 'BaseModel':
@@ -54,59 +322,44 @@ class BaseModel(PydanticBaseModel):
             self，支持链式调用
         """
         # 确保 onEvent 属性存在
-        if not self.on_event:
-            self.on_event = {}
-        
+        on_event = self.on_event
+        if on_event is None:
+            on_event = self.on_event = {}
+
         # 确保事件存在并初始化 actions 列表
-        if event_name not in self.on_event:
-            self.on_event[event_name] = {'actions': []}
-        
-        # 直接添加 action 对象到 actions 列表中
-        self.on_event[event_name]['actions'].append(action)
+        config = on_event.get(event_name)
+        if config is None:
+            config = on_event[event_name] = EventConfig()
+
+        # 直接添加 action 对象到 actions 列表中（受信任模式下构建的 onEvent 可能仍是普通 dict）
+        config.setdefault('actions', []).append(action)
+        self.mark_dirty()
         
         return self
+
+    def derive(self, **overrides) -> 'BaseModel':
+        """
+        派生一个修改了部分属性的新组件（写时复制）
+
+        只复制从根到被修改位置路径上的节点、列表和 dict，未修改的子组件在原组件和
+        派生组件之间共享，内存开销与差异大小成正比。键可以是字段名、别名或 extra 字段，
+        用 ``__`` 连接表示嵌套路径，列表用下标::
+
+            page = base_page.derive(title="用户", body__0__api="/api/users")
+
+        组件字段的覆盖值按字段类型校验（受信任构建模式下不校验）。共享的子组件不应再原地修改，
+        请继续通过 ``derive`` 派生。
+        """
+        return _derive_value(self, _override_tree(overrides), self.__class__.__name__)
     
-    def show(self):
+    def show(self, open_browser: bool = True):
         """
         在浏览器中预览当前 AMIS 组件的渲染效果
+
+        schema 推送到常驻的本地预览服务（见 ``preview``），已打开的预览页自动刷新，
+        没有预览页时才打开浏览器。返回预览服务。
         """
-        # 将当前模型转换为 JSON 字符串
-        amis_json = self.model_dump_json()
-        
-        # 创建临时目录
-        temp_dir = tempfile.mkdtemp()
-        
-        # 复制 AMIS 静态资源到临时目录
-        amis_static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'amis')
-        
-        # 复制整个 AMIS 静态目录到临时目录
-        # 先创建 amis 子目录
-        temp_amis_dir = os.path.join(temp_dir, 'amis')
-        os.makedirs(temp_amis_dir, exist_ok=True)
-        
-        # 复制所有文件和子目录
-        for item in os.listdir(amis_static_dir):
-            src_item = os.path.join(amis_static_dir, item)
-            dest_item = os.path.join(temp_amis_dir, item)
-            if os.path.isdir(src_item):
-                shutil.copytree(src_item, dest_item)
-            else:
-                shutil.copy2(src_item, dest_item)
-        
-        # 生成临时 HTML 文件
-        temp_html_path = os.path.join(temp_dir, 'index.html')
-        
-        # 读取预览模板内容
-        preview_html_path = os.path.join(amis_static_dir, 'preview.html')
-        with open(preview_html_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
-        # 替换模板中的 AMIS_JSON 占位符
-        modified_html = html_content.replace('{{AMIS_JSON}}', amis_json)
-        
-        # 保存修改后的 HTML 文件
-        with open(temp_html_path, 'w', encoding='utf-8') as f:
-            f.write(modified_html)
-        
-        # 在浏览器中打开临时 HTML 文件
-        webbrowser.open('file://' + temp_html_path)
\ No newline at end of file
+        # 只有预览时才用到，延迟导入以减少 import 开销
+        from .preview import show
+
+        return show(self.model_dump_json().encode(), open_browser=open_browser)
\ No newline at end of file
@@ -0,0 +1,78 @@
+# batch.py
+"""
+页面初始请求合并。
+
+仪表盘类页面加载时会同时发出很多 ``service`` / ``crud`` / 下拉框 ``source`` 等请求，
+``batch_initial_apis`` 对序列化后的 schema 做后处理，把这些首屏就会发出的 GET 请求
+标记上 ``X-Amis-Batch`` 请求头。前端（``static/amis/index.html`` 中的 fetcher）把同一时刻
+发出的带标记请求合并成一次 ``POST /amis/batch``，服务端通过 URL 解析器在线程池中
+分发各个子请求（见 ``amis_python.batch``）。
+
+只标记站内（``/`` 开头）的接口；``exclude_prefixes``（默认 ``/amis/``，页面和片段接口
+有自己的缓存和增量机制）下的接口、``initFetch: false`` 的组件不标记。
+输入不会被修改，未变化的子树在结果中直接复用。
+"""
+from typing import Any, Dict, Optional, Tuple
+
+from .definitions import DATA_KEYS
+
+BATCH_HEADER = 'X-Amis-Batch'
+
+# 组件加载时就会请求的接口属性
+_INITIAL_KEYS = ('initApi', 'schemaApi', 'source')
+# api 属性用于加载数据（而不是提交）的组件
+_FETCH_TYPES = frozenset({'service', 'crud', 'crud2', 'chart', 'cards', 'list', 'table2'})
+
+
+def _batch_api(api: Any, exclude_prefixes: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    """
+    可以合并时返回带标记的 Api 配置，否则返回 None
+    """
+    if isinstance(api, str):
+        method, _, url = api.partition(':') if api.startswith(('get:', 'GET:')) else ('get', '', api)
+        api = {'method': 'get', 'url': url}
+    elif isinstance(api, dict):
+        method = api.get('method') or 'get'
+        url = api.get('url')
+    else:
+        return None
+    if method.lower() != 'get' or not isinstance(url, str) or not url.startswith('/') or url.startswith('//'):
+        return None
+    if url.startswith(exclude_prefixes):
+        return None
+    headers = api.get('headers') or {}
+    if headers.get(BATCH_HEADER):
+        return None
+    return {**api, 'headers': {**headers, BATCH_HEADER: '1'}}
+
+
+def batch_initial_apis(schema: Any, exclude_prefixes: Tuple[str, ...] = ('/amis/',)) -> Any:
+    """
+    标记页面首屏请求，前端把它们合并为一次批量请求
+    """
+
+    def visit(value: Any) -> Any:
+        if isinstance(value, list):
+            items = [visit(item) for item in value]
+            return value if all(new is old for new, old in zip(items, value)) else items
+        if not isinstance(value, dict):
+            return value
+        result = None
+        keys = _INITIAL_KEYS + ('api',) if value.get('type') in _FETCH_TYPES else _INITIAL_KEYS
+        if value.get('initFetch') is False:
+            keys = ('source',)
+        for key, item in value.items():
+            if key in keys:
+                new_item = _batch_api(item, exclude_prefixes) or item
+            elif key in DATA_KEYS:
+                # 值是数据（或接口配置），不再向下遍历
+                continue
+            else:
+                new_item = visit(item)
+            if new_item is not item:
+                if result is None:
+                    result = dict(value)
+                result[key] = new_item
+        return value if result is None else result
+
+    return visit(schema)
@@ -0,0 +1,160 @@
+# defaults.py
+"""
+amis 默认值表及默认值裁剪。
+
+很多组件字段带有与 amis 渲染器默认值相同的非 None 默认值（例如 ``Service`` 的
+``autoRequest: true``、``timeout: 30000``），每个组件实例都会把它们输出到 schema 中。
+``prune_defaults`` 对序列化后的 schema 做一次后处理，删除与 ``AMIS_DEFAULTS``
+中默认值相同的属性，渲染结果不变，schema 更小。
+
+表中只收录 amis 文档中明确的默认值；与 amis 默认值不同的组件默认值
+（如 ``Dialog.close_on_esc=True``）不会被删除。自定义组件可以通过
+``register_defaults`` 补充。
+"""
+from enum import Enum
+from typing import Any, Dict
+
+from .definitions import DATA_KEYS
+
+# 组件类型 -> {属性: amis 默认值}
+AMIS_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    'service': {
+        'autoRequest': True,
+        'silentRequest': False,
+        'silentPolling': False,
+        'debounce': 0,
+        'throttle': 0,
+        'cache': False,
+        'cacheLife': 300,
+        'timeout': 30000,
+        'retries': 0,
+        'retryInterval': 1000,
+    },
+    'dialog': {
+        'closeOnEsc': False,
+        'closeOnOutside': False,
+        'showCloseButton': True,
+        'showErrorMsg': True,
+        'showLoading': True,
+    },
+    'drawer': {
+        'closeOnEsc': False,
+        'closeOnOutside': False,
+        'showCloseButton': True,
+        'showErrorMsg': True,
+        'showLoading': True,
+        'position': 'right',
+    },
+    'image': {
+        'imageMode': 'thumb',
+        'thumbMode': 'contain',
+        'thumbRatio': '1:1',
+        'showToolbar': False,
+    },
+    'container': {
+        'wrapperComponent': 'div',
+    },
+    'panel': {
+        'className': 'panel-default',
+        'headerClassName': 'panel-heading',
+        'footerClassName': 'panel-footer bg-light lter wrapper',
+        'actionsClassName': 'panel-footer',
+        'bodyClassName': 'panel-body',
+    },
+    'tabs': {
+        'mountOnEnter': False,
+        'unmountOnExit': False,
+        'addable': False,
+        'addBtnText': '增加',
+        'closable': False,
+        'draggable': False,
+        'showTip': False,
+        'showTipClassName': '',
+        'editable': False,
+        'scrollable': False,
+        'sidePosition': 'left',
+        'collapseBtnLabel': 'more',
+        'swipeable': False,
+    },
+    # Tabs 的选项卡没有 type，见 ITEM_DEFAULTS
+    'tabs-item': {
+        'className': 'bg-white b-l b-r b-b wrapper-md',
+        'closable': False,
+        'disabled': False,
+    },
+    'form': {
+        'mode': 'normal',
+        'wrapWithPanel': True,
+        'submitText': '提交',
+    },
+    'page': {
+        'asideResizor': False,
+    },
+}
+
+# 没有 type 的子项：父组件类型 -> {属性: 子项默认值表名}
+ITEM_DEFAULTS: Dict[str, Dict[str, str]] = {
+    'tabs': {'tabs': 'tabs-item'},
+}
+
+
+def register_defaults(component_type: str, **defaults: Any) -> None:
+    """
+    补充组件类型的 amis 默认值，属性名使用 schema 中的名称（驼峰）
+
+    Args:
+        component_type: 组件 type
+        defaults: 属性及其 amis 默认值
+    """
+    AMIS_DEFAULTS.setdefault(component_type, {}).update(defaults)
+
+
+def _is_default(value: Any, default: Any) -> bool:
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, bool) or isinstance(default, bool):
+        # 避免 True == 1、False == 0
+        return value is default
+    return type(value) is type(default) and value == default
+
+
+def _prune(value: Any, table: Dict[str, Any] = None) -> Any:
+    if isinstance(value, dict):
+        component_type = value.get('type')
+        if table is None and isinstance(component_type, str):
+            table = AMIS_DEFAULTS.get(component_type)
+        items = ITEM_DEFAULTS.get(component_type) if isinstance(component_type, str) else None
+        result = None
+        for key, item in value.items():
+            if table is not None and key in table and _is_default(item, table[key]):
+                if result is None:
+                    result = dict(value)
+                del result[key]
+                continue
+            if key in DATA_KEYS:
+                continue
+            item_table = AMIS_DEFAULTS.get(items[key]) if items and key in items else None
+            if item_table is not None and isinstance(item, list):
+                new_item = [_prune(child, item_table) for child in item]
+                if all(new is old for new, old in zip(new_item, item)):
+                    new_item = item
+            else:
+                new_item = _prune(item)
+            if new_item is not item:
+                if result is None:
+                    result = dict(value)
+                result[key] = new_item
+        return value if result is None else result
+    if isinstance(value, list):
+        items = [_prune(item) for item in value]
+        return value if all(new is old for new, old in zip(items, value)) else items
+    return value
+
+
+def prune_defaults(schema: Any) -> Any:
+    """
+    删除序列化后的 schema 中与 amis 默认值相同的属性
+
+    输入不会被修改，未变化的子树在结果中直接复用。
+    """
+    return _prune(schema)
@@ -0,0 +1,237 @@
+# definitions.py
+"""
+schema 去重模块，把重复出现的组件子树提取到 amis 的 ``definitions`` 中。
+
+生成的 CRUD 页面里经常重复出现相同的弹框表单、按钮组、下拉选项等，
+``dedupe_definitions`` 对序列化后的 schema（dict）做一次后处理：
+
+1. 自底向上计算每个组件子树（带 ``type`` 的 dict）的 JSON 及其哈希；
+2. 出现次数不少于 ``min_count`` 且 JSON 长度不小于 ``min_size`` 的子树提取到
+   页面顶层的 ``definitions`` 中；
+3. 原位置替换为 ``{"$ref": "<名称>"}``；
+4. 外层子树提取后只剩一处引用的内层定义再展开回去。
+
+输入不会被修改（缓存的 dict 在多处共享），未变化的子树在结果中直接复用。
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from .encoding import encode_json
+
+# 这些属性的值是数据而不是 schema，不参与去重
+DATA_KEYS = frozenset({
+    'data', 'api', 'initApi', 'schemaApi', 'source', 'style', 'value', 'defaultParams',
+    'headers', 'responseData', 'args', 'context', 'definitions', 'css', 'cssVars',
+})
+
+
+@dataclass
+class DedupeReport:
+    """
+    去重结果统计
+    """
+    bytes_before: int = 0
+    bytes_after: int = 0
+    definitions: int = 0
+    references: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    def merge(self, other: 'DedupeReport') -> None:
+        self.bytes_before += other.bytes_before
+        self.bytes_after += other.bytes_after
+        self.definitions += other.definitions
+        self.references += other.references
+
+
+class _Deduper:
+    def __init__(self, min_size: int, min_count: int, prefix: str, reserved):
+        self.min_size = min_size
+        self.min_count = min_count
+        self.prefix = prefix
+        self.reserved = set(reserved)
+        self.digests: Dict[int, bytes] = {}
+        self.counts: Dict[bytes, int] = {}
+        self.names: Dict[bytes, str] = {}
+        self.definitions: Dict[str, Any] = {}
+        self.references = 0
+
+    def encode(self, value: Any, schema: bool = True) -> bytes:
+        """
+        自底向上编码并统计组件子树，返回 value 的 JSON
+        """
+        if isinstance(value, dict):
+            parts = []
+            for key, item in value.items():
+                child_schema = schema and key not in DATA_KEYS
+                parts.append(encode_json(key if isinstance(key, str) else str(key)) + b':' + self.encode(item, child_schema))
+            content = b'{' + b','.join(parts) + b'}'
+            if schema and isinstance(value.get('type'), str) and len(content) >= self.min_size:
+                digest = hashlib.blake2b(content, digest_size=16).digest()
+                self.digests[id(value)] = digest
+                self.counts[digest] = self.counts.get(digest, 0) + 1
+            return content
+        if isinstance(value, (list, tuple)):
+            return b'[' + b','.join(self.encode(item, schema) for item in value) + b']'
+        return encode_json(value)
+
+    def reference(self, digest: bytes, node: Dict[str, Any]) -> Dict[str, str]:
+        name = self.names.get(digest)
+        if name is None:
+            index = len(self.names) + 1
+            name = f'{self.prefix}{index}'
+            while name in self.reserved:
+                index += 1
+                name = f'{self.prefix}{index}'
+            self.reserved.add(name)
+            self.names[digest] = name
+            # 定义本身的内部也继续去重
+            body, _ = self.rewrite_children(node)
+            self.definitions[name] = body
+        self.references += 1
+        return {'$ref': name}
+
+    def count_references(self, value: Any, counts: Dict[str, int]) -> None:
+        if isinstance(value, dict):
+            name = value.get('$ref')
+            if name in self.definitions:
+                counts[name] += 1
+                return
+            for key, item in value.items():
+                if key not in DATA_KEYS:
+                    self.count_references(item, counts)
+        elif isinstance(value, list):
+            for item in value:
+                self.count_references(item, counts)
+
+    def inline(self, value: Any, names) -> Any:
+        """把只被引用一次的定义展开回原位置"""
+        if isinstance(value, dict):
+            name = value.get('$ref')
+            if name in names:
+                return self.inline(self.definitions[name], names)
+            return {key: item if key in DATA_KEYS else self.inline(item, names) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.inline(item, names) for item in value]
+        return value
+
+    def collapse(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        外层子树被提取后，其内部子树的出现次数会折叠为一次，
+        这类只剩一处引用的定义没有收益，展开回去
+        """
+        counts = dict.fromkeys(self.definitions, 0)
+        self.count_references(result, counts)
+        for body in self.definitions.values():
+            self.count_references(body, counts)
+        single = {name for name, count in counts.items() if count < self.min_count}
+        if not single:
+            return result
+        self.references -= sum(counts[name] for name in single)
+        definitions = {
+            name: self.inline(body, single) for name, body in self.definitions.items() if name not in single
+        }
+        result = self.inline(result, single)
+        self.definitions = definitions
+        return result
+
+    def rewrite(self, value: Any) -> Tuple[Any, bool]:
+        if isinstance(value, dict):
+            digest = self.digests.get(id(value))
+            if digest is not None and self.counts[digest] >= self.min_count:
+                return self.reference(digest, value), True
+            return self.rewrite_children(value)
+        if isinstance(value, list):
+            items = []
+            changed = False
+            for item in value:
+                new_item, item_changed = self.rewrite(item)
+                items.append(new_item)
+                changed = changed or item_changed
+            return (items, True) if changed else (value, False)
+        return value, False
+
+    def rewrite_children(self, node: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        result = None
+        for key, item in node.items():
+            if key in DATA_KEYS:
+                continue
+            new_item, changed = self.rewrite(item)
+            if changed:
+                if result is None:
+                    result = dict(node)
+                result[key] = new_item
+        return (result, True) if result is not None else (node, False)
+
+
+def dedupe_definitions(
+        schema: Dict[str, Any],
+        min_size: int = 256,
+        min_count: int = 2,
+        prefix: str = 'amisDef'
+) -> Tuple[Dict[str, Any], DedupeReport]:
+    """
+    对页面 schema 做子树去重，返回新的 schema 和去重统计
+
+    Args:
+        schema: 序列化后的页面（type 为 page）；应用配置（type 为 app）会对其中内联的页面逐个处理
+        min_size: 参与去重的子树最小 JSON 长度（字节）
+        min_count: 子树最少出现次数
+        prefix: 生成的定义名称前缀
+    """
+    if not isinstance(schema, dict):
+        return schema, DedupeReport()
+    if schema.get('type') == 'app':
+        return _dedupe_app(schema, min_size, min_count, prefix)
+    if schema.get('type') != 'page':
+        return schema, DedupeReport()
+
+    existing = schema.get('definitions') or {}
+    deduper = _Deduper(min_size, min_count, prefix, existing)
+    before = len(deduper.encode(schema))
+    # 根节点本身不能被替换
+    deduper.digests.pop(id(schema), None)
+    result, changed = deduper.rewrite_children(schema)
+    if not changed:
+        return schema, DedupeReport(before, before)
+    result = deduper.collapse(result)
+    result['definitions'] = {**existing, **deduper.definitions}
+    report = DedupeReport(
+        bytes_before=before,
+        bytes_after=len(encode_json(result)),
+        definitions=len(deduper.definitions),
+        references=deduper.references,
+    )
+    return result, report
+
+
+def _dedupe_app(schema, min_size, min_count, prefix):
+    report = DedupeReport()
+
+    def visit(items: List[Any]):
+        new_items = []
+        changed = False
+        for item in items:
+            if isinstance(item, dict):
+                new_item = item
+                if isinstance(item.get('schema'), dict):
+                    page, page_report = dedupe_definitions(item['schema'], min_size, min_count, prefix)
+                    report.merge(page_report)
+                    if page is not item['schema']:
+                        new_item = {**item, 'schema': page}
+                if isinstance(item.get('children'), list):
+                    children, children_changed = visit(item['children'])
+                    if children_changed:
+                        new_item = {**new_item, 'children': children}
+                changed = changed or new_item is not item
+                item = new_item
+            new_items.append(item)
+        return new_items, changed
+
+    pages, changed = visit(schema.get('pages') or [])
+    if changed:
+        schema = {**schema, 'pages': pages}
+    return schema, report
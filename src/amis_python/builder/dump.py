@@ -0,0 +1,303 @@
+# dump.py
+"""
+编译式序列化模块，为 amis 组件提供按类预编译的 dump 计划。
+
+pydantic 默认的 ``model_dump(exclude_none=True, by_alias=True)`` 会逐个访问
+组件声明的全部字段（CRUD、Action 等组件有上百个字段，绝大多数为 None），
+这里为每个组件类预先计算好：
+
+- 字段名 → 输出键（alias）的映射表；
+- 字段声明顺序（保证输出顺序与 pydantic 一致）；
+- 默认值不为 None 的字段（无论是否显式赋值都可能需要输出）。
+
+序列化时只访问「显式赋值过的字段 + 默认值非 None 的字段」，输出结果与
+pydantic 的 ``model_dump(exclude_none=True, by_alias=True)`` 保持一致。
+
+该路径是可选的：通过 ``set_compiled_dump(True)``（或 Django 配置
+``AMIS_COMPILED_DUMP = True``）开启后，``BaseModel.model_dump()`` 在使用默认参数
+调用时会走编译路径；也可以直接调用 ``compiled_dump(obj)``。
+
+在此基础上，``cached_dump(obj)`` / ``cached_dump_json(obj)`` 会把每个节点的
+序列化结果缓存在节点上。节点字段被赋值（或通过 ``add_action`` 等方法原地修改）时，
+节点自身及其所有祖先节点的缓存失效；未变化的子树在重新序列化时直接复用缓存。
+缓存返回的 dict 在节点之间共享，调用方必须将其视为只读。
+"""
+import weakref
+from enum import Enum
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel as PydanticBaseModel
+
+from .encoding import encode_json
+
+# 直接原样输出的标量类型（精确类型匹配，Enum 等子类走通用分支）
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+_compiled_enabled = False
+
+
+class DumpPlan:
+    """
+    单个组件类的预编译 dump 计划
+    """
+    __slots__ = ('cls', 'fields', 'aliases', 'index', 'always', 'fallback')
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.fields: Tuple[str, ...] = tuple(cls.model_fields)
+        self.aliases: Dict[str, str] = {
+            name: field.serialization_alias or field.alias or name
+            for name, field in cls.model_fields.items()
+        }
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.fields)}
+        # 必填字段的 default 为 PydanticUndefined，同样归入此类
+        self.always: FrozenSet[str] = frozenset(
+            name for name, field in cls.model_fields.items()
+            if field.default_factory is not None or field.default is not None
+        )
+        # 自定义了序列化逻辑的类无法安全地编译，退回 pydantic
+        decorators = cls.__pydantic_decorators__
+        self.fallback: bool = bool(
+            decorators.field_serializers
+            or decorators.model_serializers
+            or decorators.computed_fields
+        )
+
+    def populated(self, obj) -> List[str]:
+        """
+        返回可能需要输出的字段名（按声明顺序）
+        """
+        # fields_set 中也会包含 extra 字段名，只保留声明过的字段
+        names = self.always.union(obj.__pydantic_fields_set__.intersection(self.index))
+        if len(names) == len(self.fields):
+            return list(self.fields)
+        return sorted(names, key=self.index.__getitem__)
+
+    def dump(self, obj, dump_model: Callable[[Any], Any] = None) -> Dict[str, Any]:
+        """
+        序列化单个节点；dump_model 用于处理嵌套的组件节点（默认直接按计划递归）
+        """
+        if self.fallback:
+            return obj.__pydantic_serializer__.to_python(obj, exclude_none=True, by_alias=True)
+        values = obj.__dict__
+        aliases = self.aliases
+        result = {}
+        for name in self.populated(obj):
+            value = values.get(name)
+            if value is None:
+                continue
+            if value.__class__ not in _SCALAR_TYPES:
+                value = _dump_value(value, dump_model)
+            result[aliases[name]] = value
+        extra = obj.__pydantic_extra__
+        if extra:
+            for key, value in extra.items():
+                if value is None:
+                    continue
+                if value.__class__ not in _SCALAR_TYPES:
+                    value = _dump_value(value, dump_model)
+                result[key] = value
+        return result
+
+
+_plans: Dict[type, DumpPlan] = {}
+
+
+def get_dump_plan(cls) -> DumpPlan:
+    """
+    获取（必要时编译）组件类的 dump 计划
+    """
+    plan = _plans.get(cls)
+    if plan is None:
+        plan = _plans[cls] = DumpPlan(cls)
+    return plan
+
+
+def _plain_dump(obj) -> Dict[str, Any]:
+    plan = _plans.get(obj.__class__) or get_dump_plan(obj.__class__)
+    return plan.dump(obj)
+
+
+def _dump_value(value: Any, dump_model: Callable[[Any], Any] = None) -> Any:
+    if isinstance(value, PydanticBaseModel):
+        return (dump_model or _plain_dump)(value)
+    if isinstance(value, list):
+        return dump_many(value, dump_model)
+    if isinstance(value, dict):
+        return {
+            key: item if item.__class__ in _SCALAR_TYPES else _dump_value(item, dump_model)
+            for key, item in value.items()
+        }
+    if isinstance(value, tuple):
+        return tuple(dump_many(value, dump_model))
+    if isinstance(value, (set, frozenset)) and not isinstance(value, Enum):
+        return value.__class__(dump_many(value, dump_model))
+    return value
+
+
+def dump_many(items, dump_model: Callable[[Any], Any] = None) -> List[Any]:
+    """
+    批量序列化列表（如 columns、body），同类组件共用同一个 dump 计划
+    """
+    if dump_model is not None:
+        return [
+            item if item.__class__ in _SCALAR_TYPES else _dump_value(item, dump_model)
+            for item in items
+        ]
+    result = []
+    append = result.append
+    last_cls = None
+    plan: Optional[DumpPlan] = None
+    for item in items:
+        cls = item.__class__
+        if cls in _SCALAR_TYPES:
+            append(item)
+        elif cls is last_cls:
+            append(plan.dump(item))
+        elif isinstance(item, PydanticBaseModel):
+            last_cls = cls
+            plan = get_dump_plan(cls)
+            append(plan.dump(item))
+        else:
+            append(_dump_value(item))
+    return result
+
+
+def iter_child_nodes(obj) -> Iterator[PydanticBaseModel]:
+    """
+    遍历节点字段（含 extra 字段）中直接嵌套的子组件，包括列表、字典中的组件
+    """
+    values = obj.__dict__
+    stack = [values[name] for name in obj.__class__.model_fields if values.get(name) is not None]
+    if obj.__pydantic_extra__:
+        stack.extend(obj.__pydantic_extra__.values())
+    stack.reverse()
+    while stack:
+        value = stack.pop()
+        if value.__class__ in _SCALAR_TYPES:
+            continue
+        if isinstance(value, PydanticBaseModel):
+            yield value
+        elif isinstance(value, dict):
+            stack.extend(reversed(list(value.values())))
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            stack.extend(reversed(list(value)))
+
+
+def compiled_dump(obj: PydanticBaseModel) -> Dict[str, Any]:
+    """
+    使用预编译计划序列化组件，等价于 ``model_dump(exclude_none=True, by_alias=True)``
+    """
+    return get_dump_plan(obj.__class__).dump(obj)
+
+
+def set_compiled_dump(enabled: bool = True) -> None:
+    """
+    开启/关闭 ``BaseModel.model_dump()`` 的编译序列化路径
+    """
+    global _compiled_enabled
+    _compiled_enabled = bool(enabled)
+
+
+def is_compiled_dump_enabled() -> bool:
+    return _compiled_enabled
+
+
+# ==================== 子树缓存 ====================
+
+class NodeCache:
+    """
+    节点上的序列化缓存及父节点反向引用
+
+    ``data`` 中保存 dict/JSON 等由节点序列化结果派生的数据，节点变化时整体清空；
+    ``parents`` 保存引用过该节点的父节点（弱引用），用于向上传播失效。
+    """
+    __slots__ = ('data', 'parents', 'version')
+
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.parents: Dict[int, weakref.ref] = {}
+        self.version = 0
+
+    def add_parent(self, parent) -> None:
+        key = id(parent)
+        if key not in self.parents:
+            self.parents[key] = weakref.ref(parent)
+
+    def invalidate(self) -> None:
+        # 本节点没有缓存数据时祖先节点仍可能有（如并发修改时放弃写入的子节点），
+        # 因此总是传播到所有祖先；共享的祖先只处理一次
+        pending = [self]
+        seen = {id(self)}
+        while pending:
+            cache = pending.pop()
+            cache.version += 1
+            cache.data.clear()
+            for ref in list(cache.parents.values()):
+                parent = ref()
+                parent_cache = getattr(parent, '_amis_cache', None) if parent is not None else None
+                if parent_cache is not None and id(parent_cache) not in seen:
+                    seen.add(id(parent_cache))
+                    pending.append(parent_cache)
+
+
+def get_node_cache(obj) -> NodeCache:
+    """
+    获取节点上的缓存对象（不存在时创建）
+
+    缓存保存在 ``BaseModel`` 的 ``__slots__`` 中，不会进入 ``__dict__``，
+    因此不参与比较、复制和 pickle。
+    """
+    cache = getattr(obj, '_amis_cache', None)
+    if cache is None:
+        cache = NodeCache()
+        object.__setattr__(obj, '_amis_cache', cache)
+    return cache
+
+
+def invalidate_node(obj) -> None:
+    """
+    使节点及其祖先节点的缓存失效
+    """
+    cache = getattr(obj, '_amis_cache', None)
+    if cache is not None:
+        cache.invalidate()
+
+
+def cached_dump(obj) -> Dict[str, Any]:
+    """
+    带子树缓存的序列化，结果与 ``compiled_dump(obj)`` 相同
+    """
+    cache = get_node_cache(obj)
+    result = cache.data.get('dict')
+    if result is not None:
+        return result
+    version = cache.version
+
+    def dump_child(child):
+        if not getattr(child.__class__, '__amis_cacheable__', False):
+            # 不缓存的节点（如 EventConfig）中的组件仍挂到当前节点上，以便修改时向上失效
+            return get_dump_plan(child.__class__).dump(child, dump_child)
+        get_node_cache(child).add_parent(obj)
+        return cached_dump(child)
+
+    result = get_dump_plan(obj.__class__).dump(obj, dump_child)
+    # 序列化期间节点被修改时不写入缓存
+    if cache.version == version:
+        cache.data['dict'] = result
+    return result
+
+
+def cached_dump_json(obj) -> bytes:
+    """
+    带缓存的 JSON 序列化，返回 UTF-8 编码的 bytes
+    """
+    cache = get_node_cache(obj)
+    result = cache.data.get('json')
+    if result is not None:
+        return result
+    version = cache.version
+    result = encode_json(cached_dump(obj))
+    if cache.version == version:
+        cache.data['json'] = result
+    return result
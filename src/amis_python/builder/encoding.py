@@ -0,0 +1,58 @@
+# encoding.py
+"""
+JSON 编码模块，直接把 amis schema 编码为 UTF-8 bytes。
+
+- 组件对象通过 pydantic-core 一次性编码为 JSON（不先生成 dict）；
+- 轻量组件（见 ``lite``）先按 ``model_dump()`` 生成 dict 再编码；
+- 普通 dict/list 优先使用 orjson（已安装时），否则使用 pydantic-core 的 ``to_json``；
+- ``encode_envelope`` 把已编码好的 schema 包装成 ``{"status":0,"msg":"ok","data":...}``，
+  不需要再解码 schema。
+"""
+from typing import Any
+
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 是可选依赖
+    orjson = None
+
+
+def encode_json(obj: Any) -> bytes:
+    """
+    把组件对象或普通数据编码为 JSON bytes，组件按 ``exclude_none=True, by_alias=True`` 输出
+    """
+    if isinstance(obj, PydanticBaseModel):
+        return obj.__pydantic_serializer__.to_json(obj, exclude_none=True, by_alias=True)
+    if getattr(obj.__class__, '__amis_lite__', False):
+        obj = obj.model_dump()
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default)
+        except TypeError:
+            # 数据中嵌套了 orjson 不认识的类型
+            pass
+    return to_json(obj, by_alias=True, exclude_none=True, fallback=_default)
+
+
+def _default(value: Any) -> Any:
+    """
+    编码普通数据时遇到的组件对象
+    """
+    if getattr(value.__class__, '__amis_lite__', False):
+        return value.model_dump()
+    if isinstance(value, PydanticBaseModel):
+        return value.__pydantic_serializer__.to_python(value, exclude_none=True, by_alias=True, mode='json')
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def encode_envelope(content: bytes, code: int = 0, msg: Any = 'ok', **kwargs) -> bytes:
+    """
+    把已编码的 data 包装为 amis 统一响应体
+    """
+    parts = [b'{"status":', encode_json(code), b',"msg":', encode_json(msg), b',"data":', content]
+    for key, value in kwargs.items():
+        parts += [b',', encode_json(key), b':', encode_json(value)]
+    parts.append(b'}')
+    return b''.join(parts)
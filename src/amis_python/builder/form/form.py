@@ -4,7 +4,7 @@ from enum import Enum
 from pydantic import Field
 
 from amis_python import Api
-from amis_python.builder import BaseModel
+from amis_python.builder import BaseModel, EventConfig
 
 
 # ====================== 枚举类型 ======================
@@ -140,4 +140,4 @@ class Form(BaseModel):
     affix_footer: Optional[bool] = Field(None, description="是否固定底部按钮栏在浏览器底部")
 
     # ==================== 事件相关（预留） ====================
-    on_event: Optional[Dict[str, Any]] = Field(None, description="事件动作配置，支持 onSubmitSuccess、onSubmitFail 等自定义动作")
\ No newline at end of file
+    on_event: Optional[Dict[str, EventConfig]] = Field(None, description="事件动作配置，支持 onSubmitSuccess、onSubmitFail 等自定义动作")
\ No newline at end of file
@@ -0,0 +1,194 @@
+# fragments.py
+"""
+大页面按需加载：把首屏不可见的大子树拆分为片段。
+
+``split_fragments`` 对序列化后的 schema 做后处理，把以下首屏不渲染的内容中超过
+``min_size`` 字节的子树替换为 ``service`` 组件，由 ``schemaApi`` 在需要时加载：
+
+- ``tabs`` 中非激活选项卡的内容（``tab`` / ``body``）；
+- 按钮、事件动作中 ``dialog`` / ``drawer`` 的 ``body``；
+- ``collapsed: true`` 的折叠面板的 ``body``。
+
+片段用 JSON Pointer 定位（指向拆分前的 schema），``schemaApi`` 为
+``<片段接口>?pointer=<JSON Pointer>``；片段接口用 ``resolve_pointer`` 取出子树，
+再对子树做同样的拆分。片段接口也可以用组件 id 定位（``?id=<组件 id>``），
+``build_id_index`` 生成 id 到 JSON Pointer 的索引。
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from .definitions import DATA_KEYS
+from .encoding import encode_json
+
+# 弹框类动作中内容按需加载的键
+_DIALOG_KEYS = ('dialog', 'drawer')
+# 选项卡内容的键
+_TAB_BODY_KEYS = ('tab', 'body')
+
+
+def escape_token(token: Any) -> str:
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def unescape_token(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def resolve_pointer(schema: Any, pointer: str) -> Any:
+    """
+    按 JSON Pointer 取出子树，路径不存在时抛出 KeyError
+    """
+    if pointer == '':
+        return schema
+    if not pointer.startswith('/'):
+        raise KeyError(pointer)
+    value = schema
+    for token in pointer[1:].split('/'):
+        token = unescape_token(token)
+        try:
+            value = value[int(token)] if isinstance(value, list) else value[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise KeyError(pointer) from None
+    return value
+
+
+def build_id_index(schema: Any) -> Dict[str, str]:
+    """
+    组件 id -> JSON Pointer 的索引，同一 id 出现多次时取第一次出现的位置
+    """
+    index: Dict[str, str] = {}
+
+    def visit(value: Any, pointer: str) -> None:
+        if isinstance(value, dict):
+            component_id = value.get('id')
+            if isinstance(component_id, str) and component_id not in index:
+                index[component_id] = pointer
+            for key, item in value.items():
+                if key not in DATA_KEYS and isinstance(item, (dict, list)):
+                    visit(item, f'{pointer}/{escape_token(key)}')
+        elif isinstance(value, list):
+            for position, item in enumerate(value):
+                if isinstance(item, (dict, list)):
+                    visit(item, f'{pointer}/{position}')
+
+    visit(schema, '')
+    return index
+
+
+def _active_tab(tabs: Dict[str, Any]) -> Optional[int]:
+    """
+    首屏激活的选项卡下标，激活项由表达式决定等无法静态确定时返回 None
+    """
+    items = tabs.get('tabs')
+    if not isinstance(items, list):
+        return None
+    key = tabs.get('activeKey', tabs.get('defaultKey', 0))
+    if isinstance(key, bool):
+        return None
+    if isinstance(key, int):
+        return key
+    if isinstance(key, str):
+        if '${' in key:
+            return None
+        for index, item in enumerate(items):
+            if isinstance(item, dict) and item.get('hash') == key:
+                return index
+        if key.isdigit():
+            return int(key)
+    return None
+
+
+class _Splitter:
+    def __init__(self, schema_api: str, min_size: int):
+        self.schema_api = schema_api
+        self.min_size = min_size
+        self.pointers: List[str] = []
+
+    def fragment(self, value: Any, pointer: str) -> Any:
+        """
+        子树足够大时替换为按需加载的 service
+        """
+        if value is None or isinstance(value, str) or len(encode_json(value)) < self.min_size:
+            return self.visit(value, pointer)
+        self.pointers.append(pointer)
+        separator = '&' if '?' in self.schema_api else '?'
+        return {'type': 'service', 'schemaApi': f'{self.schema_api}{separator}pointer={quote(pointer, safe="/")}'}
+
+    def replace(self, node: Dict[str, Any], result: Optional[Dict[str, Any]], key: str, value: Any) -> Optional[Dict[str, Any]]:
+        if value is node[key]:
+            return result
+        if result is None:
+            result = dict(node)
+        result[key] = value
+        return result
+
+    def visit(self, value: Any, pointer: str) -> Any:
+        if isinstance(value, list):
+            items = [self.visit(item, f'{pointer}/{index}') for index, item in enumerate(value)]
+            return value if all(new is old for new, old in zip(items, value)) else items
+        if not isinstance(value, dict):
+            return value
+        result = None
+        lazy_tabs = set()
+        if value.get('type') == 'tabs':
+            active = _active_tab(value)
+            if active is not None:
+                lazy_tabs = {index for index in range(len(value['tabs'])) if index != active}
+        for key, item in value.items():
+            if key in DATA_KEYS:
+                continue
+            child_pointer = f'{pointer}/{escape_token(key)}'
+            if key == 'tabs' and lazy_tabs:
+                new_item = [
+                    self.split_tab(tab, f'{child_pointer}/{index}') if index in lazy_tabs else self.visit(tab, f'{child_pointer}/{index}')
+                    for index, tab in enumerate(item)
+                ]
+                if all(new is old for new, old in zip(new_item, item)):
+                    new_item = item
+            elif key in _DIALOG_KEYS and isinstance(item, dict) and 'body' in item:
+                new_body = self.fragment(item['body'], f'{child_pointer}/body')
+                new_item = self.replace(item, None, 'body', new_body) or item
+                new_item = self.visit_rest(new_item, item, child_pointer, ('body',))
+            elif key == 'body' and value.get('collapsed') is True:
+                new_item = self.fragment(item, child_pointer)
+            else:
+                new_item = self.visit(item, child_pointer)
+            result = self.replace(value, result, key, new_item)
+        return value if result is None else result
+
+    def visit_rest(self, new_node: Dict[str, Any], node: Dict[str, Any], pointer: str, skip: Tuple[str, ...]) -> Dict[str, Any]:
+        """
+        继续处理已拆分节点中 skip 以外的属性（如弹框的 actions、选项卡的标题）
+        """
+        result = None if new_node is node else new_node
+        for key, item in node.items():
+            if key in skip or key in DATA_KEYS:
+                continue
+            result = self.replace(node, result, key, self.visit(item, f'{pointer}/{escape_token(key)}'))
+        return node if result is None else result
+
+    def split_tab(self, tab: Any, pointer: str) -> Any:
+        if not isinstance(tab, dict):
+            return self.visit(tab, pointer)
+        result = tab
+        for key in _TAB_BODY_KEYS:
+            if key in tab:
+                content = self.fragment(tab[key], f'{pointer}/{key}')
+                result = self.replace(tab, None if result is tab else result, key, content) or tab
+        return self.visit_rest(result, tab, pointer, _TAB_BODY_KEYS)
+
+
+def split_fragments(schema: Any, schema_api: str, min_size: int = 4096, pointer: str = '') -> Tuple[Any, List[str]]:
+    """
+    把首屏不可见的大子树替换为按需加载的 service
+
+    Args:
+        schema: 序列化后的 schema（不会被修改，未变化的子树直接复用）
+        schema_api: 片段接口地址
+        min_size: 子树紧凑 JSON 达到该字节数时才拆分
+        pointer: schema 在整个页面中的位置（处理片段本身时使用）
+    Returns:
+        (拆分后的 schema, 被拆分出的片段的 JSON Pointer 列表)
+    """
+    splitter = _Splitter(schema_api, min_size)
+    return splitter.visit(schema, pointer), splitter.pointers
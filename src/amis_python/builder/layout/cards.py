@@ -2,7 +2,7 @@ from typing import Optional, Literal, Dict, Any, Union, List
 from pydantic import Field
 
 
-from amis_python.builder import BaseModel
+from amis_python.builder import BaseModel, EventConfig
 
 
 class Cards(BaseModel):
@@ -51,4 +51,4 @@ class Cards(BaseModel):
     required: Optional[bool] = Field(None, description="是否必填组件")
     tooltip: Optional[Union[str, Dict[str, Any]]] = Field(None, description="组件提示")
     description: Optional[str] = Field(None, description="组件描述")
-    on_event: Optional[Dict[str, Any]] = Field(None, description="事件配置")
+    on_event: Optional[Dict[str, EventConfig]] = Field(None, description="事件配置")
@@ -1,7 +1,7 @@
 from typing import Optional, Literal, Union, List, Dict, Any
 from pydantic import Field
 
-from amis_python.builder import BaseModel
+from amis_python.builder import BaseModel, EventConfig
 
 
 class Pagination(BaseModel):
@@ -29,5 +29,5 @@ class Pagination(BaseModel):
     disabled: Optional[bool] = Field(None, description="是否禁用")
     has_next: Optional[bool] = Field(None, description="是否有下一页，配合 simple 模式使用")
     last_page: Optional[Union[int, str]] = Field(None, description="最后一页")
-    on_event: Optional[Dict[str, Any]] = Field(None, description="事件配置")
+    on_event: Optional[Dict[str, EventConfig]] = Field(None, description="事件配置")
     on_page_change: Optional[Any] = Field(None, description="page、perPage 改变时会触发")
@@ -0,0 +1,251 @@
+# lite.py
+"""
+轻量组件后端：由组件类的字段定义生成基于 ``__slots__`` 的同名孪生类。
+
+孪生类与原组件类的构造参数一致（字段名或驼峰别名均可，未声明的参数作为额外属性），
+但不做任何校验、不经过 pydantic，``model_dump()`` / ``model_dump_json()`` 输出与原组件
+``model_dump()`` 完全相同的驼峰 JSON。适用于每次请求都要生成成千上万个组件的页面工厂::
+
+    from amis_python.builder import lite
+
+    def user_page(request):
+        return lite.Page(title="用户", body=[lite.InputText(name=f"f{i}") for i in range(5000)])
+
+测试中调用 ``set_lite_validation(True)``（或配置 ``AMIS_LITE_VALIDATE = True``）后，
+孪生类的构造会直接返回经过 pydantic 校验的原组件实例；也可以用 ``to_model()``
+把已有的轻量组件树转换为原组件树。
+
+重写了 ``__init__`` 或序列化逻辑的类（应用结构 ``AppBuilder`` 等、``LazyAmisApiObject``）
+不提供孪生类。
+"""
+import copy
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel as PydanticBaseModel
+
+from .base import BaseModel, _IMMUTABLE_DEFAULT_TYPES
+from .dump import compiled_dump, get_dump_plan
+from .encoding import encode_json
+
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+_validate_lite = False
+
+
+class LiteModel:
+    """
+    轻量组件孪生类的基类
+    """
+    __slots__ = ('_extra',)
+    # 原组件类
+    __model__ = BaseModel
+    # (字段名, 输出键) 按声明顺序
+    __amis_fields__ = ()
+    # encoding.encode_json 等据此识别轻量组件
+    __amis_lite__ = True
+
+    def __new__(cls, **data):
+        if _validate_lite:
+            # 校验模式下直接构造原组件
+            return cls.__model__(**data)
+        return super().__new__(cls)
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name, _ in self.__amis_fields__ if getattr(self, name) is not None)
+        return f'{self.__class__.__name__}({fields})'
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.model_dump() == other.model_dump()
+
+    __hash__ = None
+
+    def model_dump(self, exclude_none=True, by_alias=True) -> Dict[str, Any]:
+        """
+        序列化为与原组件 ``model_dump()`` 相同的 dict
+        """
+        result = {}
+        for name, alias in self.__amis_fields__:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            if value.__class__ not in _SCALAR_TYPES:
+                value = _dump_value(value)
+            result[alias] = value
+        if self._extra:
+            for key, value in self._extra.items():
+                if value is None:
+                    continue
+                result[key] = value if value.__class__ in _SCALAR_TYPES else _dump_value(value)
+        return result
+
+    def model_dump_json(self, exclude_none=True, by_alias=True) -> str:
+        return encode_json(self.model_dump()).decode()
+
+    @property
+    def model_extra(self) -> Optional[Dict[str, Any]]:
+        return self._extra
+
+    def add_action(self, event_name: str, action: Any) -> 'LiteModel':
+        """
+        添加事件动作，与 ``BaseModel.add_action`` 相同
+        """
+        if not self.on_event:
+            self.on_event = {}
+        if event_name not in self.on_event:
+            self.on_event[event_name] = {'actions': []}
+        self.on_event[event_name]['actions'].append(action)
+        return self
+
+    def mark_dirty(self) -> 'LiteModel':
+        # 轻量组件没有序列化缓存
+        return self
+
+    def to_model(self) -> BaseModel:
+        """
+        转换为经过校验的原组件（递归转换子组件）
+        """
+        data = {name: _to_model(getattr(self, name)) for name, _ in self.__amis_fields__}
+        if self._extra:
+            data.update((key, _to_model(value)) for key, value in self._extra.items())
+        return self.__model__(**data)
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, LiteModel):
+        return value.model_dump()
+    if isinstance(value, PydanticBaseModel):
+        return compiled_dump(value)
+    if isinstance(value, list):
+        return [item if item.__class__ in _SCALAR_TYPES else _dump_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: item if item.__class__ in _SCALAR_TYPES else _dump_value(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return tuple(_dump_value(item) for item in value)
+    if isinstance(value, (set, frozenset)) and not isinstance(value, Enum):
+        return value.__class__(_dump_value(item) for item in value)
+    return value
+
+
+def _to_model(value: Any) -> Any:
+    if isinstance(value, LiteModel):
+        return value.to_model()
+    if isinstance(value, list):
+        return [_to_model(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_model(item) for key, item in value.items()}
+    return value
+
+
+def _make_init(cls):
+    """
+    生成孪生类的 __init__：先按默认值给全部字段赋值，再按参数（别名优先）覆盖，其余参数作为额外属性
+    """
+    namespace: Dict[str, Any] = {'_deepcopy': copy.deepcopy, '_setattr': setattr}
+    none_fields = []
+    lines = ['def __init__(self, **data):']
+    by_key: Dict[str, list] = {}
+    alias_of: Dict[str, str] = {}
+    for index, (name, field) in enumerate(cls.model_fields.items()):
+        alias = field.validation_alias if isinstance(field.validation_alias, str) else (field.alias or name)
+        by_key.setdefault(alias, []).append(name)
+        if alias != name:
+            alias_of[name] = alias
+        if field.default_factory is not None:
+            namespace[f'_factory_{index}'] = field.default_factory
+            lines.append(f'    self.{name} = _factory_{index}()')
+        elif field.is_required() or field.default is None:
+            none_fields.append(name)
+        else:
+            namespace[f'_default_{index}'] = field.default
+            if isinstance(field.default, _IMMUTABLE_DEFAULT_TYPES):
+                lines.append(f'    self.{name} = _default_{index}')
+            else:
+                lines.append(f'    self.{name} = _deepcopy(_default_{index})')
+    if none_fields:
+        lines.insert(1, '    ' + ' = '.join(f'self.{name}' for name in none_fields) + ' = None')
+    for name, alias in alias_of.items():
+        by_key.setdefault(name, []).append(name)
+    namespace['_BY_KEY'] = {key: tuple(names) for key, names in by_key.items()}
+    namespace['_ALIAS_OF'] = alias_of
+    lines += [
+        '    extra = None',
+        '    for key, value in data.items():',
+        '        names = _BY_KEY.get(key)',
+        '        if names is None:',
+        '            if extra is None:',
+        '                extra = {}',
+        '            extra[key] = value',
+        '            continue',
+        # populate_by_name：按字段名赋值，但字段别名同时出现时以别名为准
+        '        if key in _ALIAS_OF and _ALIAS_OF[key] in data:',
+        '            continue',
+        '        for name in names:',
+        '            _setattr(self, name, value)',
+        '    self._extra = extra',
+    ]
+    exec('\n'.join(lines), namespace)
+    return namespace['__init__']
+
+
+_lite_classes: Dict[type, type] = {}
+
+
+def lite_class(cls: type) -> type:
+    """
+    获取（必要时生成）组件类的轻量孪生类
+    """
+    lite = _lite_classes.get(cls)
+    if lite is not None:
+        return lite
+    if not (isinstance(cls, type) and issubclass(cls, BaseModel)):
+        raise TypeError(f"{cls!r} 不是 amis 组件类")
+    for klass in cls.__mro__:
+        if klass is BaseModel:
+            break
+        if '__init__' in klass.__dict__ or 'model_dump' in klass.__dict__:
+            raise TypeError(f"{cls.__name__} 重写了构造或序列化逻辑，不支持轻量后端")
+    plan = get_dump_plan(cls)
+    if plan.fallback:
+        raise TypeError(f"{cls.__name__} 自定义了序列化逻辑，不支持轻量后端")
+    lite = type(cls.__name__, (LiteModel,), {
+        '__slots__': plan.fields,
+        '__model__': cls,
+        '__amis_fields__': tuple((name, plan.aliases[name]) for name in plan.fields),
+        '__init__': _make_init(cls),
+        '__module__': __name__,
+        '__qualname__': cls.__name__,
+        '__doc__': cls.__doc__,
+    })
+    _lite_classes[cls] = lite
+    return lite
+
+
+def set_lite_validation(enabled: bool = True) -> None:
+    """
+    开启后构造孪生类时返回经过 pydantic 校验的原组件实例（用于测试）
+    """
+    global _validate_lite
+    _validate_lite = bool(enabled)
+
+
+def is_lite_validation_enabled() -> bool:
+    return _validate_lite
+
+
+def __getattr__(name: str):
+    """
+    ``lite.Form`` 等：按名称查找 builder 中的组件类并生成孪生类
+    """
+    from . import crud, form, layout
+    import amis_python.builder as builder
+
+    for module in (builder, form, crud, layout):
+        cls = getattr(module, name, None)
+        if isinstance(cls, type) and issubclass(cls, BaseModel):
+            lite = lite_class(cls)
+            globals()[name] = lite
+            return lite
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,170 @@
+# preview.py
+"""
+组件预览服务。
+
+``BaseModel.show()`` 使用一个常驻的本地预览服务（标准库 ``http.server``，运行在后台线程中）：
+
+- 静态资源直接从包内的 ``static/amis`` 目录提供，不再复制到临时目录；
+- 预览页 ``/preview.html`` 长轮询 ``/__amis__/schema?version=<当前版本>``，
+  schema 更新时立即返回新内容并热替换；
+- ``show()`` 只是把新的 schema 推送给服务，浏览器只在没有预览页连接时才打开。
+
+端口默认随机，可以用环境变量 ``AMIS_PREVIEW_PORT`` 固定。
+"""
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'amis')
+SCHEMA_PATH = '/__amis__/schema'
+# 长轮询的最长等待时间（秒）
+POLL_TIMEOUT = 25.0
+# 预览页在该时间内轮询过，视为仍然打开
+CLIENT_TTL = POLL_TIMEOUT + 10.0
+
+
+class _PreviewHandler(SimpleHTTPRequestHandler):
+    server: '_PreviewHTTPServer'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=STATIC_DIR, **kwargs)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path in ('/', ''):
+            self.path = '/preview.html'
+        elif url.path == SCHEMA_PATH:
+            query = parse_qs(url.query)
+            try:
+                known = int(query.get('version', ['0'])[0])
+            except ValueError:
+                known = 0
+            version, content = self.server.preview.wait(known, POLL_TIMEOUT)
+            body = b'{"version":%d,"schema":%s}' % (version, content)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        # 预览服务不输出访问日志
+        pass
+
+
+class _PreviewHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    preview: 'PreviewServer'
+
+
+class PreviewServer:
+    """
+    常驻的预览服务，保存当前 schema 并通知等待中的预览页
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.host = host
+        self.port = port
+        self.version = 0
+        self.content = b'{}'
+        self.last_poll: Optional[float] = None
+        self._condition = threading.Condition()
+        self._server: Optional[_PreviewHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}/'
+
+    def start(self) -> 'PreviewServer':
+        if self._server is None:
+            server = _PreviewHTTPServer((self.host, self.port), _PreviewHandler)
+            server.preview = self
+            self.port = server.server_address[1]
+            self._server = server
+            self._thread = threading.Thread(target=server.serve_forever, name='amis-preview', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            self._thread.join()
+            self._thread = None
+        with self._condition:
+            # 唤醒仍在等待的长轮询
+            self._condition.notify_all()
+
+    def push(self, content: bytes) -> int:
+        """
+        更新 schema（已编码的 JSON），返回新版本号
+        """
+        with self._condition:
+            self.version += 1
+            self.content = content
+            self._condition.notify_all()
+            return self.version
+
+    def wait(self, known_version: int, timeout: float) -> Tuple[int, bytes]:
+        """
+        等待 schema 版本不同于 known_version，超时后返回当前版本
+        """
+        with self._condition:
+            self.last_poll = time.monotonic()
+            self._condition.wait_for(lambda: self.version != known_version or not self.running, timeout)
+            self.last_poll = time.monotonic()
+            return self.version, self.content
+
+    def has_client(self) -> bool:
+        """
+        最近是否有预览页在轮询
+        """
+        return self.last_poll is not None and time.monotonic() - self.last_poll < CLIENT_TTL
+
+
+_preview_server: Optional[PreviewServer] = None
+_preview_lock = threading.Lock()
+
+
+def get_preview_server() -> PreviewServer:
+    """
+    获取（必要时启动）进程内的预览服务
+    """
+    global _preview_server
+    with _preview_lock:
+        if _preview_server is None or not _preview_server.running:
+            _preview_server = PreviewServer(port=int(os.environ.get('AMIS_PREVIEW_PORT', 0))).start()
+        return _preview_server
+
+
+def stop_preview_server() -> None:
+    global _preview_server
+    with _preview_lock:
+        if _preview_server is not None:
+            _preview_server.stop()
+            _preview_server = None
+
+
+def show(content: bytes, open_browser: bool = True) -> PreviewServer:
+    """
+    推送 schema 到预览服务；没有预览页连接时在浏览器中打开预览页
+    """
+    server = get_preview_server()
+    server.push(content)
+    if open_browser and not server.has_client():
+        import webbrowser
+
+        webbrowser.open(server.url)
+    return server
@@ -0,0 +1,180 @@
+# profiling.py
+"""
+序列化性能分析模块，按组件类型统计序列化开销。
+
+在 ``profile_serialization()`` 上下文中调用 ``model_dump()`` / ``model_dump_json()``
+（使用默认参数）时，会按组件 ``type``（crud2、form、select、dialog……，没有 type 的
+组件使用类名）汇总：
+
+- 节点数；
+- 累计耗时（含子组件）与自身耗时（不含子组件）；
+- 输出的 JSON 字节数（含子组件）与自身字节数。
+
+示例::
+
+    with profile_serialization() as profile:
+        page.model_dump()
+    print(profile.table())
+
+分析期间按 dump 计划逐个节点序列化（与 ``compiled_dump`` 结果一致），自定义了
+序列化逻辑的组件由 pydantic 整体处理，其子组件计入该组件自身。
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from .dump import get_dump_plan
+from .encoding import encode_json
+
+_active_profile: ContextVar[Optional['SerializationProfile']] = ContextVar('amis_serialization_profile', default=None)
+
+SORT_KEYS = ('self_time', 'time', 'self_bytes', 'bytes', 'count')
+
+
+@dataclass
+class TypeStats:
+    """
+    单个组件类型的统计
+    """
+    type: str
+    count: int = 0
+    time: float = 0.0
+    self_time: float = 0.0
+    bytes: int = 0
+    self_bytes: int = 0
+
+
+def component_type(obj) -> str:
+    """
+    组件的统计类型：type 字段值，没有时使用类名
+    """
+    value = getattr(obj, 'type', None)
+    if isinstance(value, str) and value:
+        return value
+    return obj.__class__.__name__
+
+
+class SerializationProfile:
+    """
+    按组件类型汇总的序列化统计
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, TypeStats] = {}
+        self.total_time = 0.0
+        self.total_bytes = 0
+
+    def dump(self, obj) -> Dict[str, Any]:
+        """
+        序列化组件并记录每个节点的耗时和字节数
+        """
+        # 每个节点：[类型, 累计耗时, 子节点耗时, 结果, 子节点序号]
+        records: List[list] = []
+        stack: List[list] = []
+
+        def dump_node(node):
+            record = [component_type(node), 0.0, 0.0, None, []]
+            if stack:
+                stack[-1][4].append(len(records))
+            records.append(record)
+            stack.append(record)
+            start = time.perf_counter()
+            try:
+                result = get_dump_plan(node.__class__).dump(node, dump_node)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+            record[1] = elapsed
+            record[3] = result
+            if stack:
+                stack[-1][2] += elapsed
+            return result
+
+        result = dump_node(obj)
+
+        # 字节数在计时结束后统计
+        sizes = [len(encode_json(record[3])) for record in records]
+        for index, (type_name, elapsed, child_time, _, children) in enumerate(records):
+            stats = self.stats.get(type_name)
+            if stats is None:
+                stats = self.stats[type_name] = TypeStats(type_name)
+            stats.count += 1
+            stats.time += elapsed
+            stats.self_time += elapsed - child_time
+            stats.bytes += sizes[index]
+            stats.self_bytes += sizes[index] - sum(sizes[child] for child in children)
+        self.total_time += records[0][1]
+        self.total_bytes += sizes[0]
+        return result
+
+    @property
+    def nodes(self) -> int:
+        return sum(stats.count for stats in self.stats.values())
+
+    def rows(self, sort: str = 'self_time') -> List[TypeStats]:
+        """
+        按指定指标从大到小排列的统计
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort 必须是 {', '.join(SORT_KEYS)} 之一")
+        return sorted(self.stats.values(), key=lambda stats: getattr(stats, sort), reverse=True)
+
+    def table(self, sort: str = 'self_time', limit: Optional[int] = None) -> str:
+        """
+        生成排名表格文本
+        """
+        header = ('type', 'count', 'self ms', 'cum ms', 'time %', 'self bytes', 'bytes', 'bytes %')
+        lines = []
+        for stats in self.rows(sort)[:limit]:
+            lines.append((
+                stats.type,
+                str(stats.count),
+                f'{stats.self_time * 1000:.2f}',
+                f'{stats.time * 1000:.2f}',
+                f'{stats.self_time / self.total_time * 100:.1f}' if self.total_time else '0.0',
+                str(stats.self_bytes),
+                str(stats.bytes),
+                f'{stats.self_bytes / self.total_bytes * 100:.1f}' if self.total_bytes else '0.0',
+            ))
+        lines.append((
+            'total', str(self.nodes), f'{self.total_time * 1000:.2f}', '', '100.0',
+            str(self.total_bytes), '', '100.0',
+        ))
+        widths = [max(len(row[i]) for row in [header, *lines]) for i in range(len(header))]
+
+        def format_row(row):
+            return '  '.join(cell.ljust(widths[0]) if i == 0 else cell.rjust(widths[i]) for i, cell in enumerate(row))
+
+        return '\n'.join([format_row(header), '  '.join('-' * width for width in widths)] + [format_row(row) for row in lines])
+
+
+def get_active_profile() -> Optional[SerializationProfile]:
+    """
+    当前上下文中正在进行的性能分析，未开启时返回 None
+    """
+    return _active_profile.get()
+
+
+@contextmanager
+def profile_serialization(profile: Optional[SerializationProfile] = None) -> Iterator[SerializationProfile]:
+    """
+    在上下文中记录 ``model_dump()`` / ``model_dump_json()`` 的序列化统计
+    """
+    profile = profile if profile is not None else SerializationProfile()
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+
+
+def profile_dump(obj, repeat: int = 1) -> SerializationProfile:
+    """
+    对组件序列化 repeat 次并返回统计
+    """
+    profile = SerializationProfile()
+    for _ in range(repeat):
+        profile.dump(obj)
+    return profile
@@ -0,0 +1,88 @@
+# streaming.py
+"""
+流式 JSON 编码模块，按块输出组件树的 JSON。
+
+与 ``model_dump_json()`` 一次性生成完整字符串不同，``iter_json`` 按 dump 计划
+逐个节点编码，缓冲区达到 ``chunk_size`` 时立即产出，峰值内存只与当前块大小
+（以及树的深度）有关，适合配合 ``StreamingHttpResponse`` 输出超大页面。
+"""
+from typing import Any, Iterable, Iterator
+
+from pydantic import BaseModel as PydanticBaseModel
+
+from .dump import get_dump_plan
+from .encoding import encode_json
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _iter_model(obj) -> Iterator[bytes]:
+    cache = getattr(obj, '_amis_cache', None)
+    if cache is not None and 'json' in cache.data:
+        # 已缓存的子树直接输出
+        yield cache.data['json']
+        return
+    plan = get_dump_plan(obj.__class__)
+    if plan.fallback:
+        yield encode_json(obj)
+        return
+    values = obj.__dict__
+    items = [(plan.aliases[name], values.get(name)) for name in plan.populated(obj)]
+    if obj.__pydantic_extra__:
+        items.extend(obj.__pydantic_extra__.items())
+    separator = b'{'
+    for key, value in items:
+        if value is None:
+            continue
+        yield separator + encode_json(key) + b':'
+        separator = b','
+        yield from _iter_value(value)
+    yield b'{}' if separator == b'{' else b'}'
+
+
+def _iter_value(value: Any) -> Iterator[bytes]:
+    if isinstance(value, _SCALAR_TYPES):
+        yield encode_json(value)
+    elif isinstance(value, PydanticBaseModel):
+        yield from _iter_model(value)
+    elif isinstance(value, dict):
+        separator = b'{'
+        for key, item in value.items():
+            yield separator + encode_json(key if isinstance(key, str) else str(key)) + b':'
+            separator = b','
+            yield from _iter_value(item)
+        yield b'{}' if separator == b'{' else b'}'
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        separator = b'['
+        for item in value:
+            yield separator
+            separator = b','
+            yield from _iter_value(item)
+        yield b'[]' if separator == b'[' else b']'
+    else:
+        yield encode_json(value)
+
+
+def iter_json(obj: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    流式编码组件树（或包含组件的普通数据），每次产出约 chunk_size 字节
+    """
+    buffer = bytearray()
+    for piece in _iter_value(obj):
+        buffer += piece
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def iter_envelope(chunks: Iterable[bytes], code: int = 0, msg: Any = 'ok') -> Iterator[bytes]:
+    """
+    流式输出 amis 统一响应体，chunks 为 data 部分已编码的分块
+    """
+    yield b'{"status":' + encode_json(code) + b',"msg":' + encode_json(msg) + b',"data":'
+    yield from chunks
+    yield b'}'
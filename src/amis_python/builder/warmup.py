@@ -0,0 +1,89 @@
+# warmup.py
+"""
+组件类 schema 预热。
+
+组件基类配置了 ``defer_build=True``：pydantic 不在类定义（import）时构建校验器和
+序列化器，而是在第一次实例化或序列化时构建。CRUD（一百多个字段）、Action、Form、
+Select 等大类的构建是 import builder 的主要开销，推迟之后只有真正用到的类才付出这部分代价。
+
+服务启动后可以调用 ``warmup_models(background=True)`` 在后台线程中提前构建全部组件类，
+避免第一个请求承担构建开销；也可以配置 ``AMIS_WARMUP``::
+
+    AMIS_WARMUP = "background"  # 启动后在后台线程中预热；True 为同步预热，False（默认）不预热
+"""
+import importlib
+import threading
+from typing import Iterable, List, Optional
+
+from .base import BaseModel
+
+# 预热时导入的组件模块（只列出定义了组件类的模块，工具模块和应用结构不导入）
+_COMPONENT_MODULES = (
+    'action', 'api', 'button', 'button_group', 'dialog', 'divider', 'event_action', 'image', 'service',
+    'tabs', 'tpl', 'wrapper',
+    'crud.crud', 'crud.crud2',
+    'form.form', 'form.form_item', 'form.hidden', 'form.input_file', 'form.input_group', 'form.input_image',
+    'form.input_kv', 'form.input_number', 'form.input_password', 'form.input_text', 'form.json_schema',
+    'form.select', 'form.switch',
+    'layout.card', 'layout.cards', 'layout.container', 'layout.flex', 'layout.page', 'layout.pagination',
+    'layout.panel',
+)
+
+_warmup_lock = threading.Lock()
+
+
+def _import_component_modules() -> None:
+    for name in _COMPONENT_MODULES:
+        importlib.import_module(f'{__package__}.{name}')
+
+
+def component_classes() -> List[type]:
+    """
+    返回已定义的全部组件类（BaseModel 的子类，含用户自定义组件）
+    """
+    classes = []
+    seen = set()
+    stack = [BaseModel]
+    while stack:
+        for subclass in stack.pop().__subclasses__():
+            if subclass not in seen:
+                seen.add(subclass)
+                classes.append(subclass)
+                stack.append(subclass)
+    return classes
+
+
+def is_built(cls: type) -> bool:
+    """
+    组件类的 schema 是否已经构建
+    """
+    return bool(cls.__dict__.get('__pydantic_complete__', False))
+
+
+def _build(classes: Optional[Iterable[type]]) -> int:
+    with _warmup_lock:
+        if classes is None:
+            _import_component_modules()
+            classes = component_classes()
+        built = 0
+        for cls in classes:
+            if not is_built(cls) and cls.model_rebuild():
+                built += 1
+        return built
+
+
+def warmup_models(classes: Optional[Iterable[type]] = None, background: bool = False) -> Optional[threading.Thread]:
+    """
+    构建组件类的 schema
+
+    Args:
+        classes: 需要预热的组件类，默认导入全部内置组件模块并预热所有组件类
+        background: 为 True 时在后台守护线程中构建并返回该线程，否则同步构建后返回 None
+    """
+    if not background:
+        _build(classes)
+        return None
+    classes = list(classes) if classes is not None else None
+    thread = threading.Thread(target=_build, args=(classes,), name='amis-warmup', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,176 @@
+# delta.py
+"""
+页面 schema 增量更新（RFC 6902 JSON Patch）。
+
+客户端在请求头 ``X-Amis-Schema-Version`` 中带上已有 schema 的版本（即 ETag），
+服务端在 ``VersionHistory`` 中查找该版本的内容，计算到当前版本的 JSON Patch；
+补丁比完整 schema 小时返回补丁，否则返回完整内容。
+
+``VersionHistory`` 为每个页面路径保留最近若干个版本（环形缓冲区），
+只保存 zlib 压缩后的 JSON bytes，计算补丁时再解压、解码。
+"""
+import json
+import threading
+import zlib
+from collections import OrderedDict, deque
+from typing import Any, Dict, Hashable, List, Optional
+
+VERSION_HEADER = 'HTTP_X_AMIS_SCHEMA_VERSION'
+# 响应头：当前 schema 版本，客户端据此缓存页面
+VERSION_RESPONSE_HEADER = 'X-Amis-Schema-Version'
+
+
+def _escape(token: Any) -> str:
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def _same(old: Any, new: Any) -> bool:
+    # 逐层比较类型：== 会把 True 与 1、1.0 与 1 视为相同；遇到第一处不同即返回
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, dict):
+        return len(old) == len(new) and all(key in new and _same(value, new[key]) for key, value in old.items())
+    if isinstance(old, list):
+        return len(old) == len(new) and all(_same(a, b) for a, b in zip(old, new))
+    return old == new
+
+
+def _diff(old: Any, new: Any, path: str, ops: List[Dict[str, Any]]) -> None:
+    # 对象直接逐个属性递归，不先比较整棵子树，每个节点只访问一次
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f'{path}/{_escape(key)}'})
+        for key, value in new.items():
+            if key in old:
+                _diff(old[key], value, f'{path}/{_escape(key)}', ops)
+            else:
+                ops.append({'op': 'add', 'path': f'{path}/{_escape(key)}', 'value': value})
+    elif isinstance(old, list) and isinstance(new, list):
+        _diff_list(old, new, path, ops)
+    elif not _same(old, new):
+        ops.append({'op': 'replace', 'path': path, 'value': new})
+
+
+def _diff_list(old: List[Any], new: List[Any], path: str, ops: List[Dict[str, Any]]) -> None:
+    # 去掉相同的前缀和后缀，中间部分逐项比较，多出的元素增删
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and _same(old[prefix], new[prefix]):
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and _same(old[-1 - suffix], new[-1 - suffix]):
+        suffix += 1
+    old_count = len(old) - prefix - suffix
+    new_count = len(new) - prefix - suffix
+    for offset in range(min(old_count, new_count)):
+        index = prefix + offset
+        _diff(old[index], new[index], f'{path}/{index}', ops)
+    for _ in range(old_count - new_count):
+        ops.append({'op': 'remove', 'path': f'{path}/{prefix + new_count}'})
+    for offset in range(old_count, new_count):
+        index = prefix + offset
+        ops.append({'op': 'add', 'path': f'{path}/{index}', 'value': new[index]})
+
+
+def make_patch(old: Any, new: Any) -> List[Dict[str, Any]]:
+    """
+    计算把 old 变为 new 的 JSON Patch（只使用 add/remove/replace）
+    """
+    ops: List[Dict[str, Any]] = []
+    _diff(old, new, '', ops)
+    return ops
+
+
+def apply_patch(document: Any, patch: List[Dict[str, Any]]) -> Any:
+    """
+    把 JSON Patch 应用到文档上（会修改传入的文档），返回结果文档
+    """
+    for operation in patch:
+        op, path = operation['op'], operation['path']
+        if path == '':
+            if op == 'remove':
+                document = None
+            else:
+                document = operation['value']
+            continue
+        tokens = [_unescape(token) for token in path.split('/')[1:]]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        key = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if key == '-' else int(key)
+            if op == 'add':
+                parent.insert(index, operation['value'])
+            elif op == 'remove':
+                del parent[index]
+            elif op == 'replace':
+                parent[index] = operation['value']
+            else:
+                raise ValueError(f"不支持的补丁操作 {op}")
+        else:
+            if op in ('add', 'replace'):
+                parent[key] = operation['value']
+            elif op == 'remove':
+                del parent[key]
+            else:
+                raise ValueError(f"不支持的补丁操作 {op}")
+    return document
+
+
+class VersionHistory:
+    """
+    每个键（页面路径）最近若干个 schema 版本的环形缓冲区，内容压缩保存
+    """
+
+    def __init__(self, size: int = 4, max_keys: int = 256, level: int = 6):
+        self.size = size
+        self.max_keys = max_keys
+        self.level = level
+        self._versions: 'OrderedDict[Hashable, deque]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def remember(self, key: Hashable, version: str, content: bytes) -> None:
+        """记录一个版本，已记录的版本不会重复保存"""
+        with self._lock:
+            versions = self._versions.get(key)
+            if versions is None:
+                versions = self._versions[key] = deque(maxlen=self.size)
+                if len(self._versions) > self.max_keys:
+                    self._versions.popitem(last=False)
+            else:
+                self._versions.move_to_end(key)
+            if any(item[0] == version for item in versions):
+                return
+        # 压缩在锁外进行
+        blob = zlib.compress(content, self.level)
+        with self._lock:
+            versions = self._versions.get(key)
+            if versions is not None and not any(item[0] == version for item in versions):
+                versions.append((version, blob))
+
+    def get(self, key: Hashable, version: str) -> Optional[bytes]:
+        """获取指定版本的内容，不在缓冲区中时返回 None"""
+        with self._lock:
+            for item_version, blob in self._versions.get(key, ()):
+                if item_version == version:
+                    break
+            else:
+                return None
+        return zlib.decompress(blob)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+
+
+def patch_between(old_content: bytes, new_content: bytes) -> List[Dict[str, Any]]:
+    """
+    计算两个已编码 schema 之间的补丁
+    """
+    return make_patch(json.loads(old_content), json.loads(new_content))
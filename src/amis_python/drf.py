@@ -7,6 +7,8 @@ from rest_framework.views import exception_handler as drf_exc_handler
 from rest_framework import exceptions as drf_exceptions
 from django.conf import settings
 
+from .builder.encoding import encode_envelope
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,9 +20,15 @@ class AmisPagination(PageNumberPagination):
 class AmisResponse(Response):
     """
     统一包装成 { code: 0, msg: 'ok', data: ... }
+
+    data 为 bytes 时视为已编码好的 JSON（如 ``cached_dump_json`` 的结果），
+    直接拼接进响应体，不经过 DRF 渲染器再次编码。
     """
     def __init__(self, data=None, code=0, msg='ok', status=None,
                  template_name=None, headers=None, exception=False, content_type=None, **kwargs):
+        self.encoded_content = None
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            self.encoded_content = encode_envelope(bytes(data), code, msg, **kwargs)
 
         super().__init__(
             data={'status': code, 'msg': msg, 'data': data, **kwargs},
@@ -31,6 +39,13 @@ class AmisResponse(Response):
             content_type=content_type
         )
 
+    @property
+    def rendered_content(self):
+        if self.encoded_content is None:
+            return super().rendered_content
+        self['Content-Type'] = self.content_type or 'application/json'
+        return self.encoded_content
+
 class AmisErrorResponse(Response):
     """
     统一包装成 { code: 1, msg: 'error', error: ... }
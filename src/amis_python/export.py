@@ -0,0 +1,195 @@
+# export.py
+"""
+静态导出模块，把已注册应用的 schema 预渲染为静态文件。
+
+``export_static`` 遍历注册表中的所有 ``AppBuilder``（默认应用和 ``amis_app_map``），
+为每个应用输出::
+
+    <output>/<应用目录>/
+        index.html                      # 首页，直接读取导出的应用配置
+        config.<hash>.json              # 应用配置，静态页面的 schemaApi 指向导出的文件
+        pages/<页面路径>.<hash>.json    # 每个静态页面的 schema
+        manifest.json                   # 页面路径与文件的对应关系
+
+文件名带内容哈希，可以设置长期缓存；每个文件同时输出 ``.gz`` 和 ``.br``
+（已安装 brotli 时）预压缩版本，供 nginx ``gzip_static`` / ``brotli_static`` 使用。
+通过函数动态生成的页面无法导出，仍由 Django 的 ``/amis/page/`` 接口提供。
+
+schema 在主进程中序列化（复用节点缓存），压缩和写文件在进程池中完成。
+"""
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .builder.app import AppBuilder, AppPageBuilder
+from .builder.dump import cached_dump
+from .builder.encoding import encode_envelope, encode_json
+from .payload import ENCODINGS, compress as compress_content, schema_payload
+
+DEFAULT_APP_DIR = 'default'
+INDEX_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'amis', 'index.html')
+# 首页中应用配置地址的占位：标记注释后紧跟的字符串字面量
+_CONFIG_URL_PATTERN = re.compile(r"/\*amis:config-url\*/'[^'\n]*'")
+
+
+@dataclass
+class ExportReport:
+    """
+    导出结果统计
+    """
+    apps: List[str] = field(default_factory=list)
+    pages: int = 0
+    dynamic_pages: List[str] = field(default_factory=list)
+    files: int = 0
+    bytes_written: int = 0
+
+
+def iter_app_pages(app: AppBuilder) -> Iterator[AppPageBuilder]:
+    """
+    遍历应用中注册的所有页面（含嵌套页面）
+    """
+    def walk(items):
+        for item in items or []:
+            if isinstance(item, AppPageBuilder):
+                yield item
+            yield from walk(item.children)
+
+    yield from walk(app.pages)
+
+
+def registered_apps() -> Dict[str, AppBuilder]:
+    """
+    获取注册表中的所有应用，默认应用的目录名为 default
+    """
+    from . import registry
+
+    apps = {}
+    if registry._default_amis_app is not None:
+        apps[DEFAULT_APP_DIR] = registry._default_amis_app
+    apps.update(registry.amis_app_map)
+    return apps
+
+
+def hashed_name(name: str, content: bytes) -> str:
+    """
+    生成带内容哈希的文件名，如 config.json -> config.1a2b3c4d5e6f7a8b.json
+    """
+    base, ext = os.path.splitext(name)
+    return f'{base}.{hashlib.blake2b(content, digest_size=8).hexdigest()}{ext}'
+
+
+def write_file(path: str, content: bytes, compress: bool = True) -> Tuple[int, int]:
+    """
+    写入文件及其预压缩版本，返回 (文件数, 字节数)；在进程池中执行
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    outputs = [(path, content)]
+    if compress:
+        extensions = {'gzip': '.gz', 'br': '.br'}
+        outputs += [(path + extensions[encoding], compress_content(content, encoding, best=True)) for encoding in ENCODINGS]
+    total = 0
+    for output_path, data in outputs:
+        with open(output_path, 'wb') as f:
+            f.write(data)
+        total += len(data)
+    return len(outputs), total
+
+
+def _rewrite_schema_api(schema: Dict[str, Any], urls: Dict[str, str]) -> Dict[str, Any]:
+    """
+    把应用配置中静态页面的 schemaApi 替换为导出文件地址（不修改输入）
+    """
+    def visit(item):
+        if not isinstance(item, dict):
+            return item
+        result = item
+        if item.get('schemaApi') in urls:
+            result = {**result, 'schemaApi': urls[item['schemaApi']]}
+        if isinstance(item.get('children'), list):
+            result = {**result, 'children': [visit(child) for child in item['children']]}
+        return result
+
+    return {**schema, 'pages': [visit(group) for group in schema.get('pages') or []]}
+
+
+def _render_index(config_url: str) -> bytes:
+    with open(INDEX_TEMPLATE, 'r', encoding='utf-8') as f:
+        html = f.read()
+    html, count = _CONFIG_URL_PATTERN.subn(lambda match: json.dumps(config_url), html)
+    if count != 1:
+        raise ValueError(f'{INDEX_TEMPLATE} 中应有且只有一处配置地址标记 /*amis:config-url*/，实际 {count} 处')
+    return html.encode('utf-8')
+
+
+def export_static(
+        output_dir: str,
+        base_url: str = '/',
+        apps: Optional[Dict[str, AppBuilder]] = None,
+        workers: Optional[int] = None,
+        compress: bool = True,
+        passes: Optional[tuple] = None,
+) -> ExportReport:
+    """
+    导出应用配置、静态页面和首页
+
+    Args:
+        output_dir: 输出目录
+        base_url: 输出目录对外访问的 URL 前缀，用于生成 schemaApi 和配置地址
+        apps: 要导出的应用（目录名 -> 应用），默认导出注册表中的所有应用
+        workers: 压缩写文件的进程数，None 使用 CPU 数，0 在当前进程中执行
+        compress: 是否同时输出预压缩文件
+        passes: 页面 schema 后处理，默认与 ``/amis/page/`` 接口一致
+    """
+    if apps is None:
+        apps = registered_apps()
+    if passes is None:
+        from .passes import page_passes
+        passes = page_passes()
+    base_url = base_url.rstrip('/') + '/'
+    report = ExportReport()
+    files: List[Tuple[str, bytes]] = []
+
+    for app_dir, app in apps.items():
+        report.apps.append(app_dir)
+        app_root = os.path.join(output_dir, app_dir)
+        app_url = f'{base_url}{app_dir}/'
+        urls: Dict[str, str] = {}
+        manifest: Dict[str, Any] = {'pages': {}, 'dynamic': []}
+
+        for app_page in iter_app_pages(app):
+            page = app_page._lazy_schema
+            if page is None or app_page.schema_api is None:
+                continue
+            if callable(page):
+                report.dynamic_pages.append(app_page.path)
+                manifest['dynamic'].append(app_page.path)
+                continue
+            body = schema_payload(page, passes).body
+            relative = 'pages/' + hashed_name((app_page.path.strip('/') or 'index') + '.json', body)
+            files.append((os.path.join(app_root, *relative.split('/')), body))
+            urls[app_page.schema_api] = app_url + relative
+            manifest['pages'][app_page.path] = relative
+            report.pages += 1
+
+        config = encode_envelope(encode_json(_rewrite_schema_api(cached_dump(app), urls)))
+        manifest['config'] = hashed_name('config.json', config)
+        files.append((os.path.join(app_root, manifest['config']), config))
+        files.append((os.path.join(app_root, 'index.html'), _render_index(app_url + manifest['config'])))
+        files.append((os.path.join(app_root, 'manifest.json'), json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')))
+
+    if workers == 0:
+        results = [write_file(path, content, compress) for path, content in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                write_file, [path for path, _ in files], [content for _, content in files], [compress] * len(files),
+                chunksize=16,
+            ))
+    for count, size in results:
+        report.files += count
+        report.bytes_written += size
+    return report
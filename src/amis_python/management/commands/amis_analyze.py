@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from amis_python.analysis import analyze_page, get_budget
+from amis_python.export import iter_app_pages
+from amis_python.registry import get_app, get_default_app
+
+
+class Command(BaseCommand):
+    """
+    分析页面 schema 的体积与复杂度，并按 AMIS_SCHEMA_BUDGETS 检查预算
+    """
+    help = "分析页面 schema 的字节数、组件数、嵌套深度、最大子树和内联选项，超出预算时返回非零状态"
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="页面路径，默认分析应用中的全部静态页面")
+        parser.add_argument("--app", help="应用名称，默认使用默认应用")
+        parser.add_argument("--top", type=int, default=10, help="列出最大的子树个数")
+        parser.add_argument("--options-threshold", type=int, default=50, help="内联 options 超过该数量时列出")
+
+    def handle(self, *args, **options):
+        app_name = options["app"]
+        app = get_app(app_name) if app_name else get_default_app()
+        if app is None:
+            raise CommandError(f"应用不存在 {app_name}")
+        paths = options["paths"] or [
+            app_page.path for app_page in iter_app_pages(app)
+            if app_page._lazy_schema is not None and not callable(app_page._lazy_schema)
+        ]
+
+        errors = []
+        for path in paths:
+            budget = get_budget(path)
+            threshold = options["options_threshold"]
+            if budget is not None and budget.max_options is not None:
+                threshold = min(threshold, budget.max_options)
+            try:
+                report = analyze_page(path, app_name=app_name, top=options["top"], options_threshold=threshold)
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(report.format())
+            self.stdout.write("")
+            if budget is not None:
+                errors.extend(budget.check(report))
+        if errors:
+            raise CommandError("超出预算:\n" + "\n".join(errors))
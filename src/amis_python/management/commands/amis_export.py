@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from amis_python.export import export_static
+from amis_python.payload import brotli
+
+
+class Command(BaseCommand):
+    """
+    把已注册应用的配置和静态页面导出为静态文件，供 nginx/CDN 直接提供
+    """
+    help = "导出 amis 应用配置、静态页面 schema 和首页（文件名带内容哈希，同时输出预压缩文件）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output_dir", help="输出目录")
+        parser.add_argument("--base-url", default="/", help="输出目录对外访问的 URL 前缀，默认 /")
+        parser.add_argument("--workers", type=int, default=None, help="压缩写文件的进程数，默认 CPU 数，0 表示不使用进程池")
+        parser.add_argument("--no-compress", action="store_true", help="不输出 .gz/.br 预压缩文件")
+
+    def handle(self, *args, **options):
+        report = export_static(
+            options["output_dir"],
+            base_url=options["base_url"],
+            workers=options["workers"],
+            compress=not options["no_compress"],
+        )
+        if not options["no_compress"] and brotli is None:
+            self.stderr.write("未安装 brotli，只输出了 .gz 预压缩文件")
+        for path in report.dynamic_pages:
+            self.stdout.write(f"跳过动态页面 {path}")
+        self.stdout.write(self.style.SUCCESS(
+            f"已导出 {len(report.apps)} 个应用、{report.pages} 个页面，"
+            f"共 {report.files} 个文件 {report.bytes_written} 字节"
+        ))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from amis_python.builder.profiling import SORT_KEYS, profile_serialization
+from amis_python.export import iter_app_pages, registered_apps
+from amis_python.payload import FrozenPage
+
+
+class Command(BaseCommand):
+    """
+    按组件类型统计已注册应用的序列化耗时和输出大小
+    """
+    help = "按组件类型统计应用配置和静态页面的序列化耗时与字节数，输出排名表格"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--app", help="只分析指定应用（默认应用为 default），默认分析全部应用")
+        parser.add_argument("--page", help="只分析指定路径的页面，如 /users/list")
+        parser.add_argument("--sort", choices=SORT_KEYS, default="self_time", help="排序指标，默认 self_time")
+        parser.add_argument("--limit", type=int, default=None, help="只显示前 N 个类型")
+        parser.add_argument("--repeat", type=int, default=1, help="重复序列化次数，用于平滑耗时")
+
+    def handle(self, *args, **options):
+        apps = registered_apps()
+        if options["app"]:
+            if options["app"] not in apps:
+                raise CommandError(f"应用不存在 {options['app']}")
+            apps = {options["app"]: apps[options["app"]]}
+
+        targets = []
+        for app in apps.values():
+            if not options["page"]:
+                targets.append(app)
+            for app_page in iter_app_pages(app):
+                page = app_page._lazy_schema
+                if page is None or (options["page"] and app_page.path != options["page"]):
+                    continue
+                if callable(page):
+                    self.stdout.write(f"跳过动态页面 {app_page.path}")
+                    continue
+                if isinstance(page, FrozenPage):
+                    self.stdout.write(f"跳过已冻结页面 {app_page.path}")
+                    continue
+                targets.append(page)
+        if not targets:
+            raise CommandError("没有可分析的页面")
+
+        with profile_serialization() as profile:
+            for _ in range(options["repeat"]):
+                for target in targets:
+                    target.model_dump()
+        self.stdout.write(profile.table(sort=options["sort"], limit=options["limit"]))
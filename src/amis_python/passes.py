@@ -0,0 +1,79 @@
+# passes.py
+"""
+页面 schema 编码前的后处理。
+
+``/amis/page/`` 接口、静态导出（``export``）、页面冻结（``registry.freeze_pages``）和
+离线分析（``analysis``）使用同一组后处理，它们都从这里获取，不依赖视图层。
+"""
+import functools
+import logging
+
+from django.conf import settings
+
+from .builder.batch import batch_initial_apis
+from .builder.defaults import prune_defaults
+from .builder.definitions import dedupe_definitions
+from .builder.encoding import encode_json
+from .builder.fragments import split_fragments
+
+logger = logging.getLogger(__name__)
+
+# 页面片段接口地址（见 urls.py 中的 fragment/<path:page_path>）
+FRAGMENT_URL = "/amis/fragment"
+
+
+def dedupe_pass(schema):
+    """
+    页面 schema 后处理：把重复子树提取到 definitions（AMIS_DEDUPE_DEFINITIONS 控制，默认开启）
+    """
+    schema, report = dedupe_definitions(schema, min_size=getattr(settings, "AMIS_DEDUPE_MIN_SIZE", 256))
+    if report.definitions:
+        logger.debug(
+            "amis definitions 去重：%s 个定义，%s 处引用，节省 %s 字节（%s → %s）",
+            report.definitions, report.references, report.bytes_saved, report.bytes_before, report.bytes_after,
+        )
+    return schema
+
+
+@functools.lru_cache(maxsize=None)
+def fragment_pass(page_path: str, page_size: int, min_size: int):
+    """
+    页面 schema 后处理：页面超过 page_size 字节时，把首屏不可见、超过 min_size 字节的
+    子树拆分为按需加载的片段（见 builder.fragments）
+
+    相同参数返回同一个函数对象，以便作为载荷缓存键。
+    """
+    schema_api = f"{FRAGMENT_URL}{page_path}"
+
+    def split_pass(schema):
+        if len(encode_json(schema)) < page_size:
+            return schema
+        schema, pointers = split_fragments(schema, schema_api, min_size=min_size)
+        if pointers:
+            logger.debug("amis 页面 %s 拆分出 %s 个片段", page_path, len(pointers))
+        return schema
+
+    return split_pass
+
+
+def page_passes(page_path: str = None) -> tuple:
+    """
+    页面 schema 编码前的后处理列表
+
+    传入 page_path 且配置了 AMIS_SPLIT_PAGE_SIZE 时，超过该字节数的页面拆分出按需加载的片段
+    （片段阈值 AMIS_SPLIT_MIN_SIZE，默认 4096）。AMIS_BATCH_INITIAL_APIS 开启时，
+    首屏请求标记为由前端合并成一次批量请求。
+    """
+    passes = []
+    if getattr(settings, "AMIS_PRUNE_DEFAULTS", True):
+        # 先裁剪默认值，去重时相同的子树更多
+        passes.append(prune_defaults)
+    page_size = getattr(settings, "AMIS_SPLIT_PAGE_SIZE", None)
+    if page_path is not None and page_size is not None:
+        # 在去重之前拆分，片段中不会出现指向页面 definitions 的引用
+        passes.append(fragment_pass(page_path, page_size, getattr(settings, "AMIS_SPLIT_MIN_SIZE", 4096)))
+    if getattr(settings, "AMIS_BATCH_INITIAL_APIS", False):
+        passes.append(batch_initial_apis)
+    if getattr(settings, "AMIS_DEDUPE_DEFINITIONS", True):
+        passes.append(dedupe_pass)
+    return tuple(passes)
@@ -0,0 +1,179 @@
+# payload.py
+"""
+schema 响应载荷。
+
+``SchemaPayload`` 保存一份已编码的 schema（JSON bytes）以及由它派生的数据：
+内容哈希（用作 ETag）、带 ``{status, msg, data}`` 包装的响应体等，均在首次使用时计算。
+
+静态组件树的载荷缓存在节点上（随节点修改自动失效），因此未变化的页面可以直接
+返回 304 或缓存好的响应体，而不需要重新序列化。响应体的 gzip/brotli 压缩结果
+同样缓存在载荷上，每个 schema 版本只压缩一次。
+
+``FrozenPage`` 是冻结后的静态页面（见 ``registry.freeze_pages``）：只保存编码后的
+schema bytes（可选 zlib 压缩）和 ETag，不再保留组件树。
+"""
+import gzip
+import hashlib
+import zlib
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from pydantic import BaseModel as PydanticBaseModel
+
+from .builder.dump import cached_dump, cached_dump_json, compiled_dump, get_node_cache
+from .builder.encoding import encode_envelope, encode_json
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli 是可选依赖
+    brotli = None
+
+# 按优先级排列的可用压缩编码
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress(content: bytes, encoding: str, best: bool = False) -> bytes:
+    """
+    压缩内容
+
+    Args:
+        content: 原始内容
+        encoding: gzip 或 br
+        best: 使用最高压缩级别（离线导出时使用，运行时使用较快的级别）
+    """
+    if encoding == 'gzip':
+        # mtime=0 使相同内容的压缩结果保持一致
+        return gzip.compress(content, compresslevel=9 if best else 6, mtime=0)
+    if encoding == 'br' and brotli is not None:
+        return brotli.compress(content, quality=11 if best else 5)
+    raise ValueError(f"不支持的压缩编码 {encoding}")
+
+
+def content_etag(content: bytes) -> str:
+    """基于内容哈希的强 ETag"""
+    return '"%s"' % hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class SchemaPayload:
+    """
+    已编码的 schema 及其派生数据
+    """
+    __slots__ = ('content', '_etag', '_body', '_encoded')
+
+    def __init__(self, content: bytes, etag: Optional[str] = None, body: Optional[bytes] = None):
+        self.content = content
+        self._etag: Optional[str] = etag
+        # body 用于自定义包装的响应体（如增量响应），默认由 content 包装生成
+        self._body: Optional[bytes] = body
+        self._encoded: Dict[str, bytes] = {}
+
+    @property
+    def etag(self) -> str:
+        """基于内容哈希的强 ETag"""
+        if self._etag is None:
+            self._etag = content_etag(self.content)
+        return self._etag
+
+    @property
+    def body(self) -> bytes:
+        """包装为 amis 统一响应体后的 bytes"""
+        if self._body is None:
+            self._body = encode_envelope(self.content)
+        return self._body
+
+    def encoded_body(self, encoding: str) -> bytes:
+        """压缩后的响应体，首次使用时压缩并缓存"""
+        data = self._encoded.get(encoding)
+        if data is None:
+            data = self._encoded[encoding] = compress(self.body, encoding)
+        return data
+
+    def encoded_etag(self, encoding: str) -> str:
+        """压缩后响应体的 ETag，不同编码的表示使用不同的 ETag"""
+        return '%s-%s"' % (self.etag[:-1], encoding)
+
+
+class FrozenPage:
+    """
+    冻结的静态页面：编码后的 schema（已做过页面后处理）及其 ETag
+
+    不压缩时保留一个常驻的 ``SchemaPayload``（响应体和压缩结果照常缓存）；
+    压缩时只保留 zlib 压缩后的 bytes，需要原始内容时再解压，以 CPU 换内存。
+    两种方式下 gzip/br 压缩后的响应体都只生成一次，缓存在冻结页面上。
+    """
+    __slots__ = ('blob', 'compressed', 'etag', '_payload', '_encoded')
+
+    def __init__(self, content: bytes, compress: bool = True, level: int = 6):
+        self.compressed = compress
+        self.blob = zlib.compress(content, level) if compress else content
+        self.etag = content_etag(content)
+        self._payload = None if compress else SchemaPayload(content, self.etag)
+        self._encoded: Dict[str, bytes] = {}
+
+    @property
+    def content(self) -> bytes:
+        """编码后的 schema"""
+        return zlib.decompress(self.blob) if self.compressed else self.blob
+
+    def payload(self) -> SchemaPayload:
+        if self._payload is not None:
+            return self._payload
+        return _FrozenPayload(self)
+
+
+class _FrozenPayload(SchemaPayload):
+    """
+    压缩的冻结页面的载荷：内容按需解压，压缩后的响应体缓存在冻结页面上
+    """
+    __slots__ = ('_page',)
+
+    def __init__(self, page: FrozenPage):
+        self._page = page
+        self._etag = page.etag
+        self._body = None
+        self._encoded = page._encoded
+
+    @property
+    def content(self) -> bytes:
+        return self._page.content
+
+
+def schema_payload(obj: Any, passes: Sequence[Callable[[Any], Any]] = (), cache: bool = True) -> SchemaPayload:
+    """
+    获取组件树（或普通 schema 数据）的载荷，组件树的载荷缓存在节点上
+
+    Args:
+        obj: 组件对象或已序列化的 schema
+        passes: 编码前依次作用于序列化结果的后处理（如 definitions 去重），
+                需要是模块级函数，以便作为缓存键
+        cache: 是否在节点上缓存；每次请求新生成的组件树应传 False
+
+    冻结的页面（FrozenPage）已在冻结时做过后处理，直接返回其载荷。
+    """
+    if isinstance(obj, FrozenPage):
+        return obj.payload()
+    passes = tuple(passes)
+    if not cache or not getattr(obj.__class__, '__amis_cacheable__', False):
+        return SchemaPayload(encode_json(_apply_passes(obj, passes)))
+    cache = get_node_cache(obj)
+    key = ('payload',) + passes
+    payload = cache.data.get(key)
+    if payload is None:
+        version = cache.version
+        if passes:
+            payload = SchemaPayload(encode_json(_apply_passes(cached_dump(obj), passes)))
+        else:
+            payload = SchemaPayload(cached_dump_json(obj))
+        if cache.version == version:
+            cache.data[key] = payload
+    return payload
+
+
+def _apply_passes(schema: Any, passes) -> Any:
+    if passes and isinstance(schema, PydanticBaseModel):
+        # 组件对象需要先序列化才能做后处理
+        schema = compiled_dump(schema)
+    elif passes and getattr(schema.__class__, '__amis_lite__', False):
+        schema = schema.model_dump()
+    for transform in passes:
+        schema = transform(schema)
+    return schema
@@ -1,5 +1,5 @@
 import threading
-from typing import Optional, Union, Callable, Dict
+from typing import Optional, Union, Callable, Dict, Iterable, List
 
 from django.contrib.auth import logout
 
@@ -39,14 +39,14 @@ def register_group(group: AppPageGroupBuilder) -> None:
     get_default_app().register_group(group)
 
 
-def register_page(label: str, path: str, page=None,app_name: str=None,visible=True) -> AppPageBuilder:
+def register_page(label: str, path: str, page=None,app_name: str=None,visible=True,validate=False) -> AppPageBuilder:
     """
     注册默认 amis 应用实例的页面
     """
     if app_name:
         app = get_app(app_name)
-        return app.register_page(label, path, page=page, visible=visible)
-    return get_default_app().register_page(label, path, page=page, visible=visible)
+        return app.register_page(label, path, page=page, visible=visible, validate=validate)
+    return get_default_app().register_page(label, path, page=page, visible=visible, validate=validate)
 
 
 def get_default_app() -> AppBuilder:
@@ -79,4 +79,39 @@ def get_page(request,path: str) -> Union[Page,Callable]:
             logout(request)
             raise RuntimeError("app_config not found")
         return app.get_page(path)
-    return get_default_app().get_page(path)
\ No newline at end of file
+    return get_default_app().get_page(path)
+
+def freeze_pages(app_name: str = None, compress: bool = True, paths: Iterable[str] = None) -> List[AppPageBuilder]:
+    """
+    冻结应用中已注册的静态页面（可选，通常在注册完所有页面后调用）
+
+    页面按当前配置做完后处理（默认值裁剪、definitions 去重）并编码为 JSON 后，
+    以 FrozenPage 替换组件树，组件树随之释放；之后对页面组件的修改不再生效。
+
+    Args:
+        app_name: 应用名称，默认应用为 None
+        compress: 是否用 zlib 压缩保存
+        paths: 只冻结这些路径的页面，默认冻结全部静态页面
+    Returns:
+        本次冻结的页面
+    """
+    from .export import iter_app_pages
+    from .payload import FrozenPage, schema_payload
+    from .passes import page_passes
+
+    app = get_app(app_name) if app_name else get_default_app()
+    if app is None:
+        raise ValueError(f"应用不存在 {app_name}")
+    paths = set(paths) if paths is not None else None
+    passes = page_passes()
+    frozen = []
+    for app_page in iter_app_pages(app):
+        page = app_page._lazy_schema
+        if paths is not None and app_page.path not in paths:
+            continue
+        if page is None or callable(page) or isinstance(page, FrozenPage):
+            continue
+        content = schema_payload(page, passes, cache=False).content
+        app_page.set_page_schema(FrozenPage(content, compress=compress))
+        frozen.append(app_page)
+    return frozen
@@ -0,0 +1,261 @@
+# response_cache.py
+"""
+接口响应的服务端缓存。
+
+amis ``Api.cache``（毫秒）只在浏览器的当前标签页内缓存，``amis_cache`` 用同一个声明
+把 ninja / DRF 接口的结果保存到 Django 缓存框架中，同一份数据在 TTL 内只计算一次::
+
+    @router.get('/dashboard')
+    @amis_cache(60000, per_user=False, tags=['orders'])
+    def dashboard(request):
+        ...
+
+    @router.post('/orders')
+    @amis_invalidate('orders')
+    def create_order(request, payload: OrderIn):
+        ...
+
+- 只缓存 GET/HEAD 请求的成功（2xx）结果，包括 ninja 返回的 ``(状态码, 响应体)`` 元组；
+  响应头随缓存一起还原（逐跳头和 Cookie 除外）；
+- 缓存键包含请求路径、规范化后的查询参数（按参数名排序）、用户（``per_user``）以及
+  ``vary(request)`` 的返回值（租户等）；
+- 失效用标签实现：每个标签有一个代数，缓存键包含代数，``amis_invalidate`` /
+  ``invalidate_cache`` 更新代数后旧的缓存自然失效。每个缓存接口自带以其函数命名的标签，
+  可以直接把接口函数作为失效目标；
+- 同一进程内并发的未命中请求只计算一次；
+- 无法 pickle 的结果（包含数据库连接、生成器等的对象）不缓存，照常返回。
+
+``to_api`` 生成的 ``Api`` 会带上接口声明的 ``cache``，浏览器端缓存与服务端一致。
+缓存使用的后端由 ``AMIS_CACHE_ALIAS`` 设置（默认 ``default``）。
+"""
+import hashlib
+import logging
+import math
+import pickle
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+from urllib.parse import urlencode
+from wsgiref.util import is_hop_by_hop
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from .builder.api import Api
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = 'amis:response:'
+_TAG_PREFIX = 'amis:tag:'
+_CACHED_METHODS = ('GET', 'HEAD')
+_MISS = object()
+# 不随缓存保存的响应头
+_UNCACHED_HEADERS = frozenset({'set-cookie', 'content-length'})
+
+# 缓存键 -> [计算该键的锁, 持有或等待该锁的请求数]
+_inflight: Dict[str, list] = {}
+_inflight_lock = threading.Lock()
+
+
+def get_response_cache():
+    return caches[getattr(settings, 'AMIS_CACHE_ALIAS', 'default')]
+
+
+def _find_request(args):
+    """
+    函数视图的第一个参数是请求；DRF ViewSet / APIView 的方法第一个参数是 self
+    """
+    if args and hasattr(args[0], 'META'):
+        return args[0]
+    if len(args) > 1 and hasattr(args[1], 'META'):
+        return args[1]
+    return None
+
+
+def cache_tag(target: Union[str, Callable]) -> str:
+    """
+    失效目标对应的标签：字符串本身，或缓存接口函数自带的标签
+    """
+    if isinstance(target, str):
+        return target
+    tag = getattr(target, 'amis_cache_tag', None)
+    if tag is None:
+        raise TypeError(f'{target!r} 不是 amis_cache 缓存的接口')
+    return tag
+
+
+def _tag_versions(cache, tags) -> list:
+    keys = [_TAG_PREFIX + tag for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # 代数丢失（被淘汰）时重新生成，不会与之前的代数重复
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_cache(*targets: Union[str, Callable]) -> None:
+    """
+    使标签（或缓存接口）下的所有缓存失效
+    """
+    cache = get_response_cache()
+    cache.set_many({_TAG_PREFIX + cache_tag(target): time.time_ns() for target in targets}, None)
+
+
+def response_cache_key(request, tags: Iterable[str], per_user: bool = True, vary: Optional[Callable] = None, cache=None) -> str:
+    """
+    生成请求的缓存键
+    """
+    cache = cache or get_response_cache()
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    parts = [request.path, query]
+    if per_user:
+        user = getattr(request, 'user', None)
+        parts.append(str(user.pk) if user is not None and user.is_authenticated else '')
+    if vary is not None:
+        parts.append(str(vary(request)))
+    parts.extend(str(version) for version in _tag_versions(cache, tags))
+    return _KEY_PREFIX + hashlib.sha1('\n'.join(parts).encode()).hexdigest()
+
+
+def _status_of(result) -> int:
+    """
+    接口结果的状态码：响应对象的 status_code，或 ninja ``(状态码, 响应体)`` 元组的状态码
+    """
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], int) and not isinstance(result[0], bool):
+        return result[0]
+    return getattr(result, 'status_code', 200)
+
+
+def _succeeded(result) -> bool:
+    return 200 <= _status_of(result) < 300
+
+
+def _frozen_headers(response) -> tuple:
+    """
+    需要随缓存还原的响应头，不含逐跳头和 Cookie（Cookie 属于单个用户的单次响应）
+    """
+    return tuple(
+        (name, value) for name, value in response.items()
+        if not is_hop_by_hop(name) and name.lower() not in _UNCACHED_HEADERS
+    )
+
+
+def _freeze(result):
+    """
+    接口结果转换为可缓存的值，不能缓存（失败、流式响应）时返回 _MISS
+    """
+    if not _succeeded(result) or getattr(result, 'streaming', False):
+        return _MISS
+    data = getattr(result, 'data', _MISS)
+    if isinstance(result, HttpResponse) and data is not _MISS and not getattr(result, 'is_rendered', True):
+        # 未渲染的 DRF Response，由 finalize_response 继续包装
+        return ('drf', data, result.status_code, _frozen_headers(result))
+    if isinstance(result, HttpResponse):
+        return ('http', result.content, result.status_code, _frozen_headers(result))
+    return ('value', result)
+
+
+def _thaw(frozen):
+    kind = frozen[0]
+    if kind == 'drf':
+        from rest_framework.response import Response
+
+        return Response(frozen[1], status=frozen[2], headers=dict(frozen[3]))
+    if kind == 'http':
+        response = HttpResponse(frozen[1], status=frozen[2])
+        for name, value in frozen[3]:
+            response[name] = value
+        return response
+    return frozen[1]
+
+
+def _store(backend, key: str, frozen, timeout: int) -> None:
+    """
+    写入缓存；结果无法序列化（如包含数据库连接、生成器的对象）时跳过缓存，不影响本次请求
+    """
+    try:
+        backend.set(key, frozen, timeout)
+    except (pickle.PicklingError, TypeError, AttributeError) as exc:
+        logger.warning('amis 接口结果无法缓存，已跳过：%s', exc)
+
+
+def amis_cache(cache: Union[int, Api], per_user: bool = True, vary: Optional[Callable[[Any], Any]] = None, tags: Iterable[str] = ()):
+    """
+    接口响应缓存装饰器，适用于 ninja 接口函数、DRF 函数视图和 ViewSet / APIView 方法
+
+    Args:
+        cache: 缓存时间（毫秒），或声明了 cache 的 Api 对象
+        per_user: 缓存键是否包含当前用户；所有人看到相同数据的接口设为 False 以共享缓存
+        vary: 返回额外的缓存维度（如租户）的函数，参数为请求
+        tags: 失效标签，``invalidate_cache`` / ``amis_invalidate`` 使用
+    """
+    ttl = cache.cache if isinstance(cache, Api) else cache
+    if not ttl or ttl <= 0:
+        raise ValueError('amis_cache 需要大于 0 的缓存时间（毫秒）')
+    timeout = math.ceil(ttl / 1000)
+
+    def decorator(view_func: Callable) -> Callable:
+        own_tag = f'{view_func.__module__}.{view_func.__qualname__}'
+        all_tags = (own_tag, *tags)
+
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            request = _find_request(args)
+            if request is None or request.method not in _CACHED_METHODS:
+                return view_func(*args, **kwargs)
+            backend = get_response_cache()
+            key = response_cache_key(request, all_tags, per_user=per_user, vary=vary, cache=backend)
+            frozen = backend.get(key, _MISS)
+            if frozen is not _MISS:
+                return _thaw(frozen)
+            with _inflight_lock:
+                entry = _inflight.get(key)
+                if entry is None:
+                    entry = _inflight[key] = [threading.Lock(), 0]
+                entry[1] += 1
+            try:
+                with entry[0]:
+                    # 等待期间其他请求可能已经算好
+                    frozen = backend.get(key, _MISS)
+                    if frozen is not _MISS:
+                        return _thaw(frozen)
+                    result = view_func(*args, **kwargs)
+                    frozen = _freeze(result)
+                    if frozen is not _MISS:
+                        _store(backend, key, frozen, timeout)
+                    return result
+            finally:
+                with _inflight_lock:
+                    # 最后一个等待者离开时才移除，之后到达的请求不会拿到另一把锁
+                    entry[1] -= 1
+                    if entry[1] == 0:
+                        del _inflight[key]
+
+        wrapper.amis_cache = ttl
+        wrapper.amis_cache_tag = own_tag
+        return wrapper
+
+    return decorator
+
+
+def amis_invalidate(*targets: Union[str, Callable]):
+    """
+    声明接口调用成功后失效的缓存（标签或缓存接口函数）
+    """
+    tags = [cache_tag(target) for target in targets]
+
+    def decorator(view_func: Callable) -> Callable:
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            result = view_func(*args, **kwargs)
+            if _succeeded(result):
+                invalidate_cache(*tags)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,111 @@
+# routes.py
+"""
+Django-Ninja 接口的路由表。
+
+``to_api`` 生成的 ``LazyAmisApiObject`` 需要把 ninja 接口函数解析成 amis ``Api`` 的
+url/method。路由表在第一次使用时遍历一次 URLconf，把其中所有 ninja 操作映射到完整的
+url（包含 ``NinjaAPI`` 和 ``Router`` 的前缀，路径参数转换为 ``${param}``）和请求方式，
+之后每次解析都只是一次字典查找。
+
+路由表不依赖固定的 API 命名空间，任意版本（``api-1.0.0``、``api-2.0.0`` ……）挂载的
+接口都会收录。路由表与 URL 解析器绑定：``clear_url_caches()``（修改 ``ROOT_URLCONF``、
+测试中的 ``override_settings`` 等）之后会自动重建，也可以用 ``clear_route_tables()``
+手动清空。
+"""
+import re
+import threading
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from django.urls import NoReverseMatch, URLPattern, URLResolver, get_resolver, get_urlconf
+
+# amis 请求方式的优先级（一个操作支持多种请求方式时取第一个）
+_METHODS = ('GET', 'POST', 'PUT', 'DELETE', 'PATCH')
+_ROUTE_PARAM = re.compile(r'<(?:[^>:]+:)?([^>]+)>')
+_REGEX_PARAM = re.compile(r'\(\?P<([^>]+)>[^)]*\)')
+
+
+class ApiRoute(NamedTuple):
+    url: str
+    method: str
+
+
+def amis_method(methods) -> str:
+    for method in _METHODS:
+        if method in methods:
+            return method.lower()
+    return ''
+
+
+def _pattern_to_template(pattern) -> str:
+    """
+    URL 模式转换为 amis 模板路径：<int:id> / (?P<id>...) -> ${id}
+    """
+    route = getattr(pattern, '_route', None)
+    if route is not None:
+        return _ROUTE_PARAM.sub(r'${\1}', route)
+    regex = str(pattern).lstrip('^')
+    for suffix in (r'\Z', '$'):
+        if regex.endswith(suffix):
+            regex = regex[:-len(suffix)]
+    return _REGEX_PARAM.sub(r'${\1}', regex)
+
+
+def _iter_operations(patterns, prefix: str) -> Iterator[Tuple[Any, str]]:
+    for pattern in patterns:
+        template = prefix + _pattern_to_template(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from _iter_operations(pattern.url_patterns, template)
+        elif isinstance(pattern, URLPattern):
+            # ninja 的 URL 视图是 PathView 的绑定方法，同一路径的各个请求方式共用一个 PathView
+            path_view = getattr(pattern.callback, '__self__', None)
+            for operation in getattr(path_view, 'operations', None) or ():
+                yield operation, template
+
+
+def build_route_table(resolver: URLResolver) -> Dict[Any, ApiRoute]:
+    """
+    遍历 URL 解析器，生成 ninja 操作 -> ApiRoute 的映射（同一操作挂载多次时取第一次）
+    """
+    table: Dict[Any, ApiRoute] = {}
+    for operation, template in _iter_operations(resolver.url_patterns, '/'):
+        if operation not in table:
+            table[operation] = ApiRoute(template, amis_method(operation.methods))
+    return table
+
+
+# urlconf -> (解析器, 路由表)
+_route_tables: Dict[Any, Tuple[URLResolver, Dict[Any, ApiRoute]]] = {}
+_route_lock = threading.Lock()
+
+
+def get_route_table(urlconf: Optional[str] = None) -> Dict[Any, ApiRoute]:
+    """
+    获取（必要时构建）当前 URLconf 的路由表
+    """
+    if urlconf is None:
+        urlconf = get_urlconf()
+    resolver = get_resolver(urlconf)
+    cached = _route_tables.get(urlconf)
+    if cached is not None and cached[0] is resolver:
+        return cached[1]
+    with _route_lock:
+        cached = _route_tables.get(urlconf)
+        if cached is None or cached[0] is not resolver:
+            cached = _route_tables[urlconf] = (resolver, build_route_table(resolver))
+        return cached[1]
+
+
+def clear_route_tables() -> None:
+    with _route_lock:
+        _route_tables.clear()
+
+
+def get_api_route(api_view, urlconf: Optional[str] = None) -> ApiRoute:
+    """
+    解析 ninja 接口函数（或其操作对象）对应的 ApiRoute，未挂载到 URLconf 时抛出 NoReverseMatch
+    """
+    operation = getattr(api_view, '_ninja_operation', api_view)
+    route = get_route_table(urlconf).get(operation)
+    if route is None:
+        raise NoReverseMatch(f"{getattr(api_view, '__name__', api_view)!r} 未挂载到 URLconf 中")
+    return route
@@ -1,6 +1,11 @@
+import json
+import warnings
 from unittest import TestCase
 
-from amis_python.builder import Button, EventAction
+from pydantic import ValidationError
+
+from amis_python.builder import Button, EventAction, EventConfig, lite, trusted_build
+from amis_python.builder.dump import cached_dump, cached_dump_json, compiled_dump
 
 
 class AddActionTestCase(TestCase):
@@ -178,4 +183,84 @@ class AddActionTestCase(TestCase):
         self.assertEqual(action["actionType"], "toast")
         self.assertEqual(action["args"]["msgType"], "success")
         self.assertEqual(action["args"]["msg"], "操作成功！")
-        self.assertEqual(action["args"]["position"], "top-right")
\ No newline at end of file
+        self.assertEqual(action["args"]["position"], "top-right")
+
+    def test_typed_event_config(self):
+        """测试 onEvent 的值为 EventConfig，dict 动作保持原样"""
+        button = Button(label="保存", on_event={
+            "click": {"actions": [{"actionType": "refresh"}], "weight": 1, "custom": "x"},
+        })
+        config = button.on_event["click"]
+        self.assertIsInstance(config, EventConfig)
+        self.assertEqual(config.actions, [{"actionType": "refresh"}])
+        self.assertEqual(config["actions"], [{"actionType": "refresh"}])
+        self.assertEqual(config["custom"], "x")
+        button.add_action("click", EventAction(action_type="toast", args={"msg": "ok"}))
+        self.assertIsInstance(config.actions[1], EventAction)
+        expected = {
+            "click": {
+                "actions": [{"actionType": "refresh"}, {"actionType": "toast", "args": {"msg": "ok"}}],
+                "weight": 1,
+                "custom": "x",
+            },
+        }
+        self.assertEqual(button.model_dump()["onEvent"], expected)
+        self.assertEqual(compiled_dump(button)["onEvent"], expected)
+
+    def test_event_config_dict_access(self):
+        """测试 EventConfig 兼容原来按 dict 使用 onEvent 的代码"""
+        button = Button(label="保存", on_event={"click": {"actions": [], "custom": "x"}})
+        config = button.on_event["click"]
+        self.assertIn("actions", config)
+        self.assertIn("custom", config)
+        self.assertNotIn("weight", config)
+        self.assertNotIn("missing", config)
+        self.assertEqual(config.get("actions"), [])
+        self.assertEqual(config.get("custom"), "x")
+        self.assertIsNone(config.get("weight"))
+        self.assertEqual(config.get("missing", 0), 0)
+
+        config["weight"] = 2
+        config["debounce"] = {"wait": 250}
+        config["preventDefault"] = True
+        config.get("actions").append({"actionType": "reload"})
+        self.assertEqual(config.weight, 2)
+        self.assertIn("debounce", config)
+        self.assertEqual(button.model_dump()["onEvent"]["click"], {
+            "actions": [{"actionType": "reload"}], "weight": 2, "debounce": {"wait": 250},
+            "custom": "x", "preventDefault": True,
+        })
+
+    def test_trusted_build_dict_event(self):
+        """测试受信任模式下 onEvent 仍为 dict 时 add_action 可用"""
+        with trusted_build():
+            button = Button(label="保存", on_event={"click": {"actions": []}})
+        button.add_action("click", EventAction(action_type="reload"))
+        self.assertEqual(compiled_dump(button)["onEvent"], {"click": {"actions": [{"actionType": "reload"}]}})
+        # pydantic 序列化普通 dict 时不产生 PydanticSerializationUnexpectedValue 警告
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(button.model_dump()["onEvent"], {"click": {"actions": [{"actionType": "reload"}]}})
+            self.assertEqual(json.loads(button.model_dump_json())["onEvent"]["click"]["actions"][0]["actionType"], "reload")
+
+    def test_event_config_any_actions(self):
+        """测试 actions 接受轻量组件和任意值，并保持键的书写顺序"""
+        action = lite.EventAction(action_type="toast", args={"msg": "ok"})
+        button = Button(label="保存", on_event={"click": {"weight": 1, "actions": [action, "custom"]}})
+        config = button.on_event["click"]
+        self.assertIs(config.actions[0], action)
+        self.assertEqual(list(compiled_dump(button)["onEvent"]["click"]), ["weight", "actions"])
+        self.assertEqual(json.loads(cached_dump_json(button))["onEvent"], {
+            "click": {"weight": 1, "actions": [{"actionType": "toast", "args": {"msg": "ok"}}, "custom"]},
+        })
+        with self.assertRaises(ValidationError):
+            Button(label="保存", on_event={"click": {"actions": "x"}})
+
+    def test_action_change_invalidates_cache(self):
+        """测试修改 onEvent 中的动作会使按钮的序列化缓存失效"""
+        button = Button(label="保存")
+        action = EventAction(action_type="toast", args={"msg": "a"})
+        button.add_action("click", action)
+        self.assertEqual(cached_dump(button)["onEvent"]["click"]["actions"][0]["args"], {"msg": "a"})
+        action.args = {"msg": "b"}
+        self.assertEqual(cached_dump(button)["onEvent"]["click"]["actions"][0]["args"], {"msg": "b"})
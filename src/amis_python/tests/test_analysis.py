@@ -0,0 +1,77 @@
+import json
+from io import StringIO
+from unittest import TestCase
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+
+from amis_python.analysis import (
+    SchemaBudget, SchemaBudgetExceeded, analyze_page, analyze_schema, assert_page_budgets, assert_within_budget,
+)
+from amis_python.builder import Button, Dialog, Page
+from amis_python.builder.form import Form, Select
+from amis_python.registry import get_default_app, register_page
+
+
+def _build_page():
+    return Page(title="页面", body=[
+        Form(body=[Select(name="city", options=[{"label": str(i), "value": i} for i in range(100)])]),
+        Button(label="打开", action_type="dialog", dialog=Dialog(title="弹框", body="内容")),
+    ])
+
+
+class SchemaAnalysisTestCase(TestCase):
+    """schema 分析测试"""
+
+    def test_report(self):
+        page = _build_page()
+        report = analyze_schema(page)
+        self.assertEqual(report.bytes, len(page.model_dump_json().encode()))
+        self.assertEqual(report.nodes, 5)
+        self.assertEqual(report.max_depth, 3)
+        self.assertEqual(report.largest[0], ("/body/0", "form", len(json.dumps(page.model_dump()["body"][0], ensure_ascii=False, separators=(",", ":")).encode())))
+        self.assertEqual(report.large_options, [("/body/0/body/0/options", 100)])
+        self.assertIn("/body/0/body/0/options", report.format())
+
+    def test_top(self):
+        report = analyze_schema(_build_page(), top=1, options_threshold=100)
+        self.assertEqual(len(report.largest), 1)
+        self.assertEqual(report.large_options, [])
+
+    def test_budget(self):
+        page = _build_page()
+        assert_within_budget(page, max_bytes=100_000, max_nodes=10)
+        with self.assertRaises(SchemaBudgetExceeded) as context:
+            assert_within_budget(page, SchemaBudget(max_nodes=3, max_options=20), path="/p")
+        self.assertEqual(len(context.exception.errors), 2)
+        self.assertIn("/p: 组件数 5", str(context.exception))
+
+
+class PageBudgetTestCase(TestCase):
+    """已注册页面预算测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        if "/analysis_page" not in [page.path for page in get_default_app().get_group().children]:
+            register_page("分析页面", "/analysis_page", page=_build_page())
+
+    def test_analyze_page(self):
+        report = analyze_page("/analysis_page")
+        self.assertEqual(report.path, "/analysis_page")
+        self.assertEqual(report.nodes, 5)
+
+    def test_page_budgets(self):
+        budgets = {"/analysis_page": {"max_bytes": 100}}
+        with self.assertRaises(SchemaBudgetExceeded):
+            assert_page_budgets(budgets)
+        reports = assert_page_budgets({"/analysis_page": {"max_bytes": 100_000}})
+        self.assertEqual([report.path for report in reports], ["/analysis_page"])
+
+    def test_command(self):
+        out = StringIO()
+        call_command("amis_analyze", "/analysis_page", stdout=out)
+        self.assertIn("组件数: 5", out.getvalue())
+        with override_settings(AMIS_SCHEMA_BUDGETS={"*": {"max_nodes": 1}}):
+            self.assertRaises(CommandError, call_command, "amis_analyze", "/analysis_page", stdout=StringIO())
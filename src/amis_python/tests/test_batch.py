@@ -0,0 +1,131 @@
+import json
+from unittest import TestCase as SimpleTestCase
+
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from amis_python.batch import BatchError, build_subrequest, dispatch_batch
+from amis_python.builder.batch import BATCH_HEADER, batch_initial_apis
+
+
+class BatchInitialApisTestCase(SimpleTestCase):
+    """首屏请求标记测试"""
+
+    def test_mark_initial_apis(self):
+        schema = {"type": "page", "initApi": "/api/init", "body": [
+            {"type": "service", "api": "get:/api/stats", "body": {"type": "tpl", "tpl": "${total}"}},
+            {"type": "form", "api": "/api/save", "initApi": {"url": "/api/form", "headers": {"X-A": "1"}}, "body": [
+                {"type": "select", "name": "s", "source": "/api/options"},
+                {"type": "select", "name": "t", "source": "${items}"},
+            ]},
+            {"type": "crud", "api": {"method": "post", "url": "/api/query"}},
+            {"type": "service", "initFetch": False, "api": "/api/lazy"},
+            {"type": "service", "schemaApi": "/amis/fragment/p?pointer=/body/0"},
+            {"type": "service", "api": "https://example.com/api"},
+        ]}
+        result = batch_initial_apis(schema)
+        marked = {"headers": {BATCH_HEADER: "1"}}
+        self.assertEqual(result["initApi"], {"method": "get", "url": "/api/init", **marked})
+        self.assertEqual(result["body"][0]["api"], {"method": "get", "url": "/api/stats", **marked})
+        form = result["body"][1]
+        self.assertEqual(form["api"], "/api/save")
+        self.assertEqual(form["initApi"], {"url": "/api/form", "headers": {"X-A": "1", BATCH_HEADER: "1"}})
+        self.assertEqual(form["body"][0]["source"], {"method": "get", "url": "/api/options", **marked})
+        self.assertIs(form["body"][1], schema["body"][1]["body"][1])
+        for index in (2, 3, 4, 5):
+            self.assertIs(result["body"][index], schema["body"][index])
+        self.assertEqual(schema["initApi"], "/api/init")
+        self.assertIs(batch_initial_apis(result), result)
+
+
+class BuildSubrequestTestCase(SimpleTestCase):
+    """子请求构造测试"""
+
+    def test_subrequest(self):
+        request = RequestFactory().post("/amis/batch", HTTP_AUTHORIZATION="Token x", HTTP_ACCEPT_ENCODING="gzip")
+        subrequest = build_subrequest(request, {
+            "url": "/api/items?page=2", "data": {"q": "中", "tags": ["a", "b"], "on": True, "none": None},
+            "headers": {"Accept-Language": "zh-CN"},
+        })
+        self.assertEqual(subrequest.method, "GET")
+        self.assertEqual(subrequest.path, "/api/items")
+        self.assertEqual(subrequest.GET.getlist("tags"), ["a", "b"])
+        self.assertEqual(subrequest.GET.dict(), {"page": "2", "q": "中", "tags": "b", "on": "true"})
+        self.assertEqual(subrequest.headers["Authorization"], "Token x")
+        self.assertEqual(subrequest.headers["Accept-Language"], "zh-CN")
+        self.assertNotIn("Accept-Encoding", subrequest.headers)
+
+        # 不能改写外层请求的 Host、Cookie、认证和代理请求头
+        for name in ("Host", "Cookie", "Authorization", "X-Forwarded-For", "X-Forwarded-Host", "X-Tenant"):
+            with self.assertRaises(BatchError) as context:
+                build_subrequest(request, {"url": "/api/items", "headers": {name: "x"}})
+            self.assertEqual(context.exception.status, 400)
+
+        # 外层批量请求不做 CSRF 校验，不允许修改数据的子请求
+        for method in ("post", "put", "delete"):
+            with self.assertRaises(BatchError) as context:
+                build_subrequest(request, {"url": "/api/items", "method": method, "data": {"a": 1}})
+            self.assertEqual(context.exception.status, 405)
+
+
+class BatchViewTestCase(TestCase):
+    """批量接口测试"""
+
+    def setUp(self):
+        self.client = APIClient()
+        User.objects.create_user(username="batch_user", password="password")
+        self.client.login(username="batch_user", password="password")
+
+    def _batch(self, requests):
+        response = self.client.post("/amis/batch", {"requests": requests}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)["data"]
+
+    def test_dispatch(self):
+        results = self._batch([
+            {"url": "/amis/api/current_user"},
+            {"url": "/amis/login/config/", "method": "get"},
+            {"url": "/amis/not_found.js"},
+            {"url": "/amis/batch"},
+            {"url": "https://example.com/api"},
+            {"method": "get"},
+        ])
+        self.assertEqual([result["status"] for result in results], [200, 200, 404, 400, 400, 400])
+        self.assertEqual(results[0]["data"]["data"]["data"], {"username": "batch_user"})
+        self.assertEqual(results[0]["headers"], {"content-type": "application/json"})
+        self.assertEqual(results[1]["data"]["data"]["type"], "page")
+
+    def test_unsafe_method(self):
+        results = self._batch([{"url": "/amis/api/logout", "method": "post"}, {"url": "/amis/api/current_user"}])
+        self.assertEqual([result["status"] for result in results], [405, 200])
+
+    def test_identity_loaded_before_dispatch(self):
+        """测试提交到线程池之前加载惰性的用户和会话"""
+        request = RequestFactory().get("/amis/batch")
+        request.user = SimpleLazyObject(lambda: User.objects.get(username="batch_user"))
+        request.session = SessionStore()
+        with override_settings(AMIS_BATCH_WORKERS=2):
+            dispatch_batch(request, [{"url": "https://example.com/a"}, {"url": "https://example.com/b"}])
+        self.assertTrue(request.user._wrapped is not empty)
+        self.assertTrue(hasattr(request.session, "_session_cache"))
+
+    def test_subrequest_permissions(self):
+        self.client.logout()
+        results = self._batch([{"url": "/amis/api/current_user"}, {"url": "/amis/login/config/"}])
+        self.assertEqual([result["status"] for result in results], [403, 200])
+
+    def test_invalid_batch(self):
+        response = self.client.post("/amis/batch", {"requests": "x"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with override_settings(AMIS_BATCH_MAX_REQUESTS=1):
+            response = self.client.post("/amis/batch", [{"url": "/a"}, {"url": "/b"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_config_header(self):
+        self.assertNotIn(BATCH_HEADER, self.client.get("/amis/config/"))
+        with override_settings(AMIS_BATCH_INITIAL_APIS=True):
+            self.assertEqual(self.client.get("/amis/config/")[BATCH_HEADER], "1")
@@ -0,0 +1,118 @@
+import importlib
+import pkgutil
+from unittest import TestCase
+
+from pydantic import BaseModel as PydanticBaseModel
+
+import amis_python.builder
+from amis_python.builder import BaseModel, Button, EventAction, Page, Dialog, Tabs, TabsItem
+from amis_python.builder.api import LazyAmisApiObject
+from amis_python.builder.crud import CRUD, CRUD2, CRUD2Mode
+from amis_python.builder.dump import compiled_dump, dump_many, set_compiled_dump
+from amis_python.builder.form import Form, InputText, Select
+
+
+def _builder_classes():
+    for module_info in pkgutil.walk_packages(amis_python.builder.__path__, 'amis_python.builder.'):
+        importlib.import_module(module_info.name)
+    seen = set()
+    stack = [BaseModel]
+    while stack:
+        cls = stack.pop()
+        for sub in cls.__subclasses__():
+            if sub not in seen and sub.__module__.startswith('amis_python.builder'):
+                seen.add(sub)
+                stack.append(sub)
+    return sorted(seen, key=lambda c: (c.__module__, c.__name__))
+
+
+# 必填字段的样例值
+_REQUIRED_SAMPLES = {
+    'action_type': 'toast',
+    'buttons': [],
+    'key': 'zoomIn',
+    'tpl': '${name}',
+}
+
+
+def _reference_dump(obj):
+    return PydanticBaseModel.model_dump(obj, exclude_none=True, by_alias=True)
+
+
+class CompiledDumpParityTestCase(TestCase):
+    """编译序列化与 pydantic model_dump 的一致性测试"""
+
+    def assertParity(self, obj):
+        expected = _reference_dump(obj)
+        result = compiled_dump(obj)
+        self.assertEqual(result, expected)
+        # 键顺序也需要一致，保证输出的 JSON 稳定
+        self.assertEqual(list(result), list(expected))
+
+    def test_every_builder_class(self):
+        """测试所有 builder 组件类"""
+        classes = _builder_classes()
+        self.assertIn(CRUD, classes)
+        for cls in classes:
+            kwargs = {
+                name: _REQUIRED_SAMPLES[name]
+                for name, field in cls.model_fields.items() if field.is_required()
+            }
+            if cls is LazyAmisApiObject:
+                kwargs['api_view'] = None
+            with self.subTest(cls=cls.__name__):
+                self.assertParity(cls(**kwargs))
+                populated = cls(
+                    id='node',
+                    debug=True,
+                    on_event={'click': {'actions': [EventAction(action_type='toast', args={'msg': None})]}},
+                    extra_node=Button(label='extra'),
+                    extra_none=None,
+                    **kwargs,
+                )
+                self.assertParity(populated)
+
+    def test_nested_tree(self):
+        """测试嵌套组件树"""
+        page = Page(
+            title='用户管理',
+            body=[
+                CRUD2(
+                    mode=CRUD2Mode.TABLE2,
+                    api='/api/users',
+                    columns=[{'name': 'id', 'label': 'ID'}, Button(label='查看', level='link')],
+                    header_toolbar=[
+                        Button(label='新增', action_type='dialog', dialog=Dialog(
+                            title='新增',
+                            body=Form(body=[InputText(name='name', label='姓名'), Select(name='role')]),
+                        )),
+                    ],
+                ),
+                Tabs(tabs=[TabsItem(title='a', body=Button(label='b')), TabsItem(title='c')]),
+                ('tuple', None, Button(label='t')),
+            ],
+        )
+        self.assertParity(page)
+
+    def test_explicit_none_is_dropped(self):
+        """测试显式赋值为 None 的字段（包括默认值非 None 的字段）"""
+        tabs = Tabs(mount_on_enter=None)
+        tabs.scrollable = None
+        self.assertParity(tabs)
+        self.assertNotIn('scrollable', compiled_dump(tabs))
+
+    def test_dump_many(self):
+        """测试列表批量序列化"""
+        items = [Button(label=str(i)) for i in range(3)] + ['text', {'type': 'tpl', 'tpl': None}]
+        self.assertEqual(dump_many(items), [_reference_dump(i) if isinstance(i, BaseModel) else i for i in items])
+
+    def test_model_dump_opt_in(self):
+        """测试通过开关让 model_dump 走编译路径"""
+        button = Button(label='按钮', size='sm')
+        set_compiled_dump(True)
+        try:
+            self.assertEqual(button.model_dump(), {'label': '按钮', 'type': 'button', 'size': 'sm'})
+            # 非默认参数仍然走 pydantic
+            self.assertIn('icon', button.model_dump(exclude_none=False))
+        finally:
+            set_compiled_dump(False)
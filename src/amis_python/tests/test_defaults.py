@@ -0,0 +1,52 @@
+import copy
+from unittest import TestCase
+
+from amis_python.builder import Dialog, Image, Page, Panel, Service, Tabs, TabsItem
+from amis_python.builder.defaults import AMIS_DEFAULTS, prune_defaults, register_defaults
+
+
+class PruneDefaultsTestCase(TestCase):
+    """amis 默认值裁剪测试"""
+
+    def test_service(self):
+        """测试 Service 的默认值被删除"""
+        schema = Service(api="/api/data", timeout=5000).model_dump()
+        result = prune_defaults(schema)
+        self.assertEqual(result, {"type": "service", "api": "/api/data", "timeout": 5000})
+        self.assertIn("autoRequest", schema)
+
+    def test_keep_non_amis_defaults(self):
+        """测试与 amis 默认值不同的组件默认值被保留"""
+        result = prune_defaults(Dialog(title="弹框").model_dump())
+        self.assertIs(result["closeOnEsc"], True)
+        self.assertIs(result["closeOnOutside"], True)
+
+    def test_bool_is_not_int(self):
+        """测试布尔值不会与数字混淆"""
+        schema = {"type": "service", "debounce": False, "cache": 0}
+        self.assertIs(prune_defaults(schema), schema)
+
+    def test_nested(self):
+        """测试嵌套组件和 Tabs 选项卡"""
+        page = Page(body=[
+            Panel(title="面板", body=[Image(src="/a.png")]),
+            Tabs(tabs=[TabsItem(title="选项卡", tab="内容")]),
+        ]).model_dump()
+        original = copy.deepcopy(page)
+        result = prune_defaults(page)
+
+        self.assertEqual(page, original)
+        self.assertEqual(result["body"][0], {"type": "panel", "title": "面板", "body": [{"type": "image", "src": "/a.png", "enlargeWithGallary": True}]})
+        self.assertEqual(result["body"][1]["tabs"], [{"title": "选项卡", "tab": "内容"}])
+        self.assertIs(result["body"][1]["mountOnEnter"], True)
+
+    def test_data_untouched(self):
+        """测试数据属性不会被裁剪"""
+        schema = {"type": "page", "data": {"type": "service", "timeout": 30000}}
+        self.assertIs(prune_defaults(schema), schema)
+
+    def test_register_defaults(self):
+        """测试补充默认值"""
+        self.addCleanup(AMIS_DEFAULTS.pop, "my-widget", None)
+        register_defaults("my-widget", size="md")
+        self.assertEqual(prune_defaults({"type": "my-widget", "size": "md"}), {"type": "my-widget"})
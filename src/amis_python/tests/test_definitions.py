@@ -0,0 +1,86 @@
+import copy
+from unittest import TestCase
+
+from amis_python.builder import Button, Dialog, Page
+from amis_python.builder.definitions import dedupe_definitions
+from amis_python.builder.form import Form, InputText, Select
+
+
+def _resolve(value, definitions):
+    """展开 $ref，用于比较去重前后的 schema"""
+    if isinstance(value, dict):
+        if "$ref" in value:
+            return _resolve(definitions[value["$ref"]], definitions)
+        return {k: _resolve(v, definitions) for k, v in value.items() if k != "definitions"}
+    if isinstance(value, list):
+        return [_resolve(v, definitions) for v in value]
+    return value
+
+
+def _edit_button(i):
+    return Button(
+        label=f"编辑{i}",
+        action_type="dialog",
+        dialog=Dialog(
+            title="编辑",
+            body=Form(body=[
+                InputText(name="name", label="姓名", required=True),
+                Select(name="role", label="角色", options=[{"label": str(n), "value": n} for n in range(10)]),
+            ]),
+        ),
+    )
+
+
+class DedupeDefinitionsTestCase(TestCase):
+    """definitions 去重测试"""
+
+    def test_repeated_subtrees(self):
+        """测试重复子树被提取到 definitions"""
+        schema = Page(title="页面", body=[_edit_button(i) for i in range(5)]).model_dump()
+        original = copy.deepcopy(schema)
+
+        result, report = dedupe_definitions(schema, min_size=64)
+
+        self.assertEqual(schema, original)
+        self.assertEqual(report.definitions, 1)
+        self.assertEqual(report.references, 5)
+        self.assertGreater(report.bytes_saved, 0)
+        self.assertEqual(result["body"][0]["dialog"], {"$ref": "amisDef1"})
+        self.assertEqual(_resolve(result, result["definitions"]), original)
+
+    def test_no_repeats(self):
+        """测试没有重复子树时原样返回"""
+        schema = Page(title="页面", body=[_edit_button(0)]).model_dump()
+        result, report = dedupe_definitions(schema, min_size=64)
+        self.assertIs(result, schema)
+        self.assertEqual(report.bytes_saved, 0)
+
+    def test_min_size(self):
+        """测试小于阈值的子树不提取"""
+        schema = Page(body=[Button(label="按钮"), Button(label="按钮")]).model_dump()
+        result, report = dedupe_definitions(schema, min_size=256)
+        self.assertIs(result, schema)
+
+    def test_existing_definitions(self):
+        """测试保留已有的 definitions"""
+        schema = Page(body=[_edit_button(i) for i in range(2)]).model_dump()
+        schema["definitions"] = {"amisDef1": {"type": "tpl", "tpl": "x"}}
+        result, _ = dedupe_definitions(schema, min_size=64)
+        self.assertEqual(result["definitions"]["amisDef1"], {"type": "tpl", "tpl": "x"})
+        self.assertEqual(result["body"][0]["dialog"], {"$ref": "amisDef2"})
+
+    def test_data_not_deduped(self):
+        """测试数据属性不参与去重"""
+        row = {"type": "record", "content": "x" * 100}
+        schema = {"type": "page", "data": {"a": row, "b": dict(row)}}
+        result, _ = dedupe_definitions(schema, min_size=16)
+        self.assertIs(result, schema)
+
+    def test_app_inline_pages(self):
+        """测试应用配置中内联的页面"""
+        page = Page(body=[_edit_button(i) for i in range(3)]).model_dump()
+        app = {"type": "app", "pages": [{"type": "group", "children": [{"type": "appPage", "schema": page}]}]}
+        result, report = dedupe_definitions(app, min_size=64)
+        self.assertEqual(report.definitions, 1)
+        self.assertIn("definitions", result["pages"][0]["children"][0]["schema"])
+        self.assertNotIn("definitions", page)
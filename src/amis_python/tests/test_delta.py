@@ -0,0 +1,93 @@
+import copy
+from unittest import TestCase, mock
+
+from amis_python import delta
+from amis_python.delta import VersionHistory, apply_patch, make_patch
+
+
+class JsonPatchTestCase(TestCase):
+    """JSON Patch 测试"""
+
+    def assertRoundTrip(self, old, new):
+        patch = make_patch(old, new)
+        self.assertEqual(apply_patch(copy.deepcopy(old), patch), new)
+        return patch
+
+    def test_identical(self):
+        self.assertEqual(make_patch({"a": [1, 2]}, {"a": [1, 2]}), [])
+
+    def test_dict(self):
+        """测试属性增删改"""
+        patch = self.assertRoundTrip({"a": 1, "b": {"c": 2}, "d": 3}, {"a": 1, "b": {"c": 4}, "e": 5})
+        self.assertEqual(patch, [
+            {"op": "remove", "path": "/d"},
+            {"op": "replace", "path": "/b/c", "value": 4},
+            {"op": "add", "path": "/e", "value": 5},
+        ])
+
+    def test_list_insert(self):
+        """测试列表中插入一项只生成一个 add"""
+        old = {"options": [{"label": str(i), "value": i} for i in range(50)]}
+        new = copy.deepcopy(old)
+        new["options"].insert(0, {"label": "new", "value": -1})
+        patch = self.assertRoundTrip(old, new)
+        self.assertEqual(patch, [{"op": "add", "path": "/options/0", "value": {"label": "new", "value": -1}}])
+
+    def test_list_changes(self):
+        """测试列表增删改"""
+        self.assertRoundTrip([1, 2, 3, 4, 5], [1, 9, 5])
+        self.assertRoundTrip([1, 2], [1, 2, 3, 4])
+        self.assertRoundTrip([], [1])
+        self.assertRoundTrip([{"a": 1}, 2], [{"a": 2}, 2])
+
+    def test_escape(self):
+        """测试 JSON Pointer 转义"""
+        patch = self.assertRoundTrip({"a/b": 1, "c~d": 1}, {"a/b": 2, "c~d": 2})
+        self.assertEqual([op["path"] for op in patch], ["/a~1b", "/c~0d"])
+
+    def test_bool_is_not_int(self):
+        self.assertEqual(self.assertRoundTrip({"a": 1}, {"a": True}), [{"op": "replace", "path": "/a", "value": True}])
+        self.assertEqual(make_patch([{"a": 1.0}], [{"a": 1}]), [{"op": "replace", "path": "/0/a", "value": 1}])
+
+    def test_nodes_compared_once(self):
+        """测试深层修改时每个节点只比较一次，不随深度重复比较子树"""
+        old = {"body": {"type": "tpl", "tpl": "x"}}
+        for _ in range(20):
+            old = {"type": "container", "body": old}
+        new = copy.deepcopy(old)
+        node = new
+        while "body" in node:
+            node = node["body"]
+        node["tpl"] = "y"
+        with mock.patch.object(delta, "_same", wraps=delta._same) as same:
+            self.assertRoundTrip(old, new)
+        # 只有叶子属性需要比较
+        self.assertLess(same.call_count, 50)
+
+
+class VersionHistoryTestCase(TestCase):
+    """版本历史测试"""
+
+    def test_ring_buffer(self):
+        history = VersionHistory(size=2)
+        history.remember("/a", "v1", b"1")
+        history.remember("/a", "v2", b"2")
+        history.remember("/a", "v2", b"2")
+        self.assertEqual(history.get("/a", "v1"), b"1")
+        history.remember("/a", "v3", b"3")
+        self.assertIsNone(history.get("/a", "v1"))
+        self.assertEqual(history.get("/a", "v3"), b"3")
+        self.assertIsNone(history.get("/b", "v3"))
+
+    def test_max_keys(self):
+        history = VersionHistory(max_keys=1)
+        history.remember("/a", "v1", b"1")
+        history.remember("/b", "v1", b"1")
+        self.assertIsNone(history.get("/a", "v1"))
+
+    def test_compressed(self):
+        history = VersionHistory()
+        content = b'{"type":"page","body":"%s"}' % (b"x" * 10000)
+        history.remember("/a", "v1", content)
+        self.assertLess(len(history._versions["/a"][0][1]), 1000)
+        self.assertEqual(history.get("/a", "v1"), content)
@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+from amis_python.builder import Button, EventAction, EventConfig, Page
+from amis_python.builder.crud import CRUD
+from amis_python.builder.dump import cached_dump
+
+
+def _base_page():
+    columns = [{"name": f"c{i}", "label": f"列{i}"} for i in range(5)]
+    buttons = [Button(label=f"b{i}") for i in range(3)]
+    return Page(title="基础", body=[CRUD(api="/api/base", columns=columns), *buttons], extra_key={"a": 1})
+
+
+class DeriveTestCase(TestCase):
+    """derive 写时复制测试"""
+
+    def test_shares_unchanged_nodes(self):
+        """测试只复制修改路径上的节点"""
+        base = _base_page()
+        page = base.derive(title="用户", body__0__api="/api/users")
+        self.assertEqual(page.title, "用户")
+        self.assertEqual(page.body[0].api, "/api/users")
+        self.assertEqual(base.title, "基础")
+        self.assertEqual(base.body[0].api, "/api/base")
+        self.assertIsNot(page.body, base.body)
+        self.assertIsNot(page.body[0], base.body[0])
+        self.assertIs(page.body[0].columns, base.body[0].columns)
+        for index in range(1, 4):
+            self.assertIs(page.body[index], base.body[index])
+
+    def test_alias_extra_and_dict_paths(self):
+        """测试别名、extra 字段和 dict 路径"""
+        base = _base_page()
+        page = base.derive(body__0__perPage=50, extra_key__a=2, body__1__on_event={"click": {"actions": []}})
+        self.assertEqual(page.body[0].per_page, 50)
+        self.assertEqual(page.model_dump()["extra_key"], {"a": 2})
+        self.assertEqual(base.model_dump()["extra_key"], {"a": 1})
+        self.assertIsInstance(page.body[1].on_event["click"], EventConfig)
+        self.assertIsNone(base.body[1].on_event)
+        self.assertIn("perPage", page.model_dump()["body"][0])
+
+    def test_matches_deep_copy(self):
+        """测试与深拷贝后修改的结果一致"""
+        base = _base_page()
+        base.body[1].add_action("click", EventAction(action_type="toast"))
+        expected = base.model_copy(deep=True)
+        expected.title = "新标题"
+        expected.body[1].label = "保存"
+        self.assertEqual(base.derive(title="新标题", body__1__label="保存").model_dump(), expected.model_dump())
+
+    def test_cache_is_separate(self):
+        """测试派生组件不复用原组件的缓存，共享的子组件缓存仍可复用"""
+        base = _base_page()
+        self.assertEqual(cached_dump(base)["title"], "基础")
+        page = base.derive(title="派生")
+        self.assertEqual(cached_dump(page)["title"], "派生")
+        self.assertEqual(cached_dump(base)["title"], "基础")
+        base.body[1].label = "改"
+        self.assertEqual(cached_dump(page)["body"][1]["label"], "改")
+
+    def test_invalid_paths(self):
+        """测试不存在的路径和冲突的路径"""
+        base = _base_page()
+        with self.assertRaises(KeyError):
+            base.derive(body__9__label="x")
+        with self.assertRaises(KeyError):
+            base.derive(title__x="x")
+        with self.assertRaises(ValueError):
+            base.derive(body__0="x", body__0__api="y")
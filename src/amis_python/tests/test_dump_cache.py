@@ -0,0 +1,89 @@
+import json
+import pickle
+from unittest import TestCase
+
+from amis_python.builder import AppBuilder, Button, Container, EventAction, Page
+from amis_python.builder.dump import cached_dump, cached_dump_json, compiled_dump, get_node_cache
+
+
+class DumpCacheTestCase(TestCase):
+    """子树序列化缓存测试"""
+
+    def setUp(self):
+        self.inner = Button(label="内层按钮")
+        self.sibling = Button(label="同级按钮")
+        self.container = Container(body=[self.inner])
+        self.page = Page(title="页面", body=[self.container, self.sibling])
+
+    def test_cache_hit(self):
+        """测试未修改的页面直接命中缓存"""
+        first = cached_dump(self.page)
+        self.assertIs(cached_dump(self.page), first)
+        self.assertEqual(first, compiled_dump(self.page))
+
+    def test_field_assignment_invalidates_path(self):
+        """测试字段赋值只会使到根节点的路径失效"""
+        first = cached_dump(self.page)
+        sibling_dump = cached_dump(self.sibling)
+
+        self.inner.label = "已修改"
+        second = cached_dump(self.page)
+
+        self.assertIsNot(second, first)
+        self.assertEqual(second["body"][0]["body"][0]["label"], "已修改")
+        # 未修改的兄弟子树复用缓存
+        self.assertIs(second["body"][1], sibling_dump)
+
+    def test_add_action_invalidates(self):
+        """测试 add_action 会使缓存失效"""
+        cached_dump(self.page)
+        self.inner.add_action("click", EventAction(action_type="toast"))
+        result = cached_dump(self.page)
+        self.assertEqual(result["body"][0]["body"][0]["onEvent"]["click"]["actions"][0]["actionType"], "toast")
+
+        self.inner.add_action("click", EventAction(action_type="refresh"))
+        result = cached_dump(self.page)
+        self.assertEqual(len(result["body"][0]["body"][0]["onEvent"]["click"]["actions"]), 2)
+
+    def test_mark_dirty_after_in_place_mutation(self):
+        """测试原地修改列表后手动标记"""
+        cached_dump(self.page)
+        self.container.body.append(Button(label="新增"))
+        self.container.mark_dirty()
+        self.assertEqual(len(cached_dump(self.page)["body"][0]["body"]), 2)
+
+    def test_invalidate_without_own_data(self):
+        """测试节点自身没有缓存数据时仍然使祖先失效"""
+        cached_dump(self.page)
+        # 子节点的缓存已被清空（如并发修改时放弃了写入），祖先的缓存还在
+        get_node_cache(self.inner).data.clear()
+        self.inner.label = "已修改"
+        self.assertEqual(cached_dump(self.page)["body"][0]["body"][0]["label"], "已修改")
+
+    def test_dump_json(self):
+        """测试 JSON 缓存"""
+        content = cached_dump_json(self.page)
+        self.assertIs(cached_dump_json(self.page), content)
+        self.assertEqual(json.loads(content), compiled_dump(self.page))
+
+        self.sibling.level = "primary"
+        self.assertEqual(json.loads(cached_dump_json(self.page))["body"][1]["level"], "primary")
+
+    def test_copy_does_not_share_cache(self):
+        """测试复制出的节点不会共用缓存"""
+        cached_dump(self.sibling)
+        copied = self.sibling.model_copy()
+        copied.label = "副本"
+        self.assertEqual(cached_dump(copied)["label"], "副本")
+        self.assertEqual(cached_dump(self.sibling)["label"], "同级按钮")
+
+        pickled = pickle.loads(pickle.dumps(self.page))
+        self.assertEqual(cached_dump(pickled), cached_dump(self.page))
+
+    def test_register_page_invalidates_app(self):
+        """测试注册页面会使应用配置缓存失效"""
+        app = AppBuilder(brand_name="应用")
+        cached_dump(app)
+        app.register_page("首页", "/home", page=Page(title="首页"))
+        children = cached_dump(app)["pages"][0]["children"]
+        self.assertEqual(children[0]["schemaApi"], "/amis/page/home")
@@ -0,0 +1,34 @@
+import json
+from unittest import TestCase
+
+from amis_python.builder import Button, Page
+from amis_python.builder.encoding import encode_envelope, encode_json
+from amis_python.drf import AmisResponse
+
+
+class EncodingTestCase(TestCase):
+    """JSON 编码测试"""
+
+    def test_encode_model(self):
+        """测试直接编码组件对象"""
+        page = Page(title="标题", body=[Button(label="按钮", extra=None)])
+        self.assertEqual(json.loads(encode_json(page)), page.model_dump())
+
+    def test_encode_nested_model_in_dict(self):
+        """测试 dict 中嵌套组件对象"""
+        data = {"type": "page", "body": [Button(label="按钮")], "title": None}
+        self.assertEqual(json.loads(encode_json(data)), {
+            "type": "page",
+            "body": [{"label": "按钮", "type": "button"}],
+            "title": None,
+        })
+
+    def test_encode_envelope(self):
+        """测试统一响应体"""
+        content = encode_envelope(b'{"type":"page"}', msg="成功", extra=1)
+        self.assertEqual(json.loads(content), {"status": 0, "msg": "成功", "data": {"type": "page"}, "extra": 1})
+
+    def test_amis_response_accepts_bytes(self):
+        """测试 AmisResponse 接收已编码的 schema"""
+        response = AmisResponse(data=b'{"type":"page"}')
+        self.assertEqual(json.loads(response.rendered_content), {"status": 0, "msg": "ok", "data": {"type": "page"}})
@@ -0,0 +1,79 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import TestCase, mock
+
+from django.core.management import call_command
+
+from amis_python.builder import AppBuilder, Page
+from amis_python.export import export_static
+
+
+class ExportStaticTestCase(TestCase):
+    """静态导出测试"""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.app = AppBuilder(brand_name="导出")
+        self.app.register_page("首页", "/home", page=Page(title="首页"))
+        self.app.register_page("动态", "/dynamic", page=lambda request: Page(title="动态"))
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def _read(self, *parts):
+        with open(os.path.join(self.output_dir, *parts), "rb") as f:
+            return f.read()
+
+    def test_export(self):
+        """测试导出的文件及应用配置"""
+        report = export_static(self.output_dir, base_url="/static-amis", apps={"demo": self.app}, workers=0)
+        self.assertEqual(report.pages, 1)
+        self.assertEqual(report.dynamic_pages, ["/dynamic"])
+
+        manifest = json.loads(self._read("demo", "manifest.json"))
+        page_file = manifest["pages"]["/home"]
+        self.assertRegex(page_file, r"^pages/home\.[0-9a-f]{16}\.json$")
+        page = json.loads(self._read("demo", *page_file.split("/")))
+        self.assertEqual(page["data"]["title"], "首页")
+
+        config = json.loads(self._read("demo", manifest["config"]))["data"]
+        children = config["pages"][0]["children"]
+        self.assertEqual(children[0]["schemaApi"], "/static-amis/demo/" + page_file)
+        self.assertEqual(children[1]["schemaApi"], "/amis/page/dynamic")
+
+        index = self._read("demo", "index.html").decode("utf-8")
+        self.assertIn(f'const CONFIG_URL = "/static-amis/demo/{manifest["config"]}";', index)
+        self.assertNotIn("/amis/config/", index)
+
+    def test_missing_config_url_marker(self):
+        """测试首页模板中没有配置地址标记时导出失败"""
+        template = os.path.join(self.output_dir, "index.html")
+        with open(template, "w", encoding="utf-8") as f:
+            f.write("<script>fetch('/amis/config/')</script>")
+        with mock.patch("amis_python.export.INDEX_TEMPLATE", template):
+            with self.assertRaises(ValueError):
+                export_static(os.path.join(self.output_dir, "out"), apps={"demo": self.app}, workers=0)
+
+    def test_precompressed(self):
+        """测试预压缩文件与原文件内容一致"""
+        export_static(self.output_dir, apps={"demo": self.app}, workers=0)
+        manifest = json.loads(self._read("demo", "manifest.json"))
+        content = self._read("demo", manifest["config"])
+        self.assertEqual(gzip.decompress(self._read("demo", manifest["config"] + ".gz")), content)
+
+    def test_process_pool(self):
+        """测试使用进程池导出"""
+        report = export_static(self.output_dir, apps={"demo": self.app}, workers=2, compress=False)
+        self.assertEqual(report.files, 4)
+        self.assertEqual(len(os.listdir(os.path.join(self.output_dir, "demo"))), 4)
+
+    def test_command(self):
+        """测试 amis_export 命令导出注册表中的应用"""
+        out = StringIO()
+        call_command("amis_export", self.output_dir, "--workers", "0", stdout=out, stderr=StringIO())
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "default", "index.html")))
+        self.assertIn("已导出", out.getvalue())
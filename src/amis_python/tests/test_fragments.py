@@ -0,0 +1,166 @@
+import json
+from unittest import TestCase as SimpleTestCase
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from amis_python.builder import Button, Dialog, Page, Service, Tabs, TabsItem, Tpl
+from amis_python.builder.batch import BATCH_HEADER
+from amis_python.builder.fragments import build_id_index, resolve_pointer, split_fragments
+from amis_python.registry import get_default_app, register_page
+from amis_python.views import get_fragment_payload
+
+
+def _big(text):
+    return {"type": "tpl", "tpl": text * 100}
+
+
+class SplitFragmentsTestCase(SimpleTestCase):
+    """大子树拆分测试"""
+
+    def test_inactive_tabs(self):
+        """测试只拆分非激活选项卡"""
+        schema = {"type": "tabs", "tabs": [{"title": "a", "body": _big("a")}, {"title": "b", "body": _big("b")}]}
+        result, pointers = split_fragments(schema, "/amis/fragment/p", min_size=50)
+        self.assertEqual(pointers, ["/tabs/1/body"])
+        self.assertIs(result["tabs"][0], schema["tabs"][0])
+        self.assertEqual(result["tabs"][1], {
+            "title": "b", "body": {"type": "service", "schemaApi": "/amis/fragment/p?pointer=/tabs/1/body"},
+        })
+        self.assertEqual(resolve_pointer(schema, pointers[0]), _big("b"))
+
+        schema["activeKey"] = "second"
+        schema["tabs"][1]["hash"] = "second"
+        _, pointers = split_fragments(schema, "/amis/fragment/p", min_size=50)
+        self.assertEqual(pointers, ["/tabs/0/body"])
+        schema["activeKey"] = "${tab}"
+        self.assertEqual(split_fragments(schema, "/amis/fragment/p", min_size=50)[1], [])
+
+    def test_dialog_and_collapsed(self):
+        """测试弹框内容和折叠面板"""
+        schema = {"type": "page", "body": [
+            {"type": "button", "actionType": "dialog", "dialog": {"title": "d", "body": _big("d"), "actions": []}},
+            {"type": "collapse", "collapsed": True, "body": _big("c")},
+            {"type": "collapse", "collapsed": False, "body": _big("e")},
+            {"type": "button", "actionType": "drawer", "drawer": {"body": "小"}},
+        ]}
+        result, pointers = split_fragments(schema, "/f?x=1", min_size=50)
+        self.assertEqual(pointers, ["/body/0/dialog/body", "/body/1/body"])
+        self.assertEqual(result["body"][0]["dialog"]["title"], "d")
+        self.assertEqual(result["body"][0]["dialog"]["body"]["schemaApi"], "/f?x=1&pointer=/body/0/dialog/body")
+        self.assertIs(result["body"][2], schema["body"][2])
+        self.assertIs(result["body"][3], schema["body"][3])
+        self.assertEqual(schema["body"][0]["dialog"]["body"], _big("d"))
+
+    def test_small_subtrees_kept(self):
+        """测试小于阈值的子树不拆分"""
+        schema = {"type": "tabs", "tabs": [{"body": "a"}, {"body": {"type": "tpl", "tpl": "b"}}]}
+        result, pointers = split_fragments(schema, "/f", min_size=4096)
+        self.assertIs(result, schema)
+        self.assertEqual(pointers, [])
+
+    def test_id_index(self):
+        """测试组件 id 索引"""
+        schema = {"type": "page", "id": "root", "data": {"id": "data"}, "body": [
+            {"type": "form", "id": "form", "body": [{"type": "input-text", "id": "a/b"}]},
+            {"type": "tpl", "id": "form"},
+        ]}
+        self.assertEqual(build_id_index(schema), {"root": "", "form": "/body/0", "a/b": "/body/0/body/0"})
+
+    def test_resolve_pointer(self):
+        """测试 JSON Pointer 解析"""
+        schema = {"a/b": [{"~c": 1}]}
+        self.assertEqual(resolve_pointer(schema, "/a~1b/0/~0c"), 1)
+        self.assertIs(resolve_pointer(schema, ""), schema)
+        for pointer in ("/x", "/a~1b/5", "a", "/a~1b/0/~0c/d"):
+            with self.assertRaises(KeyError):
+                resolve_pointer(schema, pointer)
+
+
+@override_settings(AMIS_SPLIT_PAGE_SIZE=1000, AMIS_SPLIT_MIN_SIZE=200)
+class FragmentViewTestCase(TestCase):
+    """页面片段接口测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        register_page("拆分页面", "/fragments_page", page=Page(title="拆分", body=[
+            Tabs(tabs=[
+                TabsItem(title="首页", body=Tpl(tpl="首屏")),
+                TabsItem(title="详情", body=[
+                    Button(label="查看", action_type="dialog", dialog=Dialog(title="弹框", body=Tpl(id="dialog_tpl", tpl="弹框" * 200))),
+                    Tpl(tpl="详情" * 200),
+                ]),
+            ]),
+        ]))
+        register_page("片段批量请求", "/fragments_batch", page=Page(title="批量", body=[
+            Service(api="/api/fragment_data", body=Tpl(tpl="${value}")),
+        ]))
+
+    def setUp(self):
+        self.client = APIClient()
+        User.objects.create_user(username="fragments", password="password")
+        self.client.login(username="fragments", password="password")
+
+    def _data(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)["data"]
+
+    def test_page_is_split(self):
+        page = self._data("/amis/page/fragments_page")
+        tabs = page["body"][0]["tabs"]
+        self.assertEqual(tabs[0]["body"]["tpl"], "首屏")
+        self.assertEqual(tabs[1]["body"], {"type": "service", "schemaApi": "/amis/fragment/fragments_page?pointer=/body/0/tabs/1/body"})
+
+        fragment = self._data(tabs[1]["body"]["schemaApi"])
+        self.assertEqual(fragment[1]["tpl"], "详情" * 200)
+        # 片段中的大弹框继续拆分
+        dialog_body = fragment[0]["dialog"]["body"]
+        self.assertEqual(dialog_body["schemaApi"], "/amis/fragment/fragments_page?pointer=/body/0/tabs/1/body/0/dialog/body")
+        self.assertEqual(self._data(dialog_body["schemaApi"])["tpl"], "弹框" * 200)
+
+    def test_small_page_not_split(self):
+        with override_settings(AMIS_SPLIT_PAGE_SIZE=100000):
+            page = self._data("/amis/page/fragments_page")
+        self.assertEqual(page["body"][0]["tabs"][1]["body"][1]["tpl"], "详情" * 200)
+
+    def test_missing_fragment(self):
+        response = self.client.get("/amis/fragment/fragments_page?pointer=/body/9")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get("/amis/fragment/fragments_missing?pointer=")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_fragment_by_id(self):
+        self.assertEqual(self._data("/amis/fragment/fragments_page?id=dialog_tpl")["tpl"], "弹框" * 200)
+        response = self.client.get("/amis/fragment/fragments_page?id=missing")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_fragment_cache_and_etag(self):
+        url = "/amis/fragment/fragments_page?pointer=/body/0/tabs/1/body/1"
+        response = self.client.get(url)
+        etag = response["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        page = get_default_app().get_page("/fragments_page")
+        payload = get_fragment_payload(page, "/fragments_page", component_id="dialog_tpl")
+        self.assertIs(get_fragment_payload(page, "/fragments_page", component_id="dialog_tpl"), payload)
+        tpl = page.body[0].tabs[1].body[1]
+        tpl.tpl = "已修改"
+        try:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(json.loads(response.content)["data"]["tpl"], "已修改")
+        finally:
+            tpl.tpl = "详情" * 200
+
+    def test_fragment_passes(self):
+        url = "/amis/fragment/fragments_batch?pointer=/body/0"
+        self.assertNotIn("headers", self._data(url)["api"])
+        with override_settings(AMIS_BATCH_INITIAL_APIS=True):
+            self.assertEqual(self._data(url)["api"]["headers"], {BATCH_HEADER: "1"})
+            page = self._data("/amis/page/fragments_batch")
+            self.assertEqual(page["body"][0]["api"]["headers"], {BATCH_HEADER: "1"})
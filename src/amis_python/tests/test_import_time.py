@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+# 导入 amis_python.builder 中一个组件的耗时预算（毫秒），可用环境变量覆盖
+IMPORT_BUDGET_MS = int(os.environ.get("AMIS_IMPORT_BUDGET_MS", 400))
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _run(code, *options):
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    env.pop("DJANGO_SETTINGS_MODULE", None)
+    return subprocess.run(
+        [sys.executable, *options, "-c", code], env=env, capture_output=True, text=True, check=True,
+    )
+
+
+def _loaded_modules(code):
+    result = _run(f"import sys, json\n{code}\nprint(json.dumps(sorted(sys.modules)))")
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+class ImportTimeTestCase(TestCase):
+    """导入开销回归测试"""
+
+    def test_package_is_lazy(self):
+        """测试 import amis_python 不加载组件、Django 和 DRF"""
+        modules = _loaded_modules("import amis_python, amis_python.builder")
+        for name in ("django", "rest_framework", "pydantic", "amis_python.builder.base", "amis_python.registry"):
+            self.assertNotIn(name, modules)
+
+    def test_component_import(self):
+        """测试导入单个组件只加载需要的模块"""
+        modules = _loaded_modules("from amis_python.builder import Button")
+        for name in ("django", "rest_framework", "webbrowser", "amis_python.builder.crud", "amis_python.builder.app"):
+            self.assertNotIn(name, modules)
+
+    def test_offline_tools(self):
+        """测试导出、分析和页面冻结不加载视图层"""
+        modules = _loaded_modules("import amis_python.export, amis_python.analysis, amis_python.registry, amis_python.passes")
+        for name in ("rest_framework", "amis_python.views"):
+            self.assertNotIn(name, modules)
+
+    def test_lazy_exports(self):
+        """测试按需导出的名称"""
+        import amis_python
+        import amis_python.builder
+        from amis_python.builder.button import Button
+
+        self.assertIs(amis_python.builder.Button, Button)
+        self.assertIn("Button", dir(amis_python.builder))
+        self.assertIn("register_page", dir(amis_python))
+        with self.assertRaises(AttributeError):
+            amis_python.builder.NotAComponent
+        for name in amis_python.__all__:
+            self.assertTrue(hasattr(amis_python, name), name)
+        for name in amis_python.builder.__all__:
+            self.assertTrue(hasattr(amis_python.builder, name), name)
+
+    def test_import_budget(self):
+        """测试导入组件的耗时不超过预算"""
+        result = _run("from amis_python.builder import Button", "-X", "importtime")
+        total = 0
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package；只统计顶层导入
+            parts = line.split("|")
+            if len(parts) == 3 and parts[1].strip().isdigit() and not parts[2].startswith("  "):
+                total += int(parts[1])
+        self.assertLess(total / 1000, IMPORT_BUDGET_MS)
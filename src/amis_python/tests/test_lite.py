@@ -0,0 +1,91 @@
+import json
+from unittest import TestCase
+
+from amis_python.builder import BaseModel, Button, EventAction, lite
+from amis_python.builder.action import Action
+from amis_python.builder.api import LazyAmisApiObject
+from amis_python.builder.app import AppBuilder
+from amis_python.builder.encoding import encode_json
+from amis_python.builder.form import InputText
+from amis_python.builder.lite import LiteModel, lite_class, set_lite_validation
+from amis_python.payload import schema_payload
+from amis_python.tests.test_compiled_dump import _REQUIRED_SAMPLES, _builder_classes
+
+
+def _lite_classes():
+    for cls in _builder_classes():
+        try:
+            yield cls, lite_class(cls)
+        except TypeError:
+            continue
+
+
+class LiteBackendTestCase(TestCase):
+    """轻量组件后端测试"""
+
+    def assertSameOutput(self, lite_obj, model):
+        expected = model.model_dump()
+        result = lite_obj.model_dump()
+        self.assertEqual(result, expected)
+        self.assertEqual(list(result), list(expected))
+        self.assertEqual(json.loads(lite_obj.model_dump_json()), json.loads(model.model_dump_json()))
+
+    def test_every_builder_class(self):
+        """测试所有组件的孪生类与原组件输出一致"""
+        classes = dict(_lite_classes())
+        self.assertIn(InputText, classes)
+        self.assertNotIn(AppBuilder, classes)
+        self.assertNotIn(LazyAmisApiObject, classes)
+        for cls, twin in classes.items():
+            kwargs = {name: _REQUIRED_SAMPLES[name] for name, field in cls.model_fields.items() if field.is_required()}
+            with self.subTest(cls=cls.__name__):
+                self.assertEqual(twin.__name__, cls.__name__)
+                self.assertFalse(hasattr(twin(**kwargs), "__dict__"))
+                self.assertSameOutput(twin(**kwargs), cls(**kwargs))
+                extra = dict(id="node", debug=True, extra_field={"a": None}, **kwargs)
+                self.assertSameOutput(twin(**extra), cls(**extra))
+
+    def test_nested_tree(self):
+        """测试嵌套组件树、别名参数和事件动作"""
+        def build(module):
+            button = module.Button(label="按钮", actionType="dialog", dialog=module.Dialog(title="弹框", body=[module.InputText(name="a", labelWidth=80)]))
+            button.add_action("click", module.EventAction(action_type="toast"))
+            return module.Page(title="页面", body=[module.Form(body=[module.Select(name="s", options=["1", "2"])]), button])
+
+        import amis_python.builder as builder
+        from amis_python.builder import form
+        namespace = type("namespace", (), {name: getattr(builder, name, None) or getattr(form, name) for name in ("Button", "Dialog", "InputText", "EventAction", "Page", "Form", "Select")})
+        self.assertSameOutput(build(lite), build(namespace))
+        self.assertEqual(encode_json(build(lite)), encode_json(build(namespace)))
+        self.assertEqual(schema_payload(build(lite)).content, schema_payload(build(namespace)).content)
+
+    def test_shared_alias(self):
+        """测试多个字段共用别名"""
+        self.assertSameOutput(lite.Action(action_type="email", body_email="x"), Action(action_type="email", body_email="x"))
+
+    def test_mutable_defaults(self):
+        """测试可变默认值不在实例间共享"""
+        first, second = lite.Tabs(), lite.Tabs()
+        for name, _ in lite.Tabs.__amis_fields__:
+            value = getattr(first, name)
+            if isinstance(value, (list, dict)):
+                self.assertIsNot(value, getattr(second, name))
+
+    def test_to_model(self):
+        """测试转换为经过校验的原组件"""
+        page = lite.Page(title="页面", body=[lite.Button(label="按钮")])
+        model = page.to_model()
+        self.assertIsInstance(model, BaseModel)
+        self.assertIsInstance(model.body[0], Button)
+        self.assertEqual(model.model_dump(), page.model_dump())
+
+    def test_validation_mode(self):
+        """测试校验模式下返回原组件"""
+        set_lite_validation(True)
+        self.addCleanup(set_lite_validation, False)
+        button = lite.Button(label="按钮")
+        self.assertIsInstance(button, Button)
+        with self.assertRaises(Exception):
+            lite.EventAction(action_type=None, args=1)
+        set_lite_validation(False)
+        self.assertIsInstance(lite.Button(label="按钮"), LiteModel)
@@ -0,0 +1,62 @@
+import gzip
+import json
+from unittest import TestCase, mock
+
+from amis_python.builder import Button, Page
+from amis_python.payload import FrozenPage, SchemaPayload, compress, schema_payload
+
+
+class SchemaPayloadTestCase(TestCase):
+    """schema 响应载荷测试"""
+
+    def test_cached_on_node(self):
+        """测试组件树的载荷缓存在节点上"""
+        page = Page(title="页面", body=[Button(label="按钮")])
+        payload = schema_payload(page)
+        self.assertIs(schema_payload(page), payload)
+        self.assertEqual(json.loads(payload.body), {"status": 0, "msg": "ok", "data": page.model_dump()})
+
+        page.body[0].label = "已修改"
+        self.assertIsNot(schema_payload(page), payload)
+        self.assertNotEqual(schema_payload(page).etag, payload.etag)
+
+    def test_etag_is_content_hash(self):
+        """测试 ETag 只与内容有关"""
+        self.assertEqual(SchemaPayload(b'{"a":1}').etag, schema_payload({"a": 1}).etag)
+        self.assertNotEqual(SchemaPayload(b'{"a":1}').etag, SchemaPayload(b'{"a":2}').etag)
+
+    def test_encoded_body_cached(self):
+        """测试压缩结果缓存在载荷上"""
+        payload = SchemaPayload(json.dumps({"body": ["x"] * 100}).encode())
+        encoded = payload.encoded_body("gzip")
+        self.assertIs(payload.encoded_body("gzip"), encoded)
+        self.assertEqual(gzip.decompress(encoded), payload.body)
+        self.assertNotEqual(payload.encoded_etag("gzip"), payload.etag)
+        self.assertRaises(ValueError, payload.encoded_body, "deflate")
+
+    def test_frozen_page(self):
+        """测试冻结页面保存编码后的内容并直接作为载荷"""
+        page = Page(title="页面", body=[Button(label=f"按钮{i}") for i in range(50)])
+        content = schema_payload(page).content
+        for compress in (True, False):
+            frozen = FrozenPage(content, compress=compress)
+            self.assertEqual(frozen.content, content)
+            self.assertEqual(frozen.etag, schema_payload(page).etag)
+            payload = schema_payload(frozen, passes=(lambda schema: {},))
+            self.assertEqual(payload.content, content)
+            self.assertEqual(payload.etag, frozen.etag)
+        self.assertLess(len(FrozenPage(content).blob), len(content))
+        # 不压缩时载荷常驻，响应体和压缩结果可以复用
+        self.assertIs(frozen.payload(), frozen.payload())
+
+    def test_frozen_page_encoded_body_cached(self):
+        """测试压缩冻结的页面只压缩一次响应体，命中时不解压内容"""
+        content = schema_payload(Page(title="页面", body=[Button(label=f"按钮{i}") for i in range(50)])).content
+        frozen = FrozenPage(content)
+        with mock.patch("amis_python.payload.compress", wraps=compress) as compress_mock:
+            body = frozen.payload().encoded_body("gzip")
+            with mock.patch("amis_python.payload.zlib.decompress") as decompress:
+                self.assertIs(frozen.payload().encoded_body("gzip"), body)
+            decompress.assert_not_called()
+        self.assertEqual(compress_mock.call_count, 1)
+        self.assertEqual(json.loads(gzip.decompress(body))["data"], json.loads(content))
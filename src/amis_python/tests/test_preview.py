@@ -0,0 +1,65 @@
+import json
+import threading
+import time
+from unittest import TestCase, mock
+from urllib.request import urlopen
+
+from amis_python.builder import Page
+from amis_python.builder import preview
+from amis_python.builder.preview import PreviewServer
+
+
+class PreviewServerTestCase(TestCase):
+    """本地预览服务测试"""
+
+    def setUp(self):
+        self.server = PreviewServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _get(self, path):
+        with urlopen(self.server.url + path.lstrip("/"), timeout=10) as response:
+            return response.read()
+
+    def test_static_assets(self):
+        """测试静态资源和预览页"""
+        self.assertIn(b"__amis__/schema", self._get("/"))
+        self.assertIn(b"<html", self._get("/index.html"))
+
+    def test_schema_version(self):
+        """测试版本不一致时立即返回当前 schema"""
+        version = self.server.push(b'{"type":"page"}')
+        self.assertEqual(json.loads(self._get("/__amis__/schema?version=0")), {"version": version, "schema": {"type": "page"}})
+        self.assertTrue(self.server.has_client())
+
+    def test_long_poll(self):
+        """测试长轮询在推送后立即返回"""
+        version = self.server.push(b'{"title":"a"}')
+        timer = threading.Timer(0.2, self.server.push, args=(b'{"title":"b"}',))
+        timer.start()
+        started = time.monotonic()
+        result = json.loads(self._get(f"/__amis__/schema?version={version}"))
+        timer.join()
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(result, {"version": version + 1, "schema": {"title": "b"}})
+
+
+class ShowTestCase(TestCase):
+    """BaseModel.show 测试"""
+
+    def tearDown(self):
+        preview.stop_preview_server()
+
+    def test_show_reuses_server(self):
+        """测试 show 复用预览服务，预览页打开时不再打开浏览器"""
+        with mock.patch("webbrowser.open") as open_browser:
+            server = Page(title="第一次").show()
+            open_browser.assert_called_once_with(server.url)
+            self.assertEqual(json.loads(server.content)["title"], "第一次")
+
+            server.wait(server.version, 0)
+            self.assertIs(Page(title="第二次").show(), server)
+            open_browser.assert_called_once()
+            self.assertEqual(server.version, 2)
+            self.assertEqual(json.loads(server.content)["title"], "第二次")
@@ -0,0 +1,68 @@
+import json
+from io import StringIO
+from unittest import TestCase
+
+from django.core.management import call_command
+
+from amis_python.builder import Button, Dialog, Page, profile_serialization
+from amis_python.builder.dump import compiled_dump
+from amis_python.builder.form import Form, InputText
+from amis_python.builder.profiling import profile_dump
+
+
+class SerializationProfileTestCase(TestCase):
+    """序列化性能分析测试"""
+
+    def setUp(self):
+        self.page = Page(title="页面", body=[
+            Button(label=f"按钮{i}", action_type="dialog", dialog=Dialog(title="弹框", body=Form(body=[InputText(name="name")])))
+            for i in range(3)
+        ])
+
+    def test_model_dump_hook(self):
+        """测试上下文中的 model_dump 被统计且结果不变"""
+        with profile_serialization() as profile:
+            result = self.page.model_dump()
+        self.assertEqual(result, compiled_dump(self.page))
+        self.assertEqual(profile.stats["button"].count, 3)
+        self.assertEqual(profile.stats["input-text"].count, 3)
+        self.assertEqual(profile.stats["page"].count, 1)
+        self.assertEqual(profile.nodes, 13)
+
+        # 上下文外不再统计
+        self.page.model_dump()
+        self.assertEqual(profile.stats["page"].count, 1)
+
+    def test_bytes(self):
+        """测试字节数统计"""
+        with profile_serialization() as profile:
+            content = self.page.model_dump_json()
+        self.assertEqual(json.loads(content), compiled_dump(self.page))
+        self.assertEqual(profile.total_bytes, len(content.encode()))
+        self.assertEqual(sum(stats.self_bytes for stats in profile.stats.values()), profile.total_bytes)
+        self.assertEqual(profile.stats["page"].bytes, profile.total_bytes)
+
+    def test_time(self):
+        """测试耗时统计"""
+        profile = profile_dump(self.page, repeat=2)
+        self.assertEqual(profile.stats["page"].count, 2)
+        self.assertAlmostEqual(sum(stats.self_time for stats in profile.stats.values()), profile.total_time, places=6)
+        self.assertGreaterEqual(profile.stats["dialog"].time, profile.stats["form"].time)
+
+    def test_table(self):
+        """测试排名表格"""
+        profile = profile_dump(self.page)
+        table = profile.table(sort="bytes", limit=2)
+        lines = table.splitlines()
+        self.assertTrue(lines[0].startswith("type"))
+        self.assertTrue(lines[2].startswith("page"))
+        self.assertTrue(lines[-1].startswith("total"))
+        self.assertEqual(len(lines), 5)
+        self.assertRaises(ValueError, profile.rows, "name")
+
+    def test_command(self):
+        """测试 amis_profile 命令"""
+        out = StringIO()
+        call_command("amis_profile", "--sort", "count", stdout=out)
+        self.assertIn("app", out.getvalue())
+        self.assertIn("total", out.getvalue())
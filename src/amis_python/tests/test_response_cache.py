@@ -0,0 +1,206 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, TestCase
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from amis_python.builder import Api, to_api
+from amis_python.response_cache import _inflight, amis_cache, amis_invalidate, invalidate_cache
+from amis_python.routes import ApiRoute
+
+calls = []
+
+
+@amis_cache(60000, per_user=False, tags=["orders"])
+def dashboard(request):
+    calls.append("dashboard")
+    return {"total": len(calls)}
+
+
+@amis_cache(Api(cache=60000))
+def profile(request):
+    calls.append("profile")
+    return JsonResponse({"user": request.user.username})
+
+
+@amis_cache(60000, per_user=False, vary=lambda request: request.headers.get("X-Tenant"))
+def slow(request):
+    calls.append("slow")
+    time.sleep(0.2)
+    return {"tenant": request.headers.get("X-Tenant")}
+
+
+@amis_cache(60000)
+def lookup(request):
+    calls.append("lookup")
+    if request.GET.get("id") == "0":
+        return 404, {"detail": "不存在"}
+    return 200, {"id": request.GET.get("id")}
+
+
+@amis_cache(60000)
+def export(request):
+    calls.append("export")
+    response = HttpResponse("a,b", content_type="text/csv")
+    response["Content-Disposition"] = 'attachment; filename="report.csv"'
+    response["Connection"] = "keep-alive"
+    response.set_cookie("seen", "1")
+    return response
+
+
+@amis_cache(60000)
+def unpicklable(request):
+    calls.append("unpicklable")
+    return {"rows": (row for row in range(3)), "format": lambda value: value}
+
+
+@amis_invalidate("orders")
+def create_order(request):
+    return {"id": 1}
+
+
+@amis_invalidate("orders")
+def reject_order(request):
+    return 400, {"detail": "参数错误"}
+
+
+@amis_invalidate(profile)
+def update_profile(request):
+    return JsonResponse({"status": 1}, status=400)
+
+
+class ReportViewSet(viewsets.ViewSet):
+    @amis_cache(1000)
+    def list(self, request):
+        calls.append("report")
+        return Response({"count": 3}, headers={"X-Total-Count": "3"})
+
+
+class ResponseCacheTestCase(TestCase):
+    """接口响应缓存测试"""
+
+    def setUp(self):
+        cache.clear()
+        calls.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username="cache_user", password="password")
+
+    def _get(self, path, user=None, **extra):
+        request = self.factory.get(path, **extra)
+        request.user = user or AnonymousUser()
+        return request
+
+    def test_shared_cache(self):
+        """测试查询参数规范化，不同用户共享缓存"""
+        self.assertEqual(dashboard(self._get("/dashboard?b=2&a=1")), {"total": 1})
+        self.assertEqual(dashboard(self._get("/dashboard?a=1&b=2", user=self.user)), {"total": 1})
+        self.assertEqual(dashboard(self._get("/dashboard?a=2")), {"total": 2})
+        self.assertEqual(calls, ["dashboard", "dashboard"])
+        dashboard(self.factory.post("/dashboard?a=1"))
+        self.assertEqual(len(calls), 3)
+
+    def test_per_user(self):
+        """测试缓存键包含用户"""
+        other = User.objects.create_user(username="other_user", password="password")
+        self.assertEqual(profile(self._get("/profile", user=self.user)).content, b'{"user": "cache_user"}')
+        response = profile(self._get("/profile", user=self.user))
+        self.assertEqual((response.status_code, response.content), (200, b'{"user": "cache_user"}'))
+        self.assertEqual(profile(self._get("/profile", user=other)).content, b'{"user": "other_user"}')
+        self.assertEqual(calls, ["profile", "profile"])
+
+    def test_invalidation(self):
+        """测试标签失效，失败的请求不失效"""
+        dashboard(self._get("/dashboard"))
+        create_order(self.factory.post("/orders"))
+        self.assertEqual(dashboard(self._get("/dashboard")), {"total": 2})
+
+        profile(self._get("/profile", user=self.user))
+        update_profile(self.factory.post("/profile"))
+        profile(self._get("/profile", user=self.user))
+        self.assertEqual(calls.count("profile"), 1)
+        invalidate_cache(profile)
+        profile(self._get("/profile", user=self.user))
+        self.assertEqual(calls.count("profile"), 2)
+        with self.assertRaises(TypeError):
+            invalidate_cache(create_order)
+
+    def test_ninja_status_tuple(self):
+        """测试 ninja 元组返回值按状态码缓存和失效"""
+        self.assertEqual(lookup(self._get("/lookup?id=0")), (404, {"detail": "不存在"}))
+        lookup(self._get("/lookup?id=0"))
+        self.assertEqual(lookup(self._get("/lookup?id=1")), (200, {"id": "1"}))
+        self.assertEqual(lookup(self._get("/lookup?id=1")), (200, {"id": "1"}))
+        self.assertEqual(calls, ["lookup", "lookup", "lookup"])
+
+        dashboard(self._get("/dashboard"))
+        reject_order(self.factory.post("/orders"))
+        self.assertEqual(dashboard(self._get("/dashboard")), {"total": 4})
+        self.assertEqual(calls.count("dashboard"), 1)
+
+    def test_cached_headers(self):
+        """测试命中缓存时还原响应头，不还原逐跳头和 Cookie"""
+        export(self._get("/export"))
+        response = export(self._get("/export"))
+        self.assertEqual(calls, ["export"])
+        self.assertEqual(response.content, b"a,b")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="report.csv"')
+        self.assertFalse(response.has_header("Connection"))
+        self.assertNotIn("seen", response.cookies)
+
+    def test_unpicklable_result(self):
+        """测试无法缓存的结果照常返回，不缓存"""
+        with self.assertLogs("amis_python.response_cache", "WARNING"):
+            result = unpicklable(self._get("/unpicklable"))
+        self.assertEqual(list(result["rows"]), [0, 1, 2])
+        with self.assertLogs("amis_python.response_cache", "WARNING"):
+            unpicklable(self._get("/unpicklable"))
+        self.assertEqual(calls, ["unpicklable", "unpicklable"])
+
+    def test_concurrent_miss(self):
+        """测试并发的未命中请求只计算一次，vary 区分租户"""
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(slow(self._get("/slow", HTTP_X_TENANT="a"))))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [{"tenant": "a"}] * 4)
+        self.assertEqual(slow(self._get("/slow", HTTP_X_TENANT="b")), {"tenant": "b"})
+        self.assertEqual(calls, ["slow", "slow"])
+        self.assertEqual(_inflight, {})
+
+    def test_drf_viewset(self):
+        """测试 DRF ViewSet 方法缓存"""
+        view = ReportViewSet.as_view({"get": "list"})
+        factory = APIRequestFactory()
+        for _ in range(2):
+            request = factory.get("/reports")
+            force_authenticate(request, user=self.user)
+            response = view(request)
+            response.render()
+            self.assertEqual(response.data, {"count": 3})
+            self.assertEqual(response["X-Total-Count"], "3")
+        self.assertEqual(calls, ["report"])
+
+    def test_declaration(self):
+        """测试缓存声明"""
+        with self.assertRaises(ValueError):
+            amis_cache(Api(url="/x"))
+        self.assertEqual(dashboard.amis_cache, 60000)
+        self.assertEqual(dashboard.__name__, "dashboard")
+
+    def test_to_api_cache(self):
+        """测试 to_api 带上服务端缓存声明"""
+        api = to_api(dashboard)
+        with mock.patch("amis_python.routes.get_api_route", return_value=ApiRoute("/api/dashboard", "get")):
+            self.assertEqual(api.model_dump(), {"url": "/api/dashboard", "method": "get", "cache": 60000})
@@ -0,0 +1,117 @@
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import NoReverseMatch, clear_url_caches, include, path, re_path
+
+from amis_python.builder import Page, to_api, to_apis
+from amis_python.builder.form import Form
+from amis_python.routes import ApiRoute, get_api_route, get_route_table
+
+
+class FakeOperation:
+    """模拟 ninja Operation：接口函数上有 _ninja_operation 属性"""
+
+    def __init__(self, view_func, methods):
+        self.view_func = view_func
+        self.methods = methods
+        view_func._ninja_operation = self
+
+
+class FakePathView:
+    """模拟 ninja PathView：URL 视图是它的绑定方法"""
+
+    def __init__(self, *operations):
+        self.operations = list(operations)
+
+    def view(self, request, **kwargs):
+        return HttpResponse()
+
+
+class FakeRouter:
+    def __init__(self, path_operations, routers=()):
+        self.path_operations = path_operations
+        self._routers = list(routers)
+
+
+def list_items(request):
+    pass
+
+
+def get_item(request, item_id):
+    pass
+
+
+def update_item(request, item_id):
+    pass
+
+
+def export_items(request):
+    pass
+
+
+def unmounted(request):
+    pass
+
+
+LIST_ITEMS = FakeOperation(list_items, ["GET"])
+GET_ITEM = FakeOperation(get_item, ["GET"])
+UPDATE_ITEM = FakeOperation(update_item, ["PUT", "PATCH"])
+EXPORT_ITEMS = FakeOperation(export_items, ["POST"])
+FakeOperation(unmounted, ["GET"])
+
+items_view = FakePathView(LIST_ITEMS)
+item_view = FakePathView(GET_ITEM, UPDATE_ITEM)
+export_view = FakePathView(EXPORT_ITEMS)
+
+ITEMS_ROUTER = FakeRouter({"/": items_view, "/{int:item_id}": item_view})
+API = FakeRouter({}, [("", FakeRouter({"/export": export_view})), ("items", ITEMS_ROUTER)])
+
+ninja_patterns = [
+    path("items/", items_view.view, name="list_items"),
+    path("items/<int:item_id>", item_view.view, name="item"),
+    re_path(r"^export$", export_view.view, name="export"),
+]
+
+urlpatterns = [
+    path("api/v2/", include((ninja_patterns, "ninja"), namespace="api-2.0.0")),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class RouteTableTestCase(SimpleTestCase):
+    """ninja 路由表测试"""
+
+    def test_route_table(self):
+        """测试路由表包含前缀，转换路径参数和请求方式"""
+        self.assertEqual(get_api_route(list_items), ApiRoute("/api/v2/items/", "get"))
+        self.assertEqual(get_api_route(get_item), ApiRoute("/api/v2/items/${item_id}", "get"))
+        self.assertEqual(get_api_route(UPDATE_ITEM), ApiRoute("/api/v2/items/${item_id}", "put"))
+        self.assertEqual(get_api_route(export_items), ApiRoute("/api/v2/export", "post"))
+        with self.assertRaises(NoReverseMatch):
+            get_api_route(unmounted)
+
+    def test_table_built_once(self):
+        """测试路由表只构建一次，URL 缓存清空后重建"""
+        table = get_route_table()
+        self.assertIs(get_route_table(), table)
+        clear_url_caches()
+        self.assertIsNot(get_route_table(), table)
+        self.assertEqual(get_route_table(), table)
+
+    def test_to_api(self):
+        """测试 to_api 序列化并在路由变化后更新"""
+        api = to_api(get_item, data={"id": "${id}"})
+        self.assertEqual(api.model_dump(), {"url": "/api/v2/items/${item_id}", "method": "get", "data": {"id": "${id}"}})
+        self.assertIs(api.resolve(), api.resolve())
+        with override_settings(ROOT_URLCONF="test_urls"):
+            with self.assertRaises(NoReverseMatch):
+                api.model_dump()
+
+    def test_to_apis(self):
+        """测试批量生成路由下的接口"""
+        apis = to_apis(API)
+        self.assertEqual(list(apis), ["export_items", "list_items", "get_item", "update_item"])
+        self.assertEqual(apis["update_item"].model_dump(), {"url": "/api/v2/items/${item_id}", "method": "put"})
+        self.assertEqual(list(to_apis(ITEMS_ROUTER, adaptor="return payload;")), ["list_items", "get_item", "update_item"])
+        self.assertEqual(to_apis(ITEMS_ROUTER, adaptor="return payload;")["list_items"].model_dump()["adaptor"], "return payload;")
+        page = Page(body=[Form(api=apis["export_items"].resolve())])
+        self.assertEqual(page.model_dump()["body"][0]["api"], {"url": "/api/v2/export", "method": "post"})
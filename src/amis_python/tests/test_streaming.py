@@ -0,0 +1,53 @@
+import json
+from unittest import TestCase
+
+from amis_python.builder import Button, Dialog, Page, Tabs, TabsItem
+from amis_python.builder.crud import CRUD2, CRUD2Mode
+from amis_python.builder.dump import cached_dump_json
+from amis_python.builder.streaming import iter_envelope, iter_json
+
+
+def _large_page():
+    return Page(
+        title="大页面",
+        body=[
+            CRUD2(
+                mode=CRUD2Mode.TABLE2,
+                columns=[
+                    Button(label=f"按钮{i}", action_type="dialog", dialog=Dialog(title=f"弹框{i}", body={"tpl": None}))
+                    for i in range(200)
+                ],
+            ),
+            Tabs(tabs=[TabsItem(title=str(i)) for i in range(20)]),
+            {"type": "tpl", "tpl": "x", "items": [], "data": {}},
+        ],
+    )
+
+
+class StreamingTestCase(TestCase):
+    """流式 JSON 编码测试"""
+
+    def test_same_as_model_dump(self):
+        """测试流式输出与 model_dump 结果一致"""
+        page = _large_page()
+        content = b"".join(iter_json(page))
+        self.assertEqual(json.loads(content), page.model_dump())
+
+    def test_chunk_size(self):
+        """测试按块输出"""
+        page = _large_page()
+        chunks = list(iter_json(page, chunk_size=1024))
+        self.assertGreater(len(chunks), 10)
+        self.assertTrue(all(len(chunk) < 4096 for chunk in chunks))
+
+    def test_reuse_cached_subtree(self):
+        """测试复用已缓存的子树 JSON"""
+        button = Button(label="按钮")
+        cached_dump_json(button)
+        page = Page(body=[button])
+        self.assertEqual(json.loads(b"".join(iter_json(page))), page.model_dump())
+
+    def test_envelope(self):
+        """测试流式响应体"""
+        content = b"".join(iter_envelope(iter_json(Page(title="x"))))
+        self.assertEqual(json.loads(content), {"status": 0, "msg": "ok", "data": {"type": "page", "title": "x"}})
@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from pydantic import ValidationError
+
+from amis_python.builder import AppBuilder, Button, Page, trusted_build, validate_tree
+from amis_python.builder.form import Form, InputText
+
+
+class TrustedBuildTestCase(TestCase):
+    """受信任构建模式测试"""
+
+    def test_same_output(self):
+        """测试受信任模式与普通模式输出一致"""
+        def build():
+            return Page(
+                title="页面",
+                body=[Form(body=[InputText(name="name", label="姓名")]), Button(label="按钮", level="primary")],
+                extra_key="extra",
+            )
+
+        with trusted_build():
+            trusted = build()
+        self.assertEqual(trusted.model_dump(), build().model_dump())
+        self.assertEqual(trusted.model_fields_set, build().model_fields_set)
+
+    def test_skip_validation(self):
+        """测试受信任模式下不做校验"""
+        with self.assertRaises(ValidationError):
+            Button(label="按钮", level="unknown")
+        with trusted_build():
+            button = Button(label="按钮", level="unknown")
+        self.assertEqual(button.model_dump()["level"], "unknown")
+
+    def test_scope(self):
+        """测试模式只在上下文中生效"""
+        with trusted_build():
+            with trusted_build(False):
+                with self.assertRaises(ValidationError):
+                    Button(level="unknown")
+        with self.assertRaises(ValidationError):
+            Button(level="unknown")
+
+    def test_validate_tree(self):
+        """测试对受信任模式构建的组件树补做校验"""
+        with trusted_build():
+            valid = Page(body=[Button(label="按钮", level="primary")])
+            invalid = Page(body=[Form(body=[Button(label="按钮", level="unknown")])])
+        validate_tree(valid)
+        with self.assertRaises(ValidationError):
+            validate_tree(invalid)
+
+    def test_register_page_validate(self):
+        """测试注册页面时校验"""
+        app = AppBuilder()
+        with trusted_build():
+            page = Page(body=[Button(size="huge")])
+        with self.assertRaises(ValidationError):
+            app.register_page("页面", "/invalid", page=page, validate=True)
+
+    def test_custom_init(self):
+        """测试自定义 __init__ 的组件"""
+        with trusted_build():
+            app = AppBuilder(brand_name="应用")
+        self.assertEqual(len(app.pages), 1)
+        self.assertEqual(app.model_dump(), AppBuilder(brand_name="应用").model_dump())
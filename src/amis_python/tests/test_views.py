@@ -1,9 +1,22 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from amis_python.builder import Button, Page
+from amis_python.builder.encoding import encode_json
+from amis_python.delta import apply_patch
+from amis_python.payload import FrozenPage
+from amis_python.registry import freeze_pages, get_default_app, register_page
+
 
 class ApiTestCase(TestCase):
     def setUp(self):
@@ -70,7 +83,226 @@ class ConfigApiTestCase(ApiTestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+class PageConfigApiTestCase(ApiTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        register_page("静态页面", "/views_static", page=Page(title="静态页面", body=[Button(label="按钮")]))
+        register_page(
+            "动态页面",
+            "/views_callable",
+            page=lambda request: Page(title=f"你好 {request.user.username}"),
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username=self.username, password=self.password)
+
+    def test_get_static_page(self):
+        response = self.client.get("/amis/page/views_static")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(response.content), {
+            "status": 0,
+            "msg": "ok",
+            "data": {"type": "page", "title": "静态页面", "body": [{"label": "按钮", "type": "button"}]},
+        })
+
+    def test_page_definitions(self):
+        dialog = {"type": "dialog", "title": "弹框", "body": {"type": "tpl", "tpl": "x" * 300}}
+        register_page("重复页面", "/views_repeated", page=Page(body=[
+            Button(label="a", action_type="dialog", dialog=dialog),
+            Button(label="b", action_type="dialog", dialog=dialog),
+        ]))
+        data = json.loads(self.client.get("/amis/page/views_repeated").content)["data"]
+        self.assertEqual(data["body"][0]["dialog"], {"$ref": "amisDef1"})
+        self.assertEqual(data["definitions"]["amisDef1"], dialog)
+
+        with override_settings(AMIS_DEDUPE_DEFINITIONS=False):
+            data = json.loads(self.client.get("/amis/page/views_repeated").content)["data"]
+        self.assertEqual(data["body"][0]["dialog"], dialog)
+
+    def test_get_callable_page(self):
+        response = self.client.get("/amis/page/views_callable")
+        self.assertEqual(json.loads(response.content)["data"]["title"], f"你好 {self.username}")
+
+    @override_settings(AMIS_STREAM_PAGES=True)
+    def test_stream_callable_page(self):
+        response = self.client.get("/amis/page/views_callable")
+        self.assertTrue(response.streaming)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["data"]["title"], f"你好 {self.username}")
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_stream_skips_document_passes(self):
+        """测试流式输出跳过需要处理整个文档的后处理，不编码完整页面"""
+        dialog = {"type": "dialog", "title": "弹框", "body": {"type": "tpl", "tpl": "x" * 300}}
+        register_page("流式页面", "/views_stream", page=lambda request: Page(body=[
+            Button(label="a", action_type="dialog", dialog=dialog),
+            Button(label="b", action_type="dialog", dialog=dialog),
+        ]))
+        data = json.loads(self.client.get("/amis/page/views_stream").content)["data"]
+        self.assertEqual(data["body"][0]["dialog"], {"$ref": "amisDef1"})
+
+        with override_settings(AMIS_STREAM_PAGES=True), \
+                mock.patch("amis_python.builder.definitions.encode_json", wraps=encode_json) as dedupe_encode, \
+                mock.patch("amis_python.passes.encode_json", wraps=encode_json) as split_encode:
+            response = self.client.get("/amis/page/views_stream")
+            data = json.loads(b"".join(response.streaming_content))["data"]
+        self.assertTrue(response.streaming)
+        self.assertEqual(data["body"][0]["dialog"], dialog)
+        for call in dedupe_encode.call_args_list + split_encode.call_args_list:
+            self.assertFalse(isinstance(call.args[0], dict) and call.args[0].get("type") == "page")
+
+    def test_page_etag(self):
+        response = self.client.get("/amis/page/views_static")
+        etag = response["ETag"]
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("Cookie", response["Vary"])
+
+        response = self.client.get("/amis/page/views_static", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        get_default_app().get_page("/views_static").sub_title = "已修改"
+        try:
+            response = self.client.get("/amis/page/views_static", HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response["ETag"], etag)
+        finally:
+            get_default_app().get_page("/views_static").sub_title = None
+
+    @override_settings(AMIS_PRECOMPRESS_MIN_SIZE=0)
+    def test_page_precompressed(self):
+        response = self.client.get("/amis/page/views_static", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        data = json.loads(gzip.decompress(response.content))["data"]
+        self.assertEqual(data["title"], "静态页面")
+
+        response = self.client.get("/amis/page/views_static", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get("/amis/page/views_static", HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+        with override_settings(AMIS_PRECOMPRESS=False):
+            response = self.client.get("/amis/page/views_static", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    @override_settings(AMIS_PRECOMPRESS_MIN_SIZE=0)
+    def test_page_delta(self):
+        """按前端实际的请求方式：首次不带版本头，之后带上响应头中的版本"""
+        page = get_default_app().get_page("/views_static")
+        page.body = [Button(label=f"按钮{i}") for i in range(20)]
+        try:
+            # 空版本等同于没有版本，返回可协商缓存的完整内容
+            for extra in ({}, {"HTTP_X_AMIS_SCHEMA_VERSION": ""}):
+                response = self.client.get("/amis/page/views_static", **extra)
+                full = json.loads(response.content)
+                self.assertNotIn("delta", full)
+                self.assertEqual(response["X-Amis-Schema-Version"], response["ETag"])
+                self.assertIn("X-Amis-Schema-Version", response["Vary"])
+            version = response["X-Amis-Schema-Version"]
+            response = self.client.get("/amis/page/views_static", HTTP_IF_NONE_MATCH=version)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+            # 版本未变化时返回 304，不再返回空的增量
+            response = self.client.get("/amis/page/views_static", HTTP_X_AMIS_SCHEMA_VERSION=version)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response["X-Amis-Schema-Version"], version)
+
+            page.body[5].label = "已修改"
+            response = self.client.get(
+                "/amis/page/views_static", HTTP_X_AMIS_SCHEMA_VERSION=version, HTTP_ACCEPT_ENCODING="gzip",
+            )
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            data = json.loads(gzip.decompress(response.content))
+            self.assertEqual(data["delta"], "json-patch")
+            schema = apply_patch(full["data"], data["data"])
+            self.assertEqual(schema, json.loads(self.client.get("/amis/page/views_static").content)["data"])
+            self.assertNotEqual(data["version"], version)
+            self.assertEqual(response["X-Amis-Schema-Version"], data["version"])
+
+            # 增量响应同样支持协商缓存
+            etag = response["ETag"]
+            response = self.client.get(
+                "/amis/page/views_static", HTTP_X_AMIS_SCHEMA_VERSION=version, HTTP_ACCEPT_ENCODING="gzip",
+                HTTP_IF_NONE_MATCH=etag,
+            )
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+            # 版本不在历史中时返回完整内容
+            response = self.client.get("/amis/page/views_static", HTTP_X_AMIS_SCHEMA_VERSION='"unknown"')
+            data = json.loads(response.content)
+            self.assertNotIn("delta", data)
+            self.assertEqual(data["data"], schema)
+        finally:
+            page.body = [Button(label="按钮")]
+
+    def test_callable_page_delta_per_user(self):
+        register_page("用户页面", "/views_user", page=lambda request: Page(
+            title=request.user.username, body=[Button(label=f"按钮{i}") for i in range(20)],
+        ))
+        version = self.client.get("/amis/page/views_user")["X-Amis-Schema-Version"]
+
+        User.objects.create_user(username="other_user", password=self.password)
+        self.client.login(username="other_user", password=self.password)
+        response = self.client.get("/amis/page/views_user", HTTP_X_AMIS_SCHEMA_VERSION=version)
+        data = json.loads(response.content)
+        self.assertNotIn("delta", data)
+        self.assertEqual(data["data"]["title"], "other_user")
+
+    def test_frozen_page(self):
+        app_page = register_page("冻结页面", "/views_frozen", page=Page(title="冻结", body=[Button(label=f"按钮{i}") for i in range(10)]))
+        response = self.client.get("/amis/page/views_frozen")
+        data, etag = json.loads(response.content)["data"], response["ETag"]
+
+        self.assertEqual(freeze_pages(paths=["/views_frozen"]), [app_page])
+        self.assertIsInstance(app_page._lazy_schema, FrozenPage)
+        self.assertIsInstance(get_default_app().get_page("/views_static"), Page)
+        self.assertEqual(freeze_pages(paths=["/views_frozen"]), [])
+
+        response = self.client.get("/amis/page/views_frozen")
+        self.assertEqual(json.loads(response.content)["data"], data)
+        self.assertEqual(response["ETag"], etag)
+        response = self.client.get("/amis/page/views_frozen", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get("/amis/page/views_frozen", HTTP_X_AMIS_SCHEMA_VERSION=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_callable_page_etag(self):
+        etag = self.client.get("/amis/page/views_callable")["ETag"]
+        response = self.client.get("/amis/page/views_callable", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_app_config_etag(self):
+        etag = self.client.get("/amis/config/")["ETag"]
+        response = self.client.get("/amis/config/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_amis_app_config(self):
+        response = self.client.get("/amis/config/")
+        data = json.loads(response.content)["data"]
+        self.assertEqual(data, get_default_app().model_dump())
+
+
 class UploadApiTestCase(ApiTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # 上传的文件写到临时目录，不在源码目录中留下文件
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
     def test_upload_file_unauthorized(self):
         test_file = SimpleUploadedFile("test.txt", b"test content", content_type="text/plain")
         response = self.client.post("/amis/upload", {"file": test_file})
@@ -88,6 +320,7 @@ class UploadApiTestCase(ApiTestCase):
         self.assertEqual(response.data["data"]["name"], "test.txt")
         self.assertTrue(response.data["data"]["value"].startswith("files/"))
         self.assertIn("url", response.data["data"])
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, response.data["data"]["value"])))
 
     def test_upload_image_unauthorized(self):
         test_file = SimpleUploadedFile("test.png", b"fake-image", content_type="image/png")
@@ -0,0 +1,92 @@
+import json
+from typing import Literal, Optional
+from unittest import TestCase
+
+from pydantic import Field
+
+from amis_python.builder import BaseModel, trusted_build, validate_tree
+from amis_python.builder.warmup import _COMPONENT_MODULES, component_classes, is_built, warmup_models
+from amis_python.tests.test_import_time import _run
+
+
+def _make_component():
+    class Sample(BaseModel):
+        type: Literal["sample"] = Field("sample")
+        title: Optional[str] = Field(None)
+        page_size: Optional[int] = Field(None)
+
+    return Sample
+
+
+class WarmupTestCase(TestCase):
+    """延迟构建与预热测试"""
+
+    def test_build_is_deferred(self):
+        """测试组件类在首次使用时才构建 schema"""
+        Sample = _make_component()
+        self.assertFalse(is_built(Sample))
+        self.assertEqual(Sample(page_size=10).model_dump(), {"type": "sample", "pageSize": 10})
+        self.assertTrue(is_built(Sample))
+
+    def test_trusted_build_before_schema(self):
+        """测试受信任构建和 validate_tree 在 schema 未构建时可用"""
+        Sample = _make_component()
+        with trusted_build():
+            node = Sample(title="x")
+        self.assertEqual(node.model_dump_json(), '{"type":"sample","title":"x"}')
+        validate_tree(node)
+
+    def test_warmup_classes(self):
+        """测试同步预热指定组件类"""
+        Sample = _make_component()
+        self.assertIsNone(warmup_models([Sample]))
+        self.assertTrue(is_built(Sample))
+
+    def test_warmup_background(self):
+        """测试后台线程预热全部组件类"""
+        Sample = _make_component()
+        thread = warmup_models(background=True)
+        thread.join(60)
+        self.assertFalse(thread.is_alive())
+        self.assertIn(Sample, component_classes())
+        self.assertTrue(is_built(Sample))
+        from amis_python.builder.crud import CRUD
+        self.assertTrue(is_built(CRUD))
+
+    def test_component_modules(self):
+        """测试预热只导入组件模块，且覆盖全部内置组件类所在的模块"""
+        result = _run(
+            "import json, sys\n"
+            "from amis_python.builder.warmup import warmup_models\n"
+            "warmup_models()\n"
+            "print(json.dumps(sorted(name for name in sys.modules if name.startswith('amis_python.builder.'))))"
+        )
+        imported = set(json.loads(result.stdout.splitlines()[-1]))
+        for name in ("preview", "batch", "fragments", "definitions", "defaults", "streaming", "app", "form.build"):
+            self.assertNotIn(f"amis_python.builder.{name}", imported)
+
+        modules = {f"amis_python.builder.{name}" for name in _COMPONENT_MODULES}
+        result = _run(
+            "import importlib, json, pkgutil\n"
+            "import amis_python.builder as builder\n"
+            "from amis_python.builder.warmup import component_classes\n"
+            "for module in pkgutil.walk_packages(builder.__path__, 'amis_python.builder.'):\n"
+            "    importlib.import_module(module.name)\n"
+            "print(json.dumps(sorted({cls.__module__ for cls in component_classes()})))"
+        )
+        # 应用结构（builder.app）不是页面组件，不需要预热
+        defined = {name for name in json.loads(result.stdout.splitlines()[-1]) if not name.startswith("amis_python.builder.app.")}
+        self.assertEqual(defined, modules)
+
+    def test_import_does_not_build(self):
+        """测试导入组件模块时不构建 schema"""
+        result = _run(
+            "import json\n"
+            "from amis_python.builder.crud import CRUD\n"
+            "from amis_python.builder.action import Action\n"
+            "from amis_python.builder.warmup import is_built\n"
+            "before = [is_built(CRUD), is_built(Action)]\n"
+            "CRUD(api='/api/users')\n"
+            "print(json.dumps(before + [is_built(CRUD), is_built(Action)]))"
+        )
+        self.assertEqual(json.loads(result.stdout.splitlines()[-1]), [False, False, True, False])
@@ -3,8 +3,8 @@ from django.views.static import serve
 from django.views.generic import RedirectView
 import os
 
-from .views import amis_index, GetAmisAppConfig, GetPageConfig, GetLoginConfig, LoginView, LogoutView, CurrentUserView, \
-    UploadView, UploadImageView
+from .views import amis_index, GetAmisAppConfig, GetPageConfig, GetPageFragment, GetLoginConfig, LoginView, LogoutView, CurrentUserView, \
+    UploadView, UploadImageView, BatchView
 
 UploadView, UploadImageView
 
@@ -65,10 +65,14 @@ urlpatterns = [
     path('page/', GetPageConfig.as_view(), name='get_page_config'),
     # 页面配置路由（动态路由，匹配任意页面路径）
     path('page/<path:page_path>', GetPageConfig.as_view(), name='get_page_config'),
+    # 页面片段路由（大页面中按需加载的子树）
+    path('fragment/<path:page_path>', GetPageFragment.as_view(), name='get_page_fragment'),
     # API路由，必须在静态文件路由之前
     path('api/login', LoginView.as_view(), name='login'),
     path('api/logout', LogoutView.as_view(), name='logout'),
     path('api/current_user', CurrentUserView.as_view(), name='current_user'),
+    # 批量接口：一次请求执行多个子请求
+    path('batch', BatchView.as_view(), name='batch'),
     path('upload', UploadView.as_view(), name='upload'),
     path('upload_img', UploadImageView.as_view(), name='upload_img'),
     # edit路径重定向到edit/index.html
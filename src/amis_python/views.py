@@ -2,8 +2,10 @@ import os
 import uuid
 
 from django.contrib.auth import login as django_login, logout as django_logout
+from django.conf import settings
 from django.core.files.storage import default_storage
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import ensure_csrf_cookie
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -11,12 +13,23 @@ from rest_framework.views import APIView
 
 from . import Page
 from .builder.api import Api
+from .batch import dispatch_batch
+from .builder.base import trusted_build
+from .builder.batch import BATCH_HEADER, batch_initial_apis
 from .builder.button import Button
+from .builder.defaults import prune_defaults
+from .builder.dump import cached_dump, get_node_cache
+from .builder.fragments import build_id_index, resolve_pointer, split_fragments
+from .builder.encoding import encode_envelope, encode_json
+from .builder.streaming import iter_envelope, iter_json
 from .builder.form.form import Form
 from .builder.form.input_password import InputPassword
 from .builder.form.input_text import InputText
 from .builder.layout import Container, Panel
+from .delta import VERSION_HEADER, VERSION_RESPONSE_HEADER, VersionHistory, patch_between
 from .drf import AmisResponse
+from .passes import FRAGMENT_URL, page_passes
+from .payload import ENCODINGS, FrozenPage, SchemaPayload, schema_payload
 from .registry import get_app, get_default_app, get_page
 from .serializers import LoginSerializer
 
@@ -81,6 +94,207 @@ def get_login_page() -> dict:
     return login_page.model_dump()
 
 
+def build_page(request, page_factory):
+    """
+    调用页面工厂函数生成页面，AMIS_TRUSTED_BUILD 开启时跳过组件校验
+    """
+    with trusted_build(getattr(settings, "AMIS_TRUSTED_BUILD", False)):
+        return page_factory(request)
+
+
+def get_page_payload(request, page, page_path: str = None) -> SchemaPayload:
+    """
+    获取注册页面的响应载荷
+    """
+    if callable(page):
+        # 每次请求都会生成新的页面树，不做缓存
+        return schema_payload(build_page(request, page), page_passes(), cache=False)
+    return schema_payload(page, page_passes(page_path))
+
+
+def page_source_schema(page):
+    """
+    拆分片段前的页面 schema（片段的 JSON Pointer 指向它）
+    """
+    schema = cached_dump(page)
+    if getattr(settings, "AMIS_PRUNE_DEFAULTS", True):
+        schema = prune_defaults(schema)
+    return schema
+
+
+class PageFragments:
+    """
+    页面某个版本的片段数据：拆分前的 schema、组件 id 索引（首次按 id 查找时建立）
+    以及已生成的片段载荷；缓存在页面节点上，页面修改后随节点缓存一起失效
+    """
+    __slots__ = ("schema", "_ids", "payloads")
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._ids = None
+        self.payloads = {}
+
+    def pointer_of(self, component_id: str) -> str:
+        """组件 id 对应的 JSON Pointer，不存在时抛出 KeyError"""
+        if self._ids is None:
+            self._ids = build_id_index(self.schema)
+        return self._ids[component_id]
+
+
+def get_page_fragments(page) -> PageFragments:
+    """
+    获取页面当前版本的片段数据（与页面载荷共用节点上的缓存）
+    """
+    cache = get_node_cache(page)
+    key = ("fragments", getattr(settings, "AMIS_PRUNE_DEFAULTS", True))
+    fragments = cache.data.get(key)
+    if fragments is None:
+        version = cache.version
+        fragments = PageFragments(page_source_schema(page))
+        if cache.version == version:
+            cache.data[key] = fragments
+    return fragments
+
+
+def get_fragment_payload(page, page_path: str, pointer: str = None, component_id: str = None) -> SchemaPayload:
+    """
+    获取页面片段的响应载荷，片段用 JSON Pointer 或组件 id 定位，其中的大子树继续拆分；
+    片段不存在时抛出 KeyError
+
+    片段与页面使用相同的后处理（见 ``passes.page_passes``）：默认值裁剪已在拆分前做过，
+    首屏请求按 AMIS_BATCH_INITIAL_APIS 标记。definitions 去重只作用于页面根节点，片段不做。
+    """
+    fragments = get_page_fragments(page)
+    if component_id is not None:
+        pointer = fragments.pointer_of(component_id)
+    min_size = getattr(settings, "AMIS_SPLIT_MIN_SIZE", 4096)
+    batch = getattr(settings, "AMIS_BATCH_INITIAL_APIS", False)
+    key = (page_path, pointer or "", min_size, batch)
+    payload = fragments.payloads.get(key)
+    if payload is None:
+        fragment = resolve_pointer(fragments.schema, pointer or "")
+        fragment, _ = split_fragments(fragment, f"{FRAGMENT_URL}{page_path}", min_size=min_size, pointer=pointer or "")
+        if batch:
+            fragment = batch_initial_apis(fragment)
+        payload = fragments.payloads[key] = schema_payload(fragment, cache=False)
+    return payload
+
+
+def accepted_encodings(request) -> set:
+    """
+    解析 Accept-Encoding，返回客户端接受的编码（忽略 q=0）
+    """
+    encodings = set()
+    for item in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            encodings.add(name)
+    return encodings
+
+
+def choose_encoding(request, payload: SchemaPayload):
+    """
+    选择响应体的压缩编码，AMIS_PRECOMPRESS 关闭或响应体过小时不压缩
+    """
+    if not getattr(settings, "AMIS_PRECOMPRESS", True):
+        return None
+    if len(payload.body) < getattr(settings, "AMIS_PRECOMPRESS_MIN_SIZE", 200):
+        return None
+    accepted = accepted_encodings(request)
+    for encoding in ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def schema_response(request, payload: SchemaPayload) -> HttpResponse:
+    """
+    返回 schema 响应，携带 ETag 并在 If-None-Match 命中时返回 304
+
+    响应体按 Accept-Encoding 使用缓存在载荷上的 gzip/brotli 压缩结果，
+    GZipMiddleware 不会再次压缩带 Content-Encoding 的响应。
+    """
+    encoding = choose_encoding(request, payload)
+    etag = payload.encoded_etag(encoding) if encoding else payload.etag
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        if encoding:
+            response = HttpResponse(payload.encoded_body(encoding), content_type="application/json")
+            response["Content-Encoding"] = encoding
+        else:
+            response = HttpResponse(payload.body, content_type="application/json")
+    response["ETag"] = etag
+    response["Cache-Control"] = getattr(settings, "AMIS_SCHEMA_CACHE_CONTROL", "private, no-cache")
+    # 同一地址的内容随会话（登录用户、app_config）变化
+    patch_vary_headers(response, ("Cookie", "Accept-Encoding"))
+    return response
+
+
+_page_history = None
+
+
+def get_page_history() -> VersionHistory:
+    """
+    页面 schema 版本历史，每个页面保留 AMIS_SCHEMA_HISTORY 个版本（默认 4），
+    最多保留 AMIS_SCHEMA_HISTORY_KEYS 个页面（默认 256）
+    """
+    global _page_history
+    if _page_history is None:
+        _page_history = VersionHistory(
+            size=getattr(settings, "AMIS_SCHEMA_HISTORY", 4),
+            max_keys=getattr(settings, "AMIS_SCHEMA_HISTORY_KEYS", 256),
+        )
+    return _page_history
+
+
+def delta_response(request, key, payload: SchemaPayload, remember: bool = True) -> HttpResponse:
+    """
+    返回页面 schema 的增量响应
+
+    响应头 X-Amis-Schema-Version 给出当前版本。客户端缓存了页面时在同名请求头中带上已有版本：
+    版本与当前版本相同时返回 304；否则返回到当前版本的 JSON Patch
+    （``{"status":0,"msg":"ok","data":[...],"delta":"json-patch","version":...}``），
+    版本不在历史中或补丁不比完整内容小时返回带 version 的完整内容。
+    没有该请求头（或为空）时与普通 schema 响应相同。各种响应体都经过 schema_response，
+    同样支持 ETag/304 和预压缩。
+
+    remember 为 False 时不把当前版本写入历史（冻结的页面内容不会再变化，
+    客户端持有当前版本时可以直接比较，不需要在历史中保留一份解压后的内容）。
+    """
+    history = get_page_history()
+    if remember:
+        history.remember(key, payload.etag, payload.content)
+    version = request.META.get(VERSION_HEADER) or None
+    if version is None:
+        response = schema_response(request, payload)
+    elif version == payload.etag:
+        response = HttpResponseNotModified()
+        response["ETag"] = payload.etag
+        response["Cache-Control"] = getattr(settings, "AMIS_SCHEMA_CACHE_CONTROL", "private, no-cache")
+        patch_vary_headers(response, ("Cookie", "Accept-Encoding"))
+    else:
+        body = None
+        base = history.get(key, version)
+        if base is not None:
+            patch = encode_json(patch_between(base, payload.content))
+            if len(patch) < len(payload.content):
+                body = encode_envelope(patch, delta="json-patch", version=payload.etag)
+        if body is None:
+            body = encode_envelope(payload.content, version=payload.etag)
+        response = schema_response(request, SchemaPayload(body, body=body))
+    response[VERSION_RESPONSE_HEADER] = payload.etag
+    patch_vary_headers(response, (VERSION_RESPONSE_HEADER,))
+    return response
+
+
 class GetAmisAppConfig(APIView):
     """
     获取 amis 应用配置
@@ -89,13 +303,17 @@ class GetAmisAppConfig(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        app = get_default_app()
         if request.session.get("app_config"):
             app = get_app(request.session.get("app_config"))
             if app is None:
                 django_logout(request)
                 return HttpResponse(status=302, headers={"Location": "/"})
-            return AmisResponse(data=app.model_dump())
-        return AmisResponse(data=get_default_app().model_dump())
+        response = schema_response(request, schema_payload(app))
+        if getattr(settings, "AMIS_BATCH_INITIAL_APIS", False):
+            # 告知前端合并带标记的首屏请求
+            response[BATCH_HEADER] = "1"
+        return response
 
 
 class GetPageConfig(APIView):
@@ -106,16 +324,67 @@ class GetPageConfig(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, page_path: str = None):
-        if page_path is None:
-            page = get_page(request, "/")
-            return AmisResponse(data=page)
-        page_path = "/" + page_path
+        page_path = "/" + page_path if page_path is not None else "/"
         page = get_page(request, page_path)
-        if callable(page):
-            page = page(request)
-        if isinstance(page, Page):
-            return AmisResponse(data=page.model_dump())
-        return AmisResponse(data=page)
+        if callable(page) and getattr(settings, "AMIS_STREAM_PAGES", False):
+            # 动态生成的大页面按块输出，不在内存中保留完整的 dict 或 JSON。page_passes 中的后处理
+            # （默认值裁剪、片段拆分、请求合并标记、definitions 去重）都要处理整个文档，流式输出时
+            # 全部跳过；响应体没有完整编码，也不支持 ETag 和增量更新
+            return StreamingHttpResponse(iter_envelope(iter_json(build_page(request, page))), content_type="application/json")
+        payload = get_page_payload(request, page, page_path)
+        if getattr(settings, "AMIS_SCHEMA_DELTA", True):
+            key = (request.session.get("app_config"), page_path)
+            if callable(page):
+                # 动态页面的内容因用户而异，历史版本按用户区分，避免用别人的页面计算增量
+                key += (request.user.pk,)
+            return delta_response(request, key, payload, remember=not isinstance(page, FrozenPage))
+        return schema_response(request, payload)
+
+
+class GetPageFragment(APIView):
+    """
+    获取页面片段（按需加载的子树），片段用查询参数 id（组件 id）或 pointer（JSON Pointer）定位
+
+    片段载荷缓存在页面节点上，页面未修改时重复请求只需查表，并支持 ETag/304。
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, page_path: str):
+        page_path = "/" + page_path
+        try:
+            page = get_page(request, page_path)
+        except ValueError:
+            page = None
+        if page is None or callable(page) or isinstance(page, FrozenPage):
+            # 动态页面每次生成的内容不同，冻结页面不再保留拆分前的 schema
+            return AmisResponse(code=404, msg=f"页面不支持片段加载 {page_path}", data={}, status=404)
+        try:
+            payload = get_fragment_payload(
+                page, page_path, pointer=request.GET.get("pointer"), component_id=request.GET.get("id"),
+            )
+        except KeyError:
+            return AmisResponse(code=404, msg="片段不存在", data={}, status=404)
+        return schema_response(request, payload)
+
+
+class BatchView(APIView):
+    """
+    批量接口：在一次请求中执行多个子请求（见 amis_python.batch）
+
+    子请求各自做权限校验，批量接口本身不要求登录。
+    """
+
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        items = request.data.get("requests") if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list):
+            return AmisResponse(code=400, msg="requests 必须是子请求列表", data={}, status=400)
+        limit = getattr(settings, "AMIS_BATCH_MAX_REQUESTS", 20)
+        if len(items) > limit:
+            return AmisResponse(code=400, msg=f"子请求数量超过上限 {limit}", data={}, status=400)
+        return AmisResponse(data=dispatch_batch(request._request, items))
 
 
 def amis_index(request) -> HttpResponse: